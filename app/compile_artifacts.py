@@ -0,0 +1,81 @@
+"""
+compile_artifacts.py
+
+Compile the serving artifacts (profile index and skill matrices, career
+clusters, title matcher and skill normalizer) for the current catalog into
+a versioned directory under app/models/.
+
+At startup the recommender memory-maps these with joblib instead of building
+them, so startup time and per-worker memory no longer grow with the cost of
+index construction. Artifacts that do not match the running catalog are
+ignored and rebuilt in-process, so a stale build is never served.
+
+Usage (from the app/ directory):
+    python compile_artifacts.py
+    python compile_artifacts.py --output /srv/careerpath/models --keep 3
+"""
+
+import argparse
+import time
+
+from services.artifacts import ARTIFACTS_DIR, write_artifacts
+from services.career_recommender import JOB_PROFILES, catalog_version, index_key
+from services.profile_index import CareerClusters, ProfileIndex
+from services.recommendation_cache import canonical_key
+from services.skill_normalizer import (
+    SKILL_ALIASES,
+    SkillNormalizer,
+    canonical_vocabulary,
+    normalizer_version,
+)
+from services.title_index import TitleIndex
+
+
+def compile_artifacts(output: str = ARTIFACTS_DIR, keep: int = 2) -> dict:
+    """Build every serving artifact and write them as one version"""
+    version = catalog_version(force=True)
+    skills_version = normalizer_version(version)
+
+    timings = {}
+
+    def _timed(name, build):
+        start = time.perf_counter()
+        obj = build()
+        timings[name] = time.perf_counter() - start
+        return obj
+
+    index = _timed("profile_index", lambda: ProfileIndex(JOB_PROFILES))
+    clusters = _timed("career_clusters", lambda: CareerClusters(index))
+    titles = _timed("title_index", lambda: TitleIndex(index.titles))
+    normalizer = _timed(
+        "skill_normalizer",
+        lambda: SkillNormalizer(canonical_vocabulary(), SKILL_ALIASES),
+    )
+    artifacts = {
+        "profile_index": (index_key(version), index),
+        "career_clusters": (index_key(version), clusters),
+        "title_index": (index_key(version), titles),
+        "skill_normalizer": (skills_version, normalizer),
+    }
+
+    build_version = canonical_key(index_key(version), skills_version)[:16]
+    manifest = write_artifacts(build_version, artifacts, directory=output, keep=keep)
+    manifest["build_seconds"] = timings
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--output", default=ARTIFACTS_DIR)
+    parser.add_argument(
+        "--keep", type=int, default=2, help="Number of compiled versions to keep"
+    )
+    args = parser.parse_args()
+
+    manifest = compile_artifacts(args.output, args.keep)
+    print(f"Compiled artifacts version {manifest['version']} into {args.output}")
+    for name, entry in sorted(manifest["artifacts"].items()):
+        print(
+            f"  {name:<18} {entry['bytes'] / 1024:>9.1f} KiB "
+            f"built in {manifest['build_seconds'][name] * 1000:.1f} ms"
+        )
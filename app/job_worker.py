@@ -0,0 +1,61 @@
+"""
+job_worker.py
+
+Standalone worker for the /jobs queue.
+
+By default every API process runs CAREERPATH_JOB_WORKERS job threads. Set
+that to 0 and run this script instead to process jobs in their own process,
+so queued and running jobs carry on while the API is restarted or redeployed.
+Both can also run side by side: jobs are claimed atomically from the SQLite
+queue in CAREERPATH_JOBS_DIR, and a job whose worker died is picked up again
+once its lease (CAREERPATH_JOB_LEASE_SECONDS) has expired.
+
+Usage (from the app/ directory):
+    python job_worker.py
+    python job_worker.py --workers 4
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+from services.job_queue import JobWorkerPool, get_job_queue
+
+logger = logging.getLogger("careerpath.jobs")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("CAREERPATH_JOB_WORKER_THREADS", "2")),
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=args.log_level.upper(), format="%(asctime)s %(name)s %(message)s"
+    )
+
+    from main import JOB_HANDLERS, JOB_TERMINAL_ERRORS
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stopped.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+
+    queue = get_job_queue()
+    pool = JobWorkerPool(
+        queue, JOB_HANDLERS, workers=args.workers, terminal_errors=JOB_TERMINAL_ERRORS
+    )
+    pool.start()
+    logger.info(f"Processing jobs from {queue.db_path} with {args.workers} thread(s)")
+    stopped.wait()
+    pool.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,76 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import tempfile
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import uvicorn
 
-from services.resume_parser import parse_resume, parse_resume_text
-from services.career_recommender import get_recommendations
+from services.resume_parser import (
+    RESUME_FIELDS,
+    extract_first_page_from_pdf,
+    extract_resume_text,
+    iter_parse_fields,
+    parse_resume,
+    parse_resume_text,
+)
+from services.career_recommender import (
+    CAREER_ANALYSIS_SECTIONS,
+    JOB_PROFILES,
+    LEARNING_RESOURCES,
+    catalog_version,
+    get_recommendation_cache,
+    get_recommendations,
+    get_skill_gains,
+    iter_recommendations,
+)
+from services.skill_normalizer import normalize_skills
+from services.admission import (
+    AdmissionPrecheckMiddleware,
+    AdmissionRejected,
+    limiter_from_env,
+)
+from services.single_flight import SingleFlight, file_digest
+from services.recommendation_cache import canonical_key
+from services.job_queue import JobWorkerPool, get_job_queue
+from services.metrics import (
+    REGISTRY,
+    MetricsMiddleware,
+    current_timings,
+    start_timings,
+    stop_timings,
+    summarize_timings,
+)
+from services.tracing import ServerTimingMiddleware
+from services.readiness import WARMUP_ENABLED, Readiness, default_components
+from services.responses import (
+    FastJSONResponse,
+    GZipMiddleware,
+    accepts_gzip,
+    json_dumps,
+)
+from services.catalog_payloads import (
+    CATALOG_MAX_AGE,
+    MAX_PAGE_SIZE,
+    CatalogPayload,
+    get_catalog_payload_cache,
+    select_page,
+)
+from services.uploads import (
+    MAX_BATCH_BYTES,
+    MAX_UPLOAD_BYTES,
+    UploadSizeLimitMiddleware,
+    save_upload,
+)
 
 app = FastAPI(
     title="CareerPathAI API",
     description="AI-powered career guidance system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -24,6 +82,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request stage timings (Server-Timing, and _timings with debug=1).
+# Inside the gzip middleware so it can add to uncompressed JSON bodies.
+# Only synchronous analyses get _timings in the body: a /jobs submit only
+# enqueues, and the job's own timings are in its result.
+app.add_middleware(
+    ServerTimingMiddleware,
+    body_paths=("/upload_resume", "/parse_text", "/analyze_skills", "/skill_gains"),
+)
+
+# Gzip larger responses (learning plans, parsed resumes, NDJSON batches) for
+# clients that accept it
+app.add_middleware(GZipMiddleware)
+
+# Per-endpoint admission control. Parsing an upload costs far more than
+# scoring a skill list, so uploads get fewer slots and a shorter queue.
+ADMISSION_LIMITERS = {
+    "upload_resume": limiter_from_env(
+        "upload", max_concurrent=2, max_queue=8, queue_timeout=15
+    ),
+    "parse_text": limiter_from_env("parse_text", max_concurrent=4, max_queue=16),
+    "analyze_skills": limiter_from_env(
+        "analyze", max_concurrent=8, max_queue=64, queue_timeout=5
+    ),
+    "skill_gains": limiter_from_env(
+        "skill_gains", max_concurrent=4, max_queue=32, queue_timeout=5
+    ),
+}
+
+# Refuse oversized uploads from Content-Length, or as soon as the body
+# crosses the limit, before the multipart body is parsed
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/upload_resume": MAX_UPLOAD_BYTES,
+        "/upload_resumes": MAX_BATCH_BYTES,
+        "/upload_resume/stream": MAX_UPLOAD_BYTES,
+        "/jobs/upload_resume": MAX_UPLOAD_BYTES,
+    },
+)
+
+# FastAPI reads and spools a multipart upload before the handler runs, so
+# refuse uploads to a full endpoint (429) before the body is read
+app.add_middleware(
+    AdmissionPrecheckMiddleware,
+    limiters={
+        "/upload_resume": ADMISSION_LIMITERS["upload_resume"],
+        "/upload_resumes": ADMISSION_LIMITERS["upload_resume"],
+        "/upload_resume/stream": ADMISSION_LIMITERS["upload_resume"],
+    },
+)
+
+# Request counts, latency and response sizes per endpoint for /metrics.
+# Added last so it is outermost and also sees requests rejected above.
+app.add_middleware(MetricsMiddleware)
+
+# Concurrent identical analyses (double submits, client retries) share one run
+SINGLE_FLIGHTS = {
+    name: SingleFlight(name) for name in ("upload_resume", "parse_text", "analyze_skills")
+}
+
+async def run_admitted(endpoint: str, analyze, *args, on_done=None):
+    """Run a blocking analysis in the thread pool under the endpoint's limiter.
+
+    ``on_done`` is called when the analysis thread has finished (or was never
+    started), even if the caller was cancelled before.
+    """
+    return await ADMISSION_LIMITERS[endpoint].run_in_threadpool(
+        analyze, *args, on_done=on_done
+    )
+
+def remove_file(file_path: str) -> None:
+    if os.path.exists(file_path):
+        os.unlink(file_path)
+
+async def analyze_uploaded_file(
+    file_path: str,
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int
+) -> Dict:
+    """Analyze a saved upload, sharing the run with identical uploads in flight.
+
+    Uploads are identical when their content and parameters are. Takes
+    ownership of the file: it is deleted as soon as no analysis needs it,
+    which for a shared run is when that run ends, even if the request that
+    started it has gone away. Returns a copy the caller may extend.
+    """
+    shared = False
+    
+    def start():
+        nonlocal shared
+        shared = True
+        # Removed when the analysis thread ends, not when this task does: the
+        # task is cancelled once the last waiter leaves, the thread is not
+        return asyncio.ensure_future(run_admitted(
+            "upload_resume", analyze_resume_file, file_path, sections, explain, sectors, top_n,
+            on_done=lambda: remove_file(file_path)
+        ))
+    
+    try:
+        digest = await run_in_threadpool(file_digest, file_path)
+        key = canonical_key("upload_resume", digest, sections, explain, sectors, top_n)
+        return dict(await SINGLE_FLIGHTS["upload_resume"].run(key, start))
+    finally:
+        if not shared:
+            remove_file(file_path)
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request, exc: AdmissionRejected):
+    """Fast 429/503 for requests that were not admitted"""
+    return FastJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -32,8 +207,19 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/upload_resume": "Upload and parse resume",
+            "/upload_resumes": "Upload many resumes, results streamed as NDJSON",
+            "/upload_resume/stream": "Upload a resume, results streamed as Server-Sent Events",
+            "/parse_text/stream": "Parse resume text, results streamed as Server-Sent Events",
             "/parse_text": "Parse resume from text",
-            "/health": "Health check"
+            "/jobs/upload_resume": "Submit a resume analysis job",
+            "/jobs/parse_text": "Submit a resume text analysis job",
+            "/jobs/analyze_skills": "Submit a skills analysis job",
+            "/jobs/{job_id}": "Job status and, once done, its result",
+            "/health": "Health check",
+            "/health/live": "Liveness probe",
+            "/health/ready": "Readiness probe with warm-up state",
+            "/admission": "Admission queue depth and wait times",
+            "/metrics": "Prometheus metrics"
         }
     }
 
@@ -42,11 +228,262 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "CareerPathAI"}
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the process is up and serving (it may still be warming up)"""
+    return {"status": "alive", "service": "CareerPathAI"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness: 200 once the startup warm-up has loaded every component and
+    run a synthetic analysis, 503 while warming up or after a failure
+
+    Reports each component's load state and time and the warm-up duration.
+    """
+    status = readiness.status()
+    return FastJSONResponse(
+        status_code=200 if status["status"] == "ready" else 503,
+        content=status
+    )
+
+@app.get("/admission")
+async def admission_stats():
+    """Concurrency, queue depth, wait times and rejections per endpoint (this worker)"""
+    return {name: limiter.stats() for name, limiter in ADMISSION_LIMITERS.items()}
+
+def admission_samples(field: str) -> Dict[tuple, float]:
+    return {
+        (name,): limiter.stats()[field] for name, limiter in ADMISSION_LIMITERS.items()
+    }
+
+def job_queue_samples() -> Dict[tuple, float]:
+    return {(status,): count for status, count in get_job_queue().stats().items()}
+
+def cache_samples(field: str) -> Dict[tuple, float]:
+    return {("recommendations",): get_recommendation_cache().stats()[field]}
+
+def single_flight_samples(field: str) -> Dict[tuple, float]:
+    return {(name,): flight.stats()[field] for name, flight in SINGLE_FLIGHTS.items()}
+
+REGISTRY.callback(
+    "careerpath_admission_active",
+    "Requests holding an admission slot",
+    lambda: admission_samples("active"),
+    ("endpoint",)
+)
+REGISTRY.callback(
+    "careerpath_admission_queue_depth",
+    "Requests waiting for an admission slot",
+    lambda: admission_samples("queue_depth"),
+    ("endpoint",)
+)
+REGISTRY.callback(
+    "careerpath_admission_admitted",
+    "Requests that were given an admission slot",
+    lambda: admission_samples("admitted"),
+    ("endpoint",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_admission_wait_seconds",
+    "Seconds admitted requests spent waiting for a slot",
+    lambda: admission_samples("wait_seconds_total"),
+    ("endpoint",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_admission_wait_seconds_max",
+    "Longest wait for an admission slot since the worker started",
+    lambda: admission_samples("wait_seconds_max"),
+    ("endpoint",)
+)
+REGISTRY.callback(
+    "careerpath_admission_rejected",
+    "Requests rejected because the wait queue was full",
+    lambda: admission_samples("rejected_queue_full"),
+    ("endpoint",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_admission_timeouts",
+    "Requests rejected after waiting too long for a slot",
+    lambda: admission_samples("rejected_timeout"),
+    ("endpoint",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_coalesced_requests",
+    "Requests that awaited an identical analysis already in flight",
+    lambda: single_flight_samples("coalesced"),
+    ("endpoint",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_analyses_in_flight",
+    "Distinct analyses running or waiting for an admission slot",
+    lambda: single_flight_samples("in_flight"),
+    ("endpoint",)
+)
+REGISTRY.callback(
+    "careerpath_jobs",
+    "Analysis jobs in the queue by status (all processes)",
+    job_queue_samples,
+    ("status",)
+)
+REGISTRY.callback(
+    "careerpath_cache_hits",
+    "Cache lookups that hit",
+    lambda: cache_samples("hits"),
+    ("cache",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_cache_misses",
+    "Cache lookups that missed",
+    lambda: cache_samples("misses"),
+    ("cache",),
+    kind="counter"
+)
+REGISTRY.callback(
+    "careerpath_cache_hit_ratio",
+    "Share of cache lookups that hit",
+    lambda: cache_samples("hit_rate"),
+    ("cache",)
+)
+REGISTRY.callback(
+    "careerpath_cache_entries",
+    "Entries held by the cache",
+    lambda: cache_samples("entries"),
+    ("cache",)
+)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics of this worker process (job counts are shared)"""
+    body = await run_in_threadpool(REGISTRY.render)
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Response sections that can be requested with include=. "career_analysis"
+# selects all of CAREER_ANALYSIS_SECTIONS.
+RESUME_SECTIONS = ("parsed_resume", "raw_text") + CAREER_ANALYSIS_SECTIONS
+UPLOAD_SECTIONS = RESUME_SECTIONS + ("file_info",)
+SKILLS_SECTIONS = CAREER_ANALYSIS_SECTIONS + ("input_skills", "skill_normalization")
+
+# Upper bound for top_n=
+MAX_TOP_N = 50
+
+def resolve_include(include: Optional[str], allowed: tuple) -> set:
+    """Parse a comma-separated include= value; None selects every section"""
+    if include is None:
+        return set(allowed)
+    sections = set()
+    for name in include.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name == "career_analysis":
+            sections.update(CAREER_ANALYSIS_SECTIONS)
+        elif name in allowed:
+            sections.add(name)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown include section '{name}'. Choose from: career_analysis, {', '.join(allowed)}"
+            )
+    return sections
+
+def resolve_sectors(sectors: Optional[str]) -> Optional[list]:
+    """Parse a comma-separated sectors= value into known sector names"""
+    if sectors is None:
+        return None
+    known = sorted(
+        {profile.get("sector", "unknown") for profile in JOB_PROFILES.values()}
+    )
+    selected = []
+    for name in sectors.split(","):
+        name = name.strip().lower()
+        if not name or name in selected:
+            continue
+        if name not in known:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown sector '{name}'. Choose from: {', '.join(known)}"
+            )
+        selected.append(name)
+    return selected or None
+
+def resolve_top_n(top_n: int, name: str = "top_n") -> int:
+    """Validate top_n= (recommendations returned overall and per sector) or
+    another result count given as ``name``"""
+    if not 1 <= top_n <= MAX_TOP_N:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{name} must be between 1 and {MAX_TOP_N}"
+        )
+    return top_n
+
+def resume_fields_for(sections: set) -> set:
+    """Resume fields the parser has to extract for the requested sections"""
+    fields = set()
+    if "parsed_resume" in sections:
+        fields.update(field for field in RESUME_FIELDS if field != "raw_text")
+    if "raw_text" in sections:
+        fields.add("raw_text")
+    if sections & set(CAREER_ANALYSIS_SECTIONS):
+        # Needed for scoring
+        fields.update(["skills", "experience"])
+    return fields
+
+def analyze_parsed_resume(
+    parsed_data: Dict,
+    sections: set,
+    explain: bool,
+    sectors: Optional[list] = None,
+    top_n: int = 5
+) -> Dict:
+    """Build the parsed_resume / career_analysis part of a response"""
+    result = {}
+    resume_fields = resume_fields_for(sections & {"parsed_resume", "raw_text"})
+    if resume_fields:
+        result["parsed_resume"] = {
+            field: value for field, value in parsed_data.items() if field in resume_fields
+        }
+
+    career_sections = sections & set(CAREER_ANALYSIS_SECTIONS)
+    if career_sections:
+        result["career_analysis"] = get_recommendations(
+            parsed_data,
+            explain=explain,
+            include=career_sections,
+            sectors=sectors,
+            top_n=top_n
+        )
+    return result
+
 @app.post("/upload_resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(
+    file: UploadFile = File(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5
+):
     """
     Upload and parse a resume file (PDF or DOCX)
+
+    With explain=true each recommendation includes a per-skill score breakdown.
+    include= is a comma-separated list of response sections (default: all);
+    stages that only feed omitted sections are skipped.
+    sectors= (comma-separated) limits scoring to those sectors and adds the
+    top_n best matches of each sector as recommendations_by_sector.
     """
+    sections = resolve_include(include, UPLOAD_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    # AdmissionPrecheckMiddleware checked this before the body was read;
+    # check again, as the queue may have filled up since
+    ADMISSION_LIMITERS["upload_resume"].check_capacity()
     try:
         # Validate file type
         allowed_extensions = ['.pdf', '.docx']
@@ -58,121 +495,937 @@ async def upload_resume(file: UploadFile = File(...)):
                 detail=f"Unsupported file format. Please upload a PDF or DOCX file."
             )
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            # Write uploaded file to temporary file
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Copy to a temporary file in chunks, checking size and content type
+        temp_file_path, file_size = await save_upload(file, file_extension)
         
-        try:
-            # Parse the resume
-            parsed_data = parse_resume(temp_file_path)
-            
-            # Get career recommendations
-            recommendations = get_recommendations(parsed_data)
-            
-            # Combine results
-            result = {
-                "parsed_resume": parsed_data,
-                "career_analysis": recommendations,
-                "file_info": {
-                    "filename": file.filename,
-                    "file_size": len(content),
-                    "file_type": file_extension
-                }
+        # Parse and analyze off the event loop (deletes the temporary file)
+        result = await analyze_uploaded_file(
+            temp_file_path,
+            sections,
+            explain,
+            sector_names,
+            top_n
+        )
+        if "file_info" in sections:
+            result["file_info"] = {
+                "filename": file.filename,
+                "file_size": file_size,
+                "file_type": file_extension
             }
-            
-            return JSONResponse(content=result)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        
+        return FastJSONResponse(content=result)
                 
+    except (HTTPException, AdmissionRejected):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing resume: {str(e)}"
         )
 
+# Batch uploads: files per request and files parsed at the same time
+BATCH_MAX_FILES = int(os.environ.get("CAREERPATH_BATCH_MAX_FILES", "50"))
+BATCH_CONCURRENCY = int(os.environ.get("CAREERPATH_BATCH_CONCURRENCY", "2"))
+
+async def analyze_batch_file(
+    index: int,
+    file: UploadFile,
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int
+) -> Dict:
+    """Analyze one file of a batch; failures become an error line, not an exception"""
+    line = {"index": index, "filename": file.filename}
+    try:
+        file_extension = os.path.splitext(file.filename or "")[1].lower()
+        if file_extension not in ('.pdf', '.docx'):
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file format. Please upload a PDF or DOCX file."
+            )
+        
+        temp_file_path, file_size = await save_upload(file, file_extension)
+        # The copy is on disk; release the spooled upload right away
+        await file.close()
+        # Each file takes a slot of the shared upload limiter while it is parsed
+        result = await analyze_uploaded_file(
+            temp_file_path,
+            sections,
+            explain,
+            sectors,
+            top_n
+        )
+        if "file_info" in sections:
+            result["file_info"] = {
+                "filename": file.filename,
+                "file_size": file_size,
+                "file_type": file_extension
+            }
+        line["status"] = "ok"
+        line.update(result)
+    except AdmissionRejected as e:
+        line.update(
+            status="error",
+            status_code=e.status_code,
+            detail=e.detail,
+            retry_after=e.retry_after
+        )
+    except HTTPException as e:
+        line.update(status="error", status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        line.update(
+            status="error",
+            status_code=500,
+            detail=f"Error processing resume: {str(e)}"
+        )
+    return line
+
+async def stream_batch_results(
+    files: List[UploadFile],
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int
+):
+    """Yield one NDJSON line per file as it completes, then a summary line.
+
+    At most BATCH_CONCURRENCY files are in flight, so memory does not grow
+    with the batch size.
+    """
+    pending = set()
+    position = 0
+    succeeded = failed = 0
+    try:
+        while position < len(files) or pending:
+            while position < len(files) and len(pending) < BATCH_CONCURRENCY:
+                pending.add(asyncio.ensure_future(analyze_batch_file(
+                    position, files[position], sections, explain, sectors, top_n
+                )))
+                position += 1
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                line = task.result()
+                if line["status"] == "ok":
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield json_dumps(line) + b"\n"
+        
+        yield json_dumps({
+            "summary": {"total": len(files), "succeeded": succeeded, "failed": failed}
+        }) + b"\n"
+    finally:
+        # Client disconnected mid-batch: stop the files still in flight
+        for task in pending:
+            task.cancel()
+
+@app.post("/upload_resumes")
+async def upload_resumes(
+    files: List[UploadFile] = File(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5
+):
+    """
+    Upload many resume files (PDF or DOCX) in one request
+
+    Streams newline-delimited JSON: one line per file, in completion order,
+    with its index, filename, status and the same sections as /upload_resume
+    (or status_code/detail on failure), followed by a summary line.
+    """
+    sections = resolve_include(include, UPLOAD_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Upload at most {BATCH_MAX_FILES} resumes per batch."
+        )
+    # Fail fast while a status code can still be sent
+    ADMISSION_LIMITERS["upload_resume"].check_capacity()
+    
+    return StreamingResponse(
+        stream_batch_results(files, sections, explain, sector_names, top_n),
+        media_type="application/x-ndjson"
+    )
+
+def analyze_resume_file(
+    file_path: str,
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int
+) -> Dict:
+    """Parse a resume file and analyze it (blocking; runs in the thread pool)"""
+    parsed_data = parse_resume(file_path, fields=resume_fields_for(sections))
+    return analyze_parsed_resume(parsed_data, sections, explain, sectors, top_n)
+
+def analyze_resume_text(
+    resume_text: str,
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int
+) -> Dict:
+    """Parse resume text and analyze it (blocking; runs in the thread pool)"""
+    parsed_data = parse_resume_text(resume_text, fields=resume_fields_for(sections))
+    return analyze_parsed_resume(parsed_data, sections, explain, sectors, top_n)
+
+# Seconds between SSE keep-alive comments while a stage is still running
+SSE_HEARTBEAT_SECONDS = float(os.environ.get("CAREERPATH_SSE_HEARTBEAT", "10"))
+
+def iter_resume_analysis(
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int,
+    text: Optional[str] = None,
+    file_path: Optional[str] = None,
+    file_info: Optional[Dict] = None
+):
+    """Analyze a resume (text or file) as (event, data) pairs, one per finished stage.
+
+    Events: contact, skills and details (parsed_resume fields), then
+    recommendations, learning_plan, skill_analysis and personalized_advice,
+    and finally done with the complete result, identical to the
+    /upload_resume or /parse_text response. For multi-page PDFs contact is
+    first sent from page one, before the rest is extracted, and sent again
+    if the full text changes it.
+    """
+    resume_fields = resume_fields_for(sections & {"parsed_resume", "raw_text"})
+    preview = None
+    if file_path is not None:
+        contact_fields = resume_fields & {"name", "email", "phone"}
+        if contact_fields and file_path.lower().endswith(".pdf"):
+            first_page = extract_first_page_from_pdf(file_path)
+            if first_page is not None:
+                for _, part in iter_parse_fields(first_page, contact_fields):
+                    preview = part
+                    yield "contact", part
+        text = extract_resume_text(file_path)
+
+    parsed_data = {}
+    for group, part in iter_parse_fields(text, resume_fields_for(sections)):
+        parsed_data.update(part)
+        visible = {field: value for field, value in part.items() if field in resume_fields}
+        if visible and not (group == "contact" and visible == preview):
+            yield group, visible
+
+    result = {}
+    if resume_fields:
+        result["parsed_resume"] = {
+            field: value for field, value in parsed_data.items() if field in resume_fields
+        }
+    career_sections = sections & set(CAREER_ANALYSIS_SECTIONS)
+    if career_sections:
+        career_analysis = {}
+        for section, part in iter_recommendations(
+            parsed_data, explain, career_sections, sectors, top_n
+        ):
+            career_analysis.update(part)
+            yield section, part
+        result["career_analysis"] = career_analysis
+    if file_info is not None and "file_info" in sections:
+        result["file_info"] = file_info
+    yield "done", result
+
+def sse_event(event: str, data: Dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + json_dumps(data) + b"\n\n"
+
+class AnalysisSteps:
+    """An (event, data) iterator run one step at a time in the thread pool.
+
+    Owns the iterator and the upload it reads. ``close()`` may be called
+    more than once and at any time: while a step is still running in a
+    thread it waits for that step, then closes the iterator and deletes the
+    upload.
+    """
+
+    def __init__(self, events, cleanup_path: Optional[str] = None):
+        self.events = events
+        self.cleanup_path = cleanup_path
+        self.pending = None
+        self.closed = False
+
+    def step(self, finished):
+        """Start the next step; a future of its item, or ``finished`` at the end"""
+        self.pending = asyncio.ensure_future(run_in_threadpool(next, self.events, finished))
+        return self.pending
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.pending is not None and not self.pending.done():
+            self.pending.add_done_callback(lambda _: self.close())
+            return
+        self.closed = True
+        self.events.close()
+        if self.cleanup_path:
+            remove_file(self.cleanup_path)
+
+async def stream_analysis_events(
+    steps: AnalysisSteps,
+    limiter,
+    accepted: Dict,
+    debug: bool = False
+):
+    """Yield the events of ``steps`` as SSE frames.
+
+    Sends accepted at once, holds a slot of ``limiter`` while analyzing and
+    sends keep-alive comments while a stage runs longer than
+    SSE_HEARTBEAT_SECONDS. Failures end the stream with an error event.
+    With debug, done carries the request's _timings like a JSON response.
+    """
+    finished = object()
+    start = time.perf_counter()
+    try:
+        yield sse_event("accepted", accepted)
+        async with limiter.admit() as slot:
+            while True:
+                task = steps.step(finished)
+                slot.hold_until(task)
+                while not task.done():
+                    await asyncio.wait({task}, timeout=SSE_HEARTBEAT_SECONDS)
+                    if not task.done():
+                        yield b": keep-alive\n\n"
+                item = task.result()
+                if item is finished:
+                    break
+                event, data = item
+                timings = current_timings()
+                if event == "done" and debug and timings is not None:
+                    data["_timings"] = {
+                        "total_ms": round((time.perf_counter() - start) * 1000, 3),
+                        "stages": summarize_timings(timings)
+                    }
+                yield sse_event(event, data)
+    except AdmissionRejected as e:
+        yield sse_event("error", {
+            "status_code": e.status_code,
+            "detail": e.detail,
+            "retry_after": e.retry_after
+        })
+    except Exception as e:
+        yield sse_event("error", {
+            "status_code": 500,
+            "detail": f"Error processing resume: {str(e)}"
+        })
+    finally:
+        steps.close()
+
+def sse_response(
+    steps: AnalysisSteps,
+    limiter,
+    accepted: Dict,
+    debug: bool = False
+) -> StreamingResponse:
+    """Stream ``steps`` as Server-Sent Events.
+
+    The steps are closed (and their upload deleted) by the body's finally
+    and again by a background task, which also runs when the client left
+    before the body was started and the finally never ran.
+    """
+    return StreamingResponse(
+        stream_analysis_events(steps, limiter, accepted, debug=debug),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(steps.close)
+    )
+
+@app.post("/upload_resume/stream")
+async def upload_resume_stream(
+    file: UploadFile = File(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5,
+    debug: bool = False
+):
+    """
+    Upload a resume file (PDF or DOCX) and receive results as Server-Sent Events
+
+    Takes the same parameters as /upload_resume. Events: accepted, then
+    contact, skills and details as the resume is parsed, recommendations,
+    learning_plan, skill_analysis and personalized_advice as they are
+    computed, and done with the full /upload_resume response (or error).
+    """
+    sections = resolve_include(include, UPLOAD_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    file_extension = os.path.splitext(file.filename or "")[1].lower()
+    if file_extension not in ('.pdf', '.docx'):
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file format. Please upload a PDF or DOCX file."
+        )
+    # Fail fast while a status code can still be sent
+    ADMISSION_LIMITERS["upload_resume"].check_capacity()
+    
+    temp_file_path, file_size = await save_upload(file, file_extension)
+    file_info = {
+        "filename": file.filename,
+        "file_size": file_size,
+        "file_type": file_extension
+    }
+    events = iter_resume_analysis(
+        sections, explain, sector_names, top_n, file_path=temp_file_path, file_info=file_info
+    )
+    return sse_response(
+        AnalysisSteps(events, cleanup_path=temp_file_path),
+        ADMISSION_LIMITERS["upload_resume"],
+        {"file_info": file_info},
+        debug=debug
+    )
+
+@app.post("/parse_text/stream")
+async def parse_text_stream(
+    resume_text: str = Form(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5,
+    debug: bool = False
+):
+    """
+    Parse resume text and receive results as Server-Sent Events, like /upload_resume/stream
+    """
+    sections = resolve_include(include, RESUME_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    ADMISSION_LIMITERS["parse_text"].check_capacity()
+    
+    events = iter_resume_analysis(
+        sections, explain, sector_names, top_n, text=resume_text
+    )
+    return sse_response(
+        AnalysisSteps(events),
+        ADMISSION_LIMITERS["parse_text"],
+        {"characters": len(resume_text)},
+        debug=debug
+    )
+
 @app.post("/parse_text")
-async def parse_text_resume(resume_text: str = Form(...)):
+async def parse_text_resume(
+    resume_text: str = Form(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5
+):
     """
     Parse resume from text input
     """
+    sections = resolve_include(include, RESUME_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    key = canonical_key("parse_text", resume_text, sections, explain, sector_names, top_n)
     try:
-        # Parse the resume text
-        parsed_data = parse_resume_text(resume_text)
+        # Parse the resume text and get career recommendations
+        result = await SINGLE_FLIGHTS["parse_text"].run(key, lambda: run_admitted(
+            "parse_text",
+            analyze_resume_text,
+            resume_text,
+            sections,
+            explain,
+            sector_names,
+            top_n
+        ))
         
-        # Get career recommendations
-        recommendations = get_recommendations(parsed_data)
-        
-        # Combine results
-        result = {
-            "parsed_resume": parsed_data,
-            "career_analysis": recommendations
-        }
-        
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing resume text: {str(e)}"
         )
 
+def analyze_skills_data(
+    skills_data: Dict[str, Any],
+    sections: set,
+    explain: bool,
+    sectors: Optional[list],
+    top_n: int
+) -> Dict:
+    """Normalize a skills payload and analyze it (blocking; runs in the thread pool)"""
+    # Map free-text skills ("Pyhton", "ReactJS") onto the canonical vocabulary
+    normalized_skills, normalization_report = normalize_skills(
+        skills_data.get("skills", {})
+    )
+
+    # Create a mock parsed resume with skills
+    mock_parsed_resume = {
+        "skills": normalized_skills,
+        "name": skills_data.get("name", "User"),
+        "email": skills_data.get("email", ""),
+        "phone": skills_data.get("phone", "")
+    }
+    
+    result = {}
+    career_sections = sections & set(CAREER_ANALYSIS_SECTIONS)
+    if career_sections:
+        # Get career recommendations
+        result["career_analysis"] = get_recommendations(
+            mock_parsed_resume,
+            explain=explain,
+            include=career_sections,
+            sectors=sectors,
+            top_n=top_n
+        )
+    if "input_skills" in sections:
+        result["input_skills"] = skills_data
+    if "skill_normalization" in sections:
+        result["normalized_skills"] = normalized_skills
+        result["skill_normalization"] = normalization_report
+    return result
+
 @app.post("/analyze_skills")
-async def analyze_skills(skills_data: Dict[str, Any]):
+async def analyze_skills(
+    skills_data: Dict[str, Any],
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5
+):
     """
     Analyze skills and get career recommendations without resume parsing
     """
+    sections = resolve_include(include, SKILLS_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    # Canonical payload: the same skills sent with keys in another order match
+    key = canonical_key("analyze_skills", skills_data, sections, explain, sector_names, top_n)
     try:
-        # Create a mock parsed resume with skills
-        mock_parsed_resume = {
-            "skills": skills_data.get("skills", {}),
-            "name": skills_data.get("name", "User"),
-            "email": skills_data.get("email", ""),
-            "phone": skills_data.get("phone", "")
-        }
+        result = await SINGLE_FLIGHTS["analyze_skills"].run(key, lambda: run_admitted(
+            "analyze_skills",
+            analyze_skills_data,
+            skills_data,
+            sections,
+            explain,
+            sector_names,
+            top_n
+        ))
+        if "input_skills" in result:
+            # Echo this request's own payload
+            result = dict(result, input_skills=skills_data)
         
-        # Get career recommendations
-        recommendations = get_recommendations(mock_parsed_resume)
-        
-        return JSONResponse(content={
-            "career_analysis": recommendations,
-            "input_skills": skills_data
-        })
+        return FastJSONResponse(content=result)
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error analyzing skills: {str(e)}"
         )
 
+def skill_gains_data(skills_data: Dict[str, Any], top_k: int, limit: int) -> Dict:
+    """What-if skill gains for a skills payload (blocking; runs in the thread pool)"""
+    normalized_skills, _ = normalize_skills(skills_data.get("skills", {}))
+    mock_parsed_resume = {"skills": normalized_skills}
+    if "experience" in skills_data:
+        mock_parsed_resume["experience"] = skills_data["experience"]
+    
+    result = get_skill_gains(mock_parsed_resume, top_k=top_k, limit=limit)
+    result["normalized_skills"] = normalized_skills
+    return result
+
+@app.post("/skill_gains")
+async def skill_gains(skills_data: Dict[str, Any], top_k: int = 5, limit: int = 10):
+    """
+    Rank the missing skills by how much learning each one would raise the match scores
+
+    top_k (profiles compared per skill) and limit (skills returned) are
+    between 1 and MAX_TOP_N.
+    """
+    top_k = resolve_top_n(top_k, "top_k")
+    limit = resolve_top_n(limit, "limit")
+    try:
+        result = await ADMISSION_LIMITERS["skill_gains"].run_in_threadpool(
+            skill_gains_data, skills_data, top_k, limit
+        )
+        
+        return FastJSONResponse(content=result)
+        
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error computing skill gains: {str(e)}"
+        )
+
+# Synthetic resume for the startup warm-up; it exercises every parsing and
+# analysis stage (contact details, skills, experience, scoring, plan, advice)
+WARMUP_RESUME_TEXT = """Alex Morgan
+alex.morgan@example.com | +1 555 0100
+
+Software Engineer with 5 years of experience in Python, SQL and machine learning.
+Experience: Developed REST APIs with Docker on AWS; led a team of three engineers.
+Education: Bachelor of Science in Computer Science
+"""
+
+def warmup_analysis() -> None:
+    """One full analysis of WARMUP_RESUME_TEXT, explanation and serialization included"""
+    result = analyze_resume_text(WARMUP_RESUME_TEXT, set(RESUME_SECTIONS), True, None, 5)
+    json_dumps(result)
+
+readiness = Readiness(default_components() + [("analysis", warmup_analysis)])
+
+@app.on_event("startup")
+def start_warmup():
+    """Warm up in the background; /health/ready turns 200 when it is done"""
+    if WARMUP_ENABLED:
+        readiness.start()
+    else:
+        readiness.skip()
+
+# Asynchronous jobs: worker threads per API process (0 when a separate
+# job_worker.py runs them) and the queue depth above which submits get 429
+JOB_WORKERS = int(os.environ.get("CAREERPATH_JOB_WORKERS", "1"))
+JOB_MAX_QUEUED = int(os.environ.get("CAREERPATH_JOB_MAX_QUEUED", "1000"))
+
+def run_traced(debug: bool, analyze, *args) -> Dict:
+    """Run an analysis; with debug, add the stage timings of this run as _timings"""
+    if not debug:
+        return analyze(*args)
+    start = time.perf_counter()
+    timings, token = start_timings()
+    try:
+        result = analyze(*args)
+    finally:
+        stop_timings(token)
+    result["_timings"] = {
+        "total_ms": round((time.perf_counter() - start) * 1000, 3),
+        "stages": summarize_timings(timings)
+    }
+    return result
+
+def run_resume_file_job(params: Dict, payload_path: Optional[str]) -> Dict:
+    result = run_traced(
+        params.get("debug", False),
+        analyze_resume_file,
+        payload_path,
+        set(params["sections"]),
+        params["explain"],
+        params["sectors"],
+        params["top_n"]
+    )
+    if "file_info" in params["sections"]:
+        result["file_info"] = params["file_info"]
+    return result
+
+def run_resume_text_job(params: Dict, payload_path: Optional[str]) -> Dict:
+    return run_traced(
+        params.get("debug", False),
+        analyze_resume_text,
+        params["resume_text"],
+        set(params["sections"]),
+        params["explain"],
+        params["sectors"],
+        params["top_n"]
+    )
+
+def run_skills_job(params: Dict, payload_path: Optional[str]) -> Dict:
+    return run_traced(
+        params.get("debug", False),
+        analyze_skills_data,
+        params["skills_data"],
+        set(params["sections"]),
+        params["explain"],
+        params["sectors"],
+        params["top_n"]
+    )
+
+JOB_HANDLERS = {
+    "upload_resume": run_resume_file_job,
+    "parse_text": run_resume_text_job,
+    "analyze_skills": run_skills_job,
+}
+# Failures caused by the job's input (unsupported or unreadable file, bad
+# parameters): they would fail again, so the job is not retried
+JOB_TERMINAL_ERRORS = (ValueError, HTTPException)
+
+job_workers = None
+
+@app.on_event("startup")
+def start_job_workers():
+    """Run queued jobs in this process, picking up any left by a previous run"""
+    global job_workers
+    if JOB_WORKERS > 0:
+        job_workers = JobWorkerPool(
+            get_job_queue(),
+            JOB_HANDLERS,
+            workers=JOB_WORKERS,
+            terminal_errors=JOB_TERMINAL_ERRORS
+        )
+        job_workers.start()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    global job_workers
+    if job_workers is not None:
+        job_workers.stop()
+        job_workers = None
+
+def submit_job(
+    kind: str,
+    params: Dict,
+    payload_path: Optional[str] = None,
+    dedup_params: Optional[Dict] = None
+) -> FastJSONResponse:
+    """Queue a job (blocking; runs in the thread pool) and build the 202 response"""
+    queue = get_job_queue()
+    queued = queue.stats()["queued"]
+    if queued >= JOB_MAX_QUEUED:
+        raise AdmissionRejected(
+            429, max(1, queued // max(1, JOB_WORKERS)), "Job queue is full, retry later"
+        )
+    job_id, created = queue.submit(kind, params, payload_path, dedup_params)
+    if job_workers is not None:
+        job_workers.notify()
+    job = queue.get(job_id)
+    return FastJSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "status": job["status"] if job else "queued",
+            "deduplicated": not created,
+            "status_url": f"/jobs/{job_id}"
+        },
+        headers={"Location": f"/jobs/{job_id}"}
+    )
+
+@app.post("/jobs/upload_resume")
+async def submit_upload_resume_job(
+    file: UploadFile = File(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5,
+    debug: bool = False
+):
+    """
+    Queue a resume file (PDF or DOCX) for analysis and return its job ID at once
+
+    Takes the same parameters as /upload_resume; poll /jobs/{job_id} for the
+    result. With debug=1 the result carries the job's stage _timings.
+    Submitting the same file, under the same name and with the same
+    parameters, while an earlier job is pending or its result is still kept
+    returns that job.
+    """
+    sections = resolve_include(include, UPLOAD_SECTIONS)
+    sector_names = resolve_sectors(sectors)
+    top_n = resolve_top_n(top_n)
+    file_extension = os.path.splitext(file.filename or "")[1].lower()
+    if file_extension not in ('.pdf', '.docx'):
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file format. Please upload a PDF or DOCX file."
+        )
+    
+    temp_file_path, file_size = await save_upload(file, file_extension)
+    try:
+        params = {
+            "sections": sorted(sections),
+            "explain": explain,
+            "sectors": sector_names,
+            "top_n": top_n,
+            "debug": debug
+        }
+        params["file_info"] = {
+            "filename": file.filename,
+            "file_size": file_size,
+            "file_type": file_extension
+        }
+        # The result echoes file_info, so a file resubmitted under another
+        # name is a new job (the size and type follow from the content)
+        dedup_params = dict(params, filename=file.filename)
+        return await run_in_threadpool(
+            submit_job, "upload_resume", params, temp_file_path, dedup_params
+        )
+    finally:
+        # Moved into the queue on submit; only left behind on failure
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+
+@app.post("/jobs/parse_text")
+async def submit_parse_text_job(
+    resume_text: str = Form(...),
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5,
+    debug: bool = False
+):
+    """
+    Queue resume text for analysis; same parameters as /parse_text
+    """
+    params = {
+        "resume_text": resume_text,
+        "sections": sorted(resolve_include(include, RESUME_SECTIONS)),
+        "explain": explain,
+        "sectors": resolve_sectors(sectors),
+        "top_n": resolve_top_n(top_n),
+        "debug": debug
+    }
+    return await run_in_threadpool(submit_job, "parse_text", params)
+
+@app.post("/jobs/analyze_skills")
+async def submit_analyze_skills_job(
+    skills_data: Dict[str, Any],
+    explain: bool = False,
+    include: Optional[str] = None,
+    sectors: Optional[str] = None,
+    top_n: int = 5,
+    debug: bool = False
+):
+    """
+    Queue a skills payload for analysis; same parameters as /analyze_skills
+    """
+    params = {
+        "skills_data": skills_data,
+        "sections": sorted(resolve_include(include, SKILLS_SECTIONS)),
+        "explain": explain,
+        "sectors": resolve_sectors(sectors),
+        "top_n": resolve_top_n(top_n),
+        "debug": debug
+    }
+    return await run_in_threadpool(submit_job, "analyze_skills", params)
+
+@app.get("/jobs")
+async def job_queue_stats():
+    """Number of jobs per status"""
+    return await run_in_threadpool(get_job_queue().stats)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status of a job: queued, running, done (with result) or failed (with error)
+
+    Unknown job IDs and jobs whose result has expired return 404.
+    """
+    job = await run_in_threadpool(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job '{job_id}' not found or its result has expired"
+        )
+    return FastJSONResponse(content=job)
+
+def resolve_page(page: int, page_size: Optional[int]) -> Optional[int]:
+    """Validate page= / page_size=; no page_size returns the whole catalog"""
+    if page_size is None:
+        return None
+    if not 1 <= page_size <= MAX_PAGE_SIZE or page < 1:
+        raise HTTPException(
+            status_code=400,
+            detail=f"page must be at least 1 and page_size between 1 and {MAX_PAGE_SIZE}"
+        )
+    return page_size
+
+def resolve_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated fields= value; None keeps every field"""
+    if fields is None:
+        return None
+    selected = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name and name not in selected:
+            selected.append(name)
+    return tuple(selected)
+
+def catalog_response(request: Request, payload: CatalogPayload) -> Response:
+    """Send a precomputed catalog payload, gzipped if accepted, or 304 if unchanged"""
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": payload.gzip_etag if use_gzip else payload.etag,
+        "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}",
+        "Vary": "Accept-Encoding"
+    }
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(payload.gzip_body, media_type="application/json", headers=headers)
+    return Response(payload.body, media_type="application/json", headers=headers)
+
+def catalog_content(
+    name: str,
+    total_name: str,
+    catalog: Dict,
+    page: int,
+    page_size: Optional[int],
+    fields: Optional[Tuple[str, ...]]
+) -> Dict:
+    """Response body for one page / field selection of a catalog"""
+    items, pagination = select_page(catalog, page, page_size, fields)
+    content = {name: items, total_name: len(catalog)}
+    if pagination:
+        content.update(pagination)
+    return content
+
 @app.get("/job_profiles")
-async def get_job_profiles():
+async def get_job_profiles(
+    request: Request,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    fields: Optional[str] = None
+):
     """
     Get available job profiles and their requirements
+
+    Serialized and gzipped once per catalog version and sent with an ETag;
+    If-None-Match with the current ETag returns 304. page_size= (with page=)
+    returns one page of profiles; fields= (comma-separated, e.g.
+    title,sector) keeps only those fields of each profile.
     """
-    from services.career_recommender import JOB_PROFILES
-    
-    return JSONResponse(content={
-        "job_profiles": JOB_PROFILES,
-        "total_profiles": len(JOB_PROFILES)
-    })
+    page_size = resolve_page(page, page_size)
+    selected_fields = resolve_fields(fields)
+    page = page if page_size else 1
+    payload = get_catalog_payload_cache().get(
+        catalog_version(),
+        ("job_profiles", page, page_size, selected_fields),
+        lambda: catalog_content(
+            "job_profiles", "total_profiles", JOB_PROFILES, page, page_size, selected_fields
+        )
+    )
+    return catalog_response(request, payload)
 
 @app.get("/learning_resources")
-async def get_learning_resources():
+async def get_learning_resources(
+    request: Request,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    fields: Optional[str] = None
+):
     """
     Get available learning resources
+
+    Cached and paginated like /job_profiles; fields= selects resource types
+    (e.g. courses,books).
     """
-    from services.career_recommender import LEARNING_RESOURCES
-    
-    return JSONResponse(content={
-        "learning_resources": LEARNING_RESOURCES,
-        "total_skills": len(LEARNING_RESOURCES)
-    })
+    page_size = resolve_page(page, page_size)
+    selected_fields = resolve_fields(fields)
+    page = page if page_size else 1
+    payload = get_catalog_payload_cache().get(
+        catalog_version(),
+        ("learning_resources", page, page_size, selected_fields),
+        lambda: catalog_content(
+            "learning_resources",
+            "total_skills",
+            LEARNING_RESOURCES,
+            page,
+            page_size,
+            selected_fields
+        )
+    )
+    return catalog_response(request, payload)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+serve.py
+
+Production entrypoint: preload the app in a master process, then fork
+workers that share its memory.
+
+The master imports the API and builds (or memory-maps) the job profile
+index, title matcher and skill normalizer, the spaCy pipeline and optionally
+the sentence model, binds the listening socket and only then forks. Workers
+inherit all of it copy-on-write instead of each building its own copy, and
+crashed workers are replaced. The reloader is never used.
+
+Whatever the startup warm-up loads (spaCy, and the sentence model with
+CAREERPATH_WARMUP_SENTENCE_MODEL=1) is preloaded by default; otherwise the
+warm-up would load a private copy of it in every worker.
+
+Settings (command-line flags override the environment):
+    CAREERPATH_HOST                 bind address (0.0.0.0)
+    CAREERPATH_PORT                 port (8000)
+    CAREERPATH_WORKERS              worker processes (CPU count)
+    CAREERPATH_LIMIT_CONCURRENCY    connections per worker before 503 (unlimited)
+    CAREERPATH_BACKLOG              listen backlog of the shared socket (2048)
+    CAREERPATH_TIMEOUT_KEEP_ALIVE   keep-alive timeout in seconds (5)
+    CAREERPATH_PRELOAD_NLP          preload spaCy for resume parsing
+                                    (1 unless CAREERPATH_WARMUP=0)
+    CAREERPATH_PRELOAD_SENTENCE_MODEL  preload the sentence model
+                                    (CAREERPATH_WARMUP_SENTENCE_MODEL)
+
+Usage (from the app/ directory):
+    python serve.py
+    python serve.py --workers 4 --limit-concurrency 64
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from services.readiness import WARMUP_ENABLED, WARMUP_SENTENCE_MODEL
+from services.shared_arrays import get_shared_store
+
+logger = logging.getLogger("careerpath.serve")
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+def _env_int(name: str, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def preload(nlp: bool = False, sentence_model: bool = False):
+    """Import the app and build everything workers would otherwise build"""
+    start = time.perf_counter()
+    from main import app
+    from services.career_recommender import (
+        EXACT_SCAN_MAX_PROFILES,
+        get_career_clusters,
+        get_profile_index,
+        get_sentence_model,
+        get_title_index,
+    )
+    from services.skill_normalizer import get_skill_normalizer
+
+    index = get_profile_index()
+    if len(index) > EXACT_SCAN_MAX_PROFILES:
+        get_career_clusters()
+    get_title_index()
+    get_skill_normalizer()
+    if nlp:
+        from services.resume_parser import get_nlp
+
+        get_nlp()
+    if sentence_model:
+        get_sentence_model()
+
+    # Keep preloaded objects out of future collections so the collector
+    # does not touch (and thereby copy) their pages in every worker.
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded app in {time.perf_counter() - start:.2f}s")
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Bind the listening socket in the master so every worker accepts on it"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args) -> None:
+    """Serve requests on the inherited socket until told to stop"""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(
+        app,
+        limit_concurrency=args.limit_concurrency,
+        backlog=args.backlog,
+        timeout_keep_alive=args.timeout_keep_alive,
+        log_level=args.log_level,
+    )
+    server = uvicorn.Server(config)
+    asyncio.run(server.serve(sockets=[sock]))
+
+
+def serve(args) -> int:
+    app = preload(args.preload_nlp, args.preload_sentence_model)
+    sock = bind_socket(args.host, args.port, args.backlog)
+    logger.info(
+        f"Listening on {args.host}:{args.port} with {args.workers} worker(s), "
+        f"backlog {args.backlog}, limit_concurrency {args.limit_concurrency}"
+    )
+
+    if args.workers <= 1 or not hasattr(os, "fork"):
+        run_worker(app, sock, args)
+        return 0
+
+    workers = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(app, sock, args)
+            except Exception:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                # os._exit skips atexit, so drop this worker's segment leases
+                store = get_shared_store()
+                if store is not None:
+                    store.release_all()
+                os._exit(code)
+        workers.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                workers.discard(pid)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for _ in range(args.workers):
+        spawn()
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}; restarting")
+            time.sleep(0.1)
+            spawn()
+
+    sock.close()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--host", default=os.environ.get("CAREERPATH_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=_env_int("CAREERPATH_PORT", 8000))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_env_int("CAREERPATH_WORKERS", os.cpu_count() or 1),
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=_env_int("CAREERPATH_LIMIT_CONCURRENCY", None),
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=_env_int("CAREERPATH_BACKLOG", 2048)
+    )
+    parser.add_argument(
+        "--timeout-keep-alive",
+        type=int,
+        default=_env_int("CAREERPATH_TIMEOUT_KEEP_ALIVE", 5),
+    )
+    parser.add_argument(
+        "--preload-nlp",
+        action=argparse.BooleanOptionalAction,
+        default=_env_flag("CAREERPATH_PRELOAD_NLP", WARMUP_ENABLED),
+    )
+    parser.add_argument(
+        "--preload-sentence-model",
+        action=argparse.BooleanOptionalAction,
+        default=_env_flag(
+            "CAREERPATH_PRELOAD_SENTENCE_MODEL",
+            WARMUP_ENABLED and WARMUP_SENTENCE_MODEL,
+        ),
+    )
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(
+        level=args.log_level.upper(), format="%(asctime)s %(name)s %(message)s"
+    )
+    sys.exit(serve(args))
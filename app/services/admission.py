@@ -0,0 +1,269 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; carries the HTTP response to send"""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class AdmissionSlot:
+    """A request's hold on a limiter slot, yielded by ``AdmissionLimiter.admit``"""
+
+    __slots__ = ("pending",)
+
+    def __init__(self):
+        self.pending = None
+
+    def hold_until(self, future: "asyncio.Future") -> None:
+        """Keep the slot until ``future`` is done, even if the request ends first.
+
+        Work running in a thread cannot be stopped when its request is
+        cancelled (client disconnect), so its slot must not be freed for
+        another request until the thread has finished.
+        """
+        self.pending = future
+        # Nobody may await the future any more; retrieve its exception
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded FIFO wait queue for one endpoint.
+
+    Up to ``max_concurrent`` requests run at once and up to ``max_queue``
+    more wait for a slot, each for at most ``queue_timeout`` seconds.
+    Requests arriving at a full queue are rejected with 429 immediately and
+    requests that time out in the queue get 503, both with a Retry-After
+    estimated from recent service times. Excess load is therefore shed
+    quickly instead of queueing without bound and inflating tail latency.
+
+    Limits apply per worker process and per event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float = 10.0,
+    ):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: deque = deque()
+
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        # Exponentially weighted mean service time, for Retry-After
+        self._service_seconds = 1.0
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to have drained"""
+        backlog = len(self._waiters) + self._active
+        return max(1, math.ceil(backlog * self._service_seconds / self.max_concurrent))
+
+    def check_capacity(self) -> None:
+        """Raise AdmissionRejected (429) right away if the wait queue is full"""
+        if self._active >= self.max_concurrent and len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(
+                429,
+                self.retry_after(),
+                f"Too many concurrent {self.name} requests, retry later",
+            )
+
+    def _release(self) -> None:
+        # Hand the slot straight to the oldest waiter so it cannot be stolen
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _forget(self, waiter) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the duration of the block, or raise AdmissionRejected.
+
+        Yields an AdmissionSlot; see ``AdmissionSlot.hold_until`` for work
+        that may outlive the block.
+        """
+        queued_at = time.monotonic()
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+        else:
+            if len(self._waiters) >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise AdmissionRejected(
+                    429,
+                    self.retry_after(),
+                    f"Too many concurrent {self.name} requests, retry later",
+                )
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, self.queue_timeout)
+            except asyncio.TimeoutError:
+                # A slot handed over just as the timeout fired is kept
+                if not waiter.done() or waiter.cancelled():
+                    self._forget(waiter)
+                    self.rejected_timeout += 1
+                    raise AdmissionRejected(
+                        503,
+                        self.retry_after(),
+                        f"Server busy: {self.name} request waited "
+                        f"{self.queue_timeout:g}s for a slot",
+                    )
+            except asyncio.CancelledError:
+                # Client went away; give back a slot we may already own
+                if waiter.done() and not waiter.cancelled():
+                    self._release()
+                else:
+                    self._forget(waiter)
+                raise
+
+        waited = time.monotonic() - queued_at
+        self.admitted += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        slot = AdmissionSlot()
+        started_at = time.monotonic()
+        try:
+            yield slot
+        finally:
+            if slot.pending is not None and not slot.pending.done():
+                slot.pending.add_done_callback(lambda _: self._finish(started_at))
+            else:
+                self._finish(started_at)
+
+    def _finish(self, started_at: float) -> None:
+        elapsed = time.monotonic() - started_at
+        self._service_seconds += 0.2 * (elapsed - self._service_seconds)
+        self._release()
+
+    async def run_in_threadpool(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """Run blocking ``fn(*args)`` in the thread pool under a slot.
+
+        If the caller is cancelled, the thread keeps running and keeps the
+        slot until it returns. ``on_done`` is called once the thread has
+        finished, or when the call ends before a thread was started
+        (rejected, or cancelled while queued).
+        """
+        task = None
+        try:
+            async with self.admit() as slot:
+                task = asyncio.ensure_future(run_in_threadpool(fn, *args))
+                slot.hold_until(task)
+                if on_done is not None:
+                    task.add_done_callback(lambda _: on_done())
+                # shield: cancelling the caller must not mark the task done early
+                return await asyncio.shield(task)
+        finally:
+            if task is None and on_done is not None:
+                on_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "mean_wait_seconds": (
+                round(self.wait_seconds_total / self.admitted, 6)
+                if self.admitted
+                else 0.0
+            ),
+            "mean_service_seconds": round(self._service_seconds, 6),
+        }
+
+
+class AdmissionPrecheckMiddleware:
+    """Reject POSTs to an endpoint whose wait queue is full before reading the body.
+
+    ``limiters`` maps paths to their AdmissionLimiter. Only the queue-full
+    check (429) is done here; the handler still takes the slot. Answers
+    like the app's AdmissionRejected handler, with a Retry-After header.
+    """
+
+    def __init__(self, app, limiters: Dict[str, AdmissionLimiter]):
+        self.app = app
+        self.limiters = limiters
+
+    async def __call__(self, scope, receive, send):
+        limiter = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limiter = self.limiters.get(scope["path"])
+        if limiter is not None:
+            try:
+                limiter.check_capacity()
+            except AdmissionRejected as e:
+                _match_route(scope)
+                response = JSONResponse(
+                    {"detail": e.detail},
+                    status_code=e.status_code,
+                    headers={"Retry-After": str(e.retry_after)},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def _match_route(scope) -> None:
+    # Routing is skipped for a rejected request; resolve its route anyway so
+    # MetricsMiddleware labels it with the endpoint and not as ``other``
+    for route in scope["app"].router.routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            scope.update(child_scope)
+            return
+
+
+def limiter_from_env(
+    name: str, max_concurrent: int, max_queue: int, queue_timeout: float = 10.0
+) -> AdmissionLimiter:
+    """Build a limiter; CAREERPATH_<NAME>_CONCURRENCY, _QUEUE and _QUEUE_TIMEOUT
+    override the defaults"""
+    prefix = f"CAREERPATH_{name.upper()}_"
+    return AdmissionLimiter(
+        name,
+        max_concurrent=int(os.environ.get(prefix + "CONCURRENCY", max_concurrent)),
+        max_queue=int(os.environ.get(prefix + "QUEUE", max_queue)),
+        queue_timeout=float(os.environ.get(prefix + "QUEUE_TIMEOUT", queue_timeout)),
+    )
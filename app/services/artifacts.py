@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Compiled serving artifacts live in versioned subdirectories of this
+# directory, next to a manifest.json naming the current version.
+ARTIFACTS_DIR = os.environ.get(
+    "CAREERPATH_ARTIFACTS_DIR",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models"
+    ),
+)
+MANIFEST_NAME = "manifest.json"
+
+_manifest = None
+_manifest_mtime = None
+_manifest_lock = threading.Lock()
+
+
+def _manifest_path(directory: str) -> str:
+    return os.path.join(directory, MANIFEST_NAME)
+
+
+def read_manifest(directory: str = ARTIFACTS_DIR) -> Optional[Dict[str, Any]]:
+    """Return the artifact manifest, or None when nothing has been compiled"""
+    global _manifest, _manifest_mtime
+    path = _manifest_path(directory)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    with _manifest_lock:
+        if _manifest is None or _manifest_mtime != (path, mtime):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    _manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable artifact manifest {path}: {e}")
+                return None
+            _manifest_mtime = (path, mtime)
+        return _manifest
+
+
+def write_artifacts(
+    version: str,
+    artifacts: Dict[str, tuple],
+    directory: str = ARTIFACTS_DIR,
+    keep: int = 2,
+) -> Dict[str, Any]:
+    """Dump ``artifacts`` ({name: (key, object)}) as version ``version``.
+
+    Objects are written uncompressed so that their numpy arrays can be
+    memory-mapped on load. The version directory is filled under a temporary
+    name and renamed into place before the manifest is switched over, so
+    readers never see a partial build. Only the ``keep`` newest versions are
+    kept on disk.
+    """
+    import joblib
+
+    os.makedirs(directory, exist_ok=True)
+    staging = os.path.join(directory, f".{version}.{os.getpid()}.tmp")
+    target = os.path.join(directory, version)
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    entries = {}
+    for name, (key, obj) in artifacts.items():
+        filename = f"{name}.joblib"
+        joblib.dump(obj, os.path.join(staging, filename))
+        entries[name] = {
+            "file": filename,
+            "key": key,
+            "bytes": os.path.getsize(os.path.join(staging, filename)),
+        }
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.rename(staging, target)
+
+    manifest = {
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "artifacts": entries,
+    }
+    manifest_tmp = _manifest_path(directory) + ".tmp"
+    with open(manifest_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_tmp, _manifest_path(directory))
+
+    # Old versions may still be mapped by running workers; unlinking the
+    # files does not affect existing mappings.
+    versions = sorted(
+        (
+            entry
+            for entry in os.scandir(directory)
+            if entry.is_dir() and not entry.name.startswith(".")
+        ),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in versions[max(keep, 1) :]:
+        if entry.name != version:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    return manifest
+
+
+def load_artifact(name: str, key: str, directory: str = ARTIFACTS_DIR) -> Any:
+    """Load artifact ``name`` if it was compiled for ``key``, else return None.
+
+    Numpy arrays inside the artifact are memory-mapped read-only, so worker
+    processes share the pages of the compiled index instead of each building
+    (and holding) its own copy.
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    entry = manifest.get("artifacts", {}).get(name)
+    if entry is None or entry.get("key") != key:
+        return None
+
+    import joblib
+
+    path = os.path.join(directory, manifest["version"], entry["file"])
+    try:
+        return joblib.load(path, mmap_mode="r")
+    except Exception as e:
+        logging.warning(f"Failed to load artifact {path}: {e}")
+        return None
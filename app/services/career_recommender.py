@@ -1,13 +1,28 @@
 import logging
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import List, Dict, Any, FrozenSet
 
-import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import TfidfVectorizer
-from typing import Dict, List, Tuple
-import joblib
+from typing import Dict, Iterator, List, Tuple
 import os
+import threading
+import time
+
+from services.artifacts import load_artifact
+from services.metrics import stage
+from services.profile_index import CareerClusters, ProfileIndex
+from services.shared_arrays import get_shared_store
+from services.recommendation_cache import (
+    RecommendationCache,
+    cache_from_env,
+    canonical_key,
+)
+from services.title_index import (
+    EXACT_ROLE_BONUSES,
+    TITLE_KEYWORDS,
+    TitleIndex,
+    title_match_bonus,
+)
 
 # Comprehensive job profiles across all sectors
 JOB_PROFILES = {
@@ -1244,47 +1259,539 @@ LEARNING_RESOURCES = {
     },
 }
 
-# Ensure a SentenceTransformer name is always defined (real if available, lightweight fallback otherwise)
-try:
-    # Try real import (may fail if huggingface_hub / sentence-transformers incompatibility exists)
-    from sentence_transformers import SentenceTransformer as _RealSentenceTransformer  # type: ignore
-
-    SentenceTransformer = _RealSentenceTransformer
-except Exception:
-    # Lightweight deterministic fallback so encode() calls work without heavy deps.
-    class SentenceTransformer:
-        def __init__(self, *args, **kwargs):
-            # no-op constructor for fallback
-            pass
-
-        def encode(self, texts, convert_to_numpy: bool = False):
-            """
-            Simple deterministic text->vector mapping:
-            - Produces 16-d vectors based on md5 hash of text.
-            - Returns numpy array if convert_to_numpy=True, otherwise list of lists.
-            This allows downstream similarity code to run without the real model.
-            """
-            import hashlib
+# Map individual technologies to the skill categories used in job profiles
+SKILL_CATEGORY_MAPPING = {
+    # Programming languages
+    "python": "programming",
+    "java": "programming",
+    "javascript": "programming",
+    "typescript": "programming",
+    "c++": "programming",
+    "c#": "programming",
+    "php": "programming",
+    "ruby": "programming",
+    "go": "programming",
+    "rust": "programming",
+    "swift": "programming",
+    "kotlin": "programming",
+    "scala": "programming",
+    "r": "programming",
+    "matlab": "programming",
+    "sas": "programming",
+    "stata": "programming",
+    "spss": "programming",
+    # Web development
+    "html": "web_development",
+    "css": "web_development",
+    "react": "web_development",
+    "angular": "web_development",
+    "vue": "web_development",
+    "node.js": "web_development",
+    "express": "web_development",
+    "django": "web_development",
+    "flask": "web_development",
+    "spring": "web_development",
+    "asp.net": "web_development",
+    "laravel": "web_development",
+    "wordpress": "web_development",
+    "drupal": "web_development",
+    "jquery": "web_development",
+    "bootstrap": "web_development",
+    # Databases
+    "sql": "databases",
+    "mysql": "databases",
+    "postgresql": "databases",
+    "mongodb": "databases",
+    "redis": "databases",
+    "oracle": "databases",
+    "sqlite": "databases",
+    "mariadb": "databases",
+    "cassandra": "databases",
+    "neo4j": "databases",
+    "elasticsearch": "databases",
+    "dynamodb": "databases",
+    # Cloud platforms
+    "aws": "cloud_platforms",
+    "azure": "azure",
+    "gcp": "cloud_platforms",
+    "google cloud": "cloud_platforms",
+    "amazon web services": "cloud_platforms",
+    "docker": "cloud_platforms",
+    "kubernetes": "cloud_platforms",
+    "terraform": "cloud_platforms",
+    "jenkins": "cloud_platforms",
+    "gitlab": "cloud_platforms",
+    # DevOps
+    "ci/cd": "devops",
+    "continuous integration": "devops",
+    "continuous deployment": "devops",
+    "jenkins": "devops",
+    "gitlab ci": "devops",
+    "github actions": "devops",
+    "docker": "devops",
+    "kubernetes": "devops",
+    "terraform": "devops",
+    "ansible": "devops",
+    "chef": "devops",
+    "puppet": "devops",
+    # Data science
+    "machine learning": "data_science",
+    "deep learning": "data_science",
+    "tensorflow": "data_science",
+    "pytorch": "data_science",
+    "scikit-learn": "data_science",
+    "pandas": "data_science",
+    "numpy": "data_science",
+    "matplotlib": "data_science",
+    "seaborn": "data_science",
+    "plotly": "data_science",
+    "jupyter": "data_science",
+    "spark": "data_science",
+    "hadoop": "data_science",
+    "hive": "data_science",
+    "kafka": "data_science",
+    "airflow": "data_science",
+    "tableau": "data_science",
+    "power bi": "data_science",
+    # Git
+    "git": "git",
+    "github": "git",
+    "gitlab": "git",
+    "bitbucket": "git",
+    # Algorithms
+    "algorithms": "algorithms",
+    "data structures": "algorithms",
+    "sorting": "algorithms",
+    "searching": "algorithms",
+    "dynamic programming": "algorithms",
+    "graph algorithms": "algorithms",
+}
 
-            try:
-                import numpy as _np
-            except Exception:
-                _np = None
 
-            def _vec_from_text(t: str):
-                h = hashlib.md5(t.encode("utf-8")).digest()
-                # use first 16 bytes normalized to [0,1)
-                return [b / 255.0 for b in h[:16]]
+def _expand_skills(user_skill_set: set) -> set:
+    """Add the profile skill category of every individual technology"""
+    expanded_user_skills = set(user_skill_set)
+    for skill in user_skill_set:
+        if skill in SKILL_CATEGORY_MAPPING:
+            expanded_user_skills.add(SKILL_CATEGORY_MAPPING[skill])
+    return expanded_user_skills
+
+
+def _extract_cv_titles(experience: List) -> List[str]:
+    """Job titles from "Title | Company" or "Title at Company" experience lines"""
+    cv_job_titles = []
+    for exp in experience:
+        if isinstance(exp, str):
+            # Extract job titles from experience strings
+            if "|" in exp:
+                job_title = exp.split("|")[0].strip()
+                cv_job_titles.append(job_title.lower())
+            elif "at" in exp.lower():
+                parts = exp.split("at")
+                if len(parts) > 1:
+                    job_title = parts[0].strip()
+                    cv_job_titles.append(job_title.lower())
+    return cv_job_titles
+
+
+@dataclass(frozen=True)
+class ResumeFeatures:
+    """Scoring inputs derived once per request from the user's skills and resume.
+
+    Every profile is scored against the same skill sets and CV titles, so
+    they are normalized here instead of inside the per-profile scoring code.
+    """
+
+    skills: FrozenSet[str]
+    expanded_skills: FrozenSet[str]
+    cv_titles: Tuple[str, ...]
+    has_context: bool
+    has_experience: bool
+
+    @classmethod
+    def build(
+        cls, user_skills: Dict[str, List[str]], parsed_resume: Dict = None
+    ) -> "ResumeFeatures":
+        user_skill_set = set()
+        for category, skills in user_skills.items():
+            user_skill_set.update([skill.lower() for skill in skills])
+
+        has_experience = bool(parsed_resume) and "experience" in parsed_resume
+        experience = parsed_resume["experience"] if has_experience else []
+
+        return cls(
+            skills=frozenset(user_skill_set),
+            expanded_skills=frozenset(_expand_skills(user_skill_set)),
+            cv_titles=tuple(_extract_cv_titles(experience)),
+            has_context=bool(parsed_resume),
+            has_experience=has_experience,
+        )
+
+
+# Profiles are scored with a full scan up to this catalog size; above it the
+# recommender only scores the profiles in the closest career clusters.
+EXACT_SCAN_MAX_PROFILES = int(
+    os.environ.get("CAREERPATH_EXACT_SCAN_MAX_PROFILES", "500")
+)
+
+# Number of career clusters scored when not doing a full scan.
+CLUSTER_PROBES = int(os.environ.get("CAREERPATH_CLUSTER_PROBES", "3"))
+
+# Weights of the match score. calculate_job_match_score and score_profiles
+# must stay in sync with these.
+SCORING_WEIGHTS = {
+    # Share of the base score from required / preferred skill overlap
+    "required": 0.7,
+    "preferred": 0.3,
+    # Bonus for the share of required skills the user lists explicitly
+    "experience": 0.2,
+    # Title bonuses above this count as an exact role match
+    "exact_title_threshold": 0.3,
+    # Base score multiplier when there is no exact role match
+    "inexact_title_base": 0.7,
+}
+
+# Seconds between checks of the catalog fingerprint. Edits to JOB_PROFILES,
+# LEARNING_RESOURCES or the scoring weights are picked up within this interval.
+CATALOG_CHECK_INTERVAL = float(
+    os.environ.get("CAREERPATH_CATALOG_CHECK_INTERVAL", "5")
+)
+
+# Layout version of the compiled ProfileIndex, CareerClusters and TitleIndex.
+# Bump it whenever one of those classes changes, so that artifacts built by
+# older code are not loaded even when the catalog is unchanged.
+INDEX_SCHEMA_VERSION = 1
+
+_profile_index = None
+_profile_segment = None
+_career_clusters = None
+_title_index = None
+_recommendation_cache = cache_from_env()
+_catalog_version = None
+_catalog_checked_at = 0.0
+
+
+def catalog_version(force: bool = False) -> str:
+    """Fingerprint of everything that affects recommendation results.
+
+    Hashing the catalog costs more than scoring a request, so it is only
+    recomputed every CATALOG_CHECK_INTERVAL seconds (or when ``force``).
+    A new fingerprint drops the indexes and the recommendation cache.
+    """
+    global _catalog_version, _catalog_checked_at
+    global _profile_index, _career_clusters, _title_index
+
+    now = time.monotonic()
+    if (
+        force
+        or _catalog_version is None
+        or now - _catalog_checked_at >= CATALOG_CHECK_INTERVAL
+    ):
+        version = canonical_key(
+            JOB_PROFILES,
+            LEARNING_RESOURCES,
+            SKILL_CATEGORY_MAPPING,
+            SCORING_WEIGHTS,
+            TITLE_KEYWORDS,
+            EXACT_ROLE_BONUSES,
+            EXACT_SCAN_MAX_PROFILES,
+            CLUSTER_PROBES,
+        )[:16]
+        if version != _catalog_version:
+            _release_profile_segment()
+            _profile_index = None
+            _career_clusters = None
+            _title_index = None
+            _recommendation_cache.clear()
+            _catalog_version = version
+        _catalog_checked_at = now
+    return _catalog_version
+
+
+def index_key(version: str) -> str:
+    """Artifact and shared segment key of the indexes for catalog ``version``"""
+    return f"{version}-schema{INDEX_SCHEMA_VERSION}"
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """Return the process-wide memo of scored recommendations"""
+    return _recommendation_cache
+
+
+def _release_profile_segment() -> None:
+    global _profile_segment
+    store = get_shared_store()
+    if store is not None and _profile_segment is not None:
+        store.release(_profile_segment)
+    _profile_segment = None
+
+
+def get_profile_index() -> ProfileIndex:
+    """Return the skill x profile index for JOB_PROFILES.
+
+    The compiled artifact is used when it matches the current catalog.
+    Otherwise the index is built on first use, with its matrices placed in
+    a shared segment so that every worker maps the same copy.
+    """
+    global _profile_index, _profile_segment
+    version = catalog_version()
+    if _profile_index is None:
+        _profile_index = load_artifact("profile_index", index_key(version))
+        if _profile_index is None:
+            store = get_shared_store()
+            if store is None:
+                _profile_index = ProfileIndex(JOB_PROFILES)
+            else:
+                segment = f"profile_index-{index_key(version)}"
+                _profile_index = ProfileIndex(
+                    JOB_PROFILES,
+                    array_store=lambda build: store.get_or_create(segment, build),
+                )
+                _profile_segment = segment
+    return _profile_index
+
+
+def get_career_clusters() -> CareerClusters:
+    """Return the career family clustering of JOB_PROFILES, fitting it on first use"""
+    global _career_clusters
+    index = get_profile_index()
+    if _career_clusters is None:
+        _career_clusters = load_artifact("career_clusters", index_key(_catalog_version))
+        if _career_clusters is None:
+            _career_clusters = CareerClusters(index)
+    return _career_clusters
+
+
+def get_title_index() -> TitleIndex:
+    """Return the title matcher over JOB_PROFILES titles, compiling it on first use"""
+    global _title_index
+    index = get_profile_index()
+    if _title_index is None:
+        _title_index = load_artifact("title_index", index_key(_catalog_version))
+        if _title_index is None:
+            _title_index = TitleIndex(index.titles)
+    return _title_index
+
+
+def score_profiles(features: ResumeFeatures, rows: np.ndarray = None) -> np.ndarray:
+    """Match score in [0, 1] of the profiles at ``rows`` (all by default).
+
+    Vectorized equivalent of CareerRecommender.calculate_job_match_score:
+    skill overlaps are matrix-vector products over the profile index and
+    the title bonuses come from the precompiled title index.
+    """
+    return score_profiles_with_components(features, rows)[0]
+
+
+def score_profiles_with_components(
+    features: ResumeFeatures, rows: np.ndarray = None
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Scores plus the per-profile terms needed to explain them.
+
+    The score is linear in the user's skill indicators before the cap at
+    1.0, so the components (per-skill weights, title bonus, base multiplier)
+    are enough for explain_scores to attribute it exactly.
+    """
+    index = get_profile_index()
+    if rows is None:
+        rows = np.arange(len(index))
+
+    expanded_vector = index.skill_vector(features.expanded_skills)
+    base_scores = index.base_scores(
+        expanded_vector,
+        rows,
+        SCORING_WEIGHTS["required"],
+        SCORING_WEIGHTS["preferred"],
+    )
+    components = {
+        "rows": rows,
+        "expanded_vector": expanded_vector,
+        "skill_vector": None,
+        "multipliers": np.ones(len(rows), np.float64),
+        "title_bonuses": np.zeros(len(rows), np.float64),
+        "uncapped": base_scores,
+    }
+    if not features.has_context:
+        return base_scores, components
+
+    title_bonuses = get_title_index().bonuses(features.cv_titles)[rows]
+
+    experience_bonuses = np.zeros(len(rows), np.float64)
+    if features.has_experience:
+        skill_vector = index.skill_vector(features.skills)
+        components["skill_vector"] = skill_vector
+        required_counts = index.required_counts[rows]
+        experience_bonuses = (
+            np.divide(
+                (index.required[rows] @ skill_vector).astype(np.float64),
+                required_counts,
+                out=np.zeros(len(rows), np.float64),
+                where=required_counts > 0,
+            )
+            * SCORING_WEIGHTS["experience"]
+        )
+
+    exact_role = title_bonuses > SCORING_WEIGHTS["exact_title_threshold"]
+    multipliers = np.where(exact_role, 1.0, SCORING_WEIGHTS["inexact_title_base"])
+    base_scores = np.where(
+        exact_role, base_scores, base_scores * SCORING_WEIGHTS["inexact_title_base"]
+    )
+    uncapped = base_scores + title_bonuses + experience_bonuses
+    components.update(
+        multipliers=multipliers, title_bonuses=title_bonuses, uncapped=uncapped
+    )
+    return np.minimum(1.0, uncapped), components
+
+
+def explain_scores(
+    features: ResumeFeatures, components: Dict[str, Any], positions: List[int]
+) -> List[Dict]:
+    """Exact per-skill attribution of the scores at ``positions``.
+
+    Each matched required or preferred skill earns its share of the
+    weighted overlap (scaled by the title multiplier) plus, for required
+    skills listed on the resume itself, its share of the experience bonus.
+    The title bonus and the reduction from capping at 100 are reported
+    separately, so the points add up to the match score.
+    """
+    index = get_profile_index()
+    rows = components["rows"][positions]
+    multipliers = components["multipliers"][positions]
+    expanded_vector = components["expanded_vector"]
+    skill_vector = components["skill_vector"]
+
+    required = index.required[rows].astype(np.float64)
+    preferred = index.preferred[rows].astype(np.float64)
+    required_shares = np.divide(
+        1.0,
+        index.required_counts[rows],
+        out=np.zeros(len(rows), np.float64),
+        where=index.required_counts[rows] > 0,
+    )[:, None]
+    preferred_shares = np.divide(
+        1.0,
+        index.preferred_counts[rows],
+        out=np.zeros(len(rows), np.float64),
+        where=index.preferred_counts[rows] > 0,
+    )[:, None]
+
+    weighted = multipliers[:, None] * expanded_vector
+    required_points = (
+        required * required_shares * weighted * SCORING_WEIGHTS["required"]
+    )
+    if skill_vector is not None:
+        required_points += (
+            required * required_shares * skill_vector * SCORING_WEIGHTS["experience"]
+        )
+    preferred_points = (
+        preferred * preferred_shares * weighted * SCORING_WEIGHTS["preferred"]
+    )
+
+    # Which of the user's own skills satisfy each index skill
+    matched_by = {}
+    for skill in features.expanded_skills:
+        if skill in features.skills:
+            matched_by.setdefault(skill, []).append(skill)
+    for skill in sorted(features.skills):
+        category = SKILL_CATEGORY_MAPPING.get(skill)
+        if category is not None and category != skill:
+            matched_by.setdefault(category, []).append(skill)
+
+    explanations = []
+    for i, position in enumerate(positions):
+        contributions = []
+        for kind, points in (
+            ("required", required_points[i]),
+            ("preferred", preferred_points[i]),
+        ):
+            for skill_id in np.flatnonzero(points):
+                skill = index.skills[skill_id]
+                contributions.append(
+                    {
+                        "skill": skill,
+                        "type": kind,
+                        "points": round(float(points[skill_id]) * 100, 2),
+                        "matched_by": matched_by.get(skill, [skill]),
+                    }
+                )
+        contributions.sort(key=lambda x: x["points"], reverse=True)
+
+        uncapped = float(components["uncapped"][position])
+        explanations.append(
+            {
+                "skills": contributions,
+                "title_bonus": round(
+                    float(components["title_bonuses"][position]) * 100, 2
+                ),
+                "cap_adjustment": round((min(1.0, uncapped) - uncapped) * 100, 2),
+            }
+        )
+
+    return explanations
+
+
+# Lightweight deterministic fallback so encode() calls work without heavy deps.
+class _FallbackSentenceTransformer:
+    def __init__(self, *args, **kwargs):
+        # no-op constructor for fallback
+        pass
+
+    def encode(self, texts, convert_to_numpy: bool = False):
+        """
+        Simple deterministic text->vector mapping:
+        - Produces 16-d vectors based on md5 hash of text.
+        - Returns numpy array if convert_to_numpy=True, otherwise list of lists.
+        This allows downstream similarity code to run without the real model.
+        """
+        import hashlib
+
+        def _vec_from_text(t: str):
+            h = hashlib.md5(t.encode("utf-8")).digest()
+            # use first 16 bytes normalized to [0,1)
+            return [b / 255.0 for b in h[:16]]
+
+        single = False
+        if isinstance(texts, str):
+            texts = [texts]
+            single = True
+
+        vecs = [_vec_from_text(str(t)) for t in texts]
+        if convert_to_numpy:
+            return np.array(vecs)
+        return vecs if not single else vecs[0]
+
+
+SENTENCE_MODEL_NAME = "all-MiniLM-L6-v2"
+
+_sentence_model = None
+_sentence_model_lock = threading.Lock()
+
 
-            single = False
-            if isinstance(texts, str):
-                texts = [texts]
-                single = True
+def get_sentence_model():
+    """Return the shared sentence embedding model, loading it on first use.
+
+    sentence_transformers pulls in torch, which takes seconds to import and
+    hundreds of MB of memory, so it is only imported when embeddings are
+    actually requested. Falls back to a hashing encoder when it is missing.
+    """
+    global _sentence_model
+    if _sentence_model is not None:
+        return _sentence_model
+
+    with _sentence_model_lock:
+        if _sentence_model is None:
+            try:
+                # May fail if huggingface_hub / sentence-transformers are incompatible
+                from sentence_transformers import SentenceTransformer  # type: ignore
+
+                _sentence_model = SentenceTransformer(SENTENCE_MODEL_NAME)
+            except Exception as e:
+                logging.warning(
+                    f"Sentence model unavailable ({e}); using hashing fallback."
+                )
+                _sentence_model = _FallbackSentenceTransformer()
+    return _sentence_model
 
-            vecs = [_vec_from_text(str(t)) for t in texts]
-            if convert_to_numpy and _np is not None:
-                return _np.array(vecs)
-            return vecs if not single else vecs[0]
 
 # ...existing code...
 
@@ -1402,18 +1909,21 @@ def get_recommendations(
 
 
 class CareerRecommender:
-    def __init__(self):
-        self.model_path = "app/models/career_model.pkl"
-        self.vectorizer_path = "app/models/vectorizer.pkl"
-        self.sentence_model = SentenceTransformer("all-MiniLM-L6-v2")
+    @property
+    def sentence_model(self):
+        """Sentence embedding model, loaded on first use"""
+        return get_sentence_model()
 
     def detect_skill_gaps(
-        self, user_skills: Dict[str, List[str]], job_required_skills: List[str]
+        self,
+        user_skills: Dict[str, List[str]],
+        job_required_skills: List[str],
+        features: ResumeFeatures = None,
     ) -> List[str]:
         """Detect missing skills for a specific job"""
-        user_skill_set = set()
-        for category, skills in user_skills.items():
-            user_skill_set.update([skill.lower() for skill in skills])
+        if features is None:
+            features = ResumeFeatures.build(user_skills)
+        user_skill_set = features.skills
 
         missing_skills = []
         for required_skill in job_required_skills:
@@ -1427,11 +1937,16 @@ class CareerRecommender:
         user_skills: Dict[str, List[str]],
         job_profile: Dict,
         parsed_resume: Dict = None,
+        features: ResumeFeatures = None,
     ) -> float:
-        """Calculate how well user skills match a job profile with CV context awareness"""
-        user_skill_set = set()
-        for category, skills in user_skills.items():
-            user_skill_set.update([skill.lower() for skill in skills])
+        """Calculate how well user skills match a job profile with CV context awareness
+
+        Pass ``features`` built once with ResumeFeatures.build when scoring
+        many profiles for the same request.
+        """
+        if features is None:
+            features = ResumeFeatures.build(user_skills, parsed_resume)
+        user_skill_set = features.skills
 
         required_skills = set(
             [skill.lower() for skill in job_profile["required_skills"]]
@@ -1440,119 +1955,9 @@ class CareerRecommender:
             [skill.lower() for skill in job_profile.get("preferred_skills", [])]
         )
 
-        # Map individual technologies to skill categories for better matching
-        skill_category_mapping = {
-            # Programming languages
-            "python": "programming",
-            "java": "programming",
-            "javascript": "programming",
-            "typescript": "programming",
-            "c++": "programming",
-            "c#": "programming",
-            "php": "programming",
-            "ruby": "programming",
-            "go": "programming",
-            "rust": "programming",
-            "swift": "programming",
-            "kotlin": "programming",
-            "scala": "programming",
-            "r": "programming",
-            "matlab": "programming",
-            "sas": "programming",
-            "stata": "programming",
-            "spss": "programming",
-            # Web development
-            "html": "web_development",
-            "css": "web_development",
-            "react": "web_development",
-            "angular": "web_development",
-            "vue": "web_development",
-            "node.js": "web_development",
-            "express": "web_development",
-            "django": "web_development",
-            "flask": "web_development",
-            "spring": "web_development",
-            "asp.net": "web_development",
-            "laravel": "web_development",
-            "wordpress": "web_development",
-            "drupal": "web_development",
-            "jquery": "web_development",
-            "bootstrap": "web_development",
-            # Databases
-            "sql": "databases",
-            "mysql": "databases",
-            "postgresql": "databases",
-            "mongodb": "databases",
-            "redis": "databases",
-            "oracle": "databases",
-            "sqlite": "databases",
-            "mariadb": "databases",
-            "cassandra": "databases",
-            "neo4j": "databases",
-            "elasticsearch": "databases",
-            "dynamodb": "databases",
-            # Cloud platforms
-            "aws": "cloud_platforms",
-            "azure": "azure",
-            "gcp": "cloud_platforms",
-            "google cloud": "cloud_platforms",
-            "amazon web services": "cloud_platforms",
-            "docker": "cloud_platforms",
-            "kubernetes": "cloud_platforms",
-            "terraform": "cloud_platforms",
-            "jenkins": "cloud_platforms",
-            "gitlab": "cloud_platforms",
-            # DevOps
-            "ci/cd": "devops",
-            "continuous integration": "devops",
-            "continuous deployment": "devops",
-            "jenkins": "devops",
-            "gitlab ci": "devops",
-            "github actions": "devops",
-            "docker": "devops",
-            "kubernetes": "devops",
-            "terraform": "devops",
-            "ansible": "devops",
-            "chef": "devops",
-            "puppet": "devops",
-            # Data science
-            "machine learning": "data_science",
-            "deep learning": "data_science",
-            "tensorflow": "data_science",
-            "pytorch": "data_science",
-            "scikit-learn": "data_science",
-            "pandas": "data_science",
-            "numpy": "data_science",
-            "matplotlib": "data_science",
-            "seaborn": "data_science",
-            "plotly": "data_science",
-            "jupyter": "data_science",
-            "spark": "data_science",
-            "hadoop": "data_science",
-            "hive": "data_science",
-            "kafka": "data_science",
-            "airflow": "data_science",
-            "tableau": "data_science",
-            "power bi": "data_science",
-            # Git
-            "git": "git",
-            "github": "git",
-            "gitlab": "git",
-            "bitbucket": "git",
-            # Algorithms
-            "algorithms": "algorithms",
-            "data structures": "algorithms",
-            "sorting": "algorithms",
-            "searching": "algorithms",
-            "dynamic programming": "algorithms",
-            "graph algorithms": "algorithms",
-        }
 
-        # Expand user skills with category mappings
-        expanded_user_skills = user_skill_set.copy()
-        for skill in user_skill_set:
-            if skill in skill_category_mapping:
-                expanded_user_skills.add(skill_category_mapping[skill])
+        # User skills expanded with category mappings
+        expanded_user_skills = features.expanded_skills
 
         # Calculate base match scores with expanded skills
         required_match = (
@@ -1569,81 +1974,21 @@ class CareerRecommender:
         )
 
         # Base weighted score
-        base_score = (required_match * 0.7) + (preferred_match * 0.3)
+        base_score = (required_match * SCORING_WEIGHTS["required"]) + (
+            preferred_match * SCORING_WEIGHTS["preferred"]
+        )
 
         # Apply CV context bonuses if parsed_resume is provided
-        if parsed_resume:
+        if features.has_context:
             # Bonus for matching job titles/roles in CV
-            cv_job_titles = []
-            if "experience" in parsed_resume:
-                for exp in parsed_resume["experience"]:
-                    if isinstance(exp, str):
-                        # Extract job titles from experience strings
-                        if "|" in exp:
-                            job_title = exp.split("|")[0].strip()
-                            cv_job_titles.append(job_title.lower())
-                        elif "at" in exp.lower():
-                            parts = exp.split("at")
-                            if len(parts) > 1:
-                                job_title = parts[0].strip()
-                                cv_job_titles.append(job_title.lower())
+            cv_job_titles = features.cv_titles
 
             # Check if job profile title matches CV job titles
-            job_title_lower = job_profile["title"].lower()
-            title_match_bonus = 0.0
-
-            for cv_title in cv_job_titles:
-                # Check for exact or partial matches
-                if job_title_lower in cv_title or cv_title in job_title_lower:
-                    title_match_bonus = 0.3  # Significant bonus for matching job titles
-                    break
-                # Check for keyword matches (e.g., "engineer", "developer", "manager")
-                title_keywords = [
-                    "engineer",
-                    "developer",
-                    "manager",
-                    "analyst",
-                    "specialist",
-                    "coordinator",
-                    "scientist",
-                ]
-                for keyword in title_keywords:
-                    if keyword in job_title_lower and keyword in cv_title:
-                        title_match_bonus = 0.2
-                        break
-
-                # Check for more specific matches
-                if (
-                    "software engineer" in cv_title.lower()
-                    and "software engineer" in job_title_lower
-                ):
-                    title_match_bonus = 0.4  # Higher bonus for exact role match
-                    break
-                elif (
-                    "data scientist" in cv_title.lower()
-                    and "data scientist" in job_title_lower
-                ):
-                    title_match_bonus = 0.4
-                    break
-                elif (
-                    "marketing manager" in cv_title.lower()
-                    and "marketing manager" in job_title_lower
-                ):
-                    title_match_bonus = 0.4
-                    break
-                elif (
-                    "civil engineer" in cv_title.lower()
-                    and "civil engineer" in job_title_lower
-                ):
-                    title_match_bonus = 0.4
-                    break
+            title_bonus = title_match_bonus(cv_job_titles, job_profile["title"])
 
             # Bonus for skills mentioned in work experience
             experience_bonus = 0.0
-            if "experience" in parsed_resume:
-                experience_text = " ".join(
-                    [str(exp) for exp in parsed_resume["experience"]]
-                ).lower()
+            if features.has_experience:
                 experience_skills = user_skill_set.intersection(required_skills)
                 if experience_skills:
                     # Calculate what percentage of required skills appear in experience
@@ -1652,17 +1997,20 @@ class CareerRecommender:
                         if required_skills
                         else 0
                     )
-                    experience_bonus = experience_skill_ratio * 0.2
+                    experience_bonus = (
+                        experience_skill_ratio * SCORING_WEIGHTS["experience"]
+                    )
 
             # Apply bonuses with higher weight for exact job title matches
-            if title_match_bonus > 0.3:  # Exact role match
-                total_score = min(
-                    1.0, base_score + title_match_bonus + experience_bonus
-                )
+            if title_bonus > SCORING_WEIGHTS["exact_title_threshold"]:
+                total_score = min(1.0, base_score + title_bonus + experience_bonus)
             else:
                 # For non-exact matches, reduce the base score to prioritize exact matches
                 total_score = min(
-                    1.0, (base_score * 0.7) + title_match_bonus + experience_bonus
+                    1.0,
+                    (base_score * SCORING_WEIGHTS["inexact_title_base"])
+                    + title_bonus
+                    + experience_bonus,
                 )
 
             return total_score
@@ -1674,34 +2022,129 @@ class CareerRecommender:
         user_skills: Dict[str, List[str]],
         top_n: int = 5,
         parsed_resume: Dict = None,
+        exact: bool = None,
+        n_probe: int = None,
+        features: ResumeFeatures = None,
+        explain: bool = False,
+        sectors: List[str] = None,
     ) -> List[Dict]:
-        """Get top career recommendations based on user skills with CV context awareness"""
-        recommendations = []
+        """Get top career recommendations based on user skills with CV context awareness
+
+        With ``exact`` every profile is scored. Otherwise only the profiles in
+        the ``n_probe`` career clusters closest to the user's skills are
+        scored. By default a full scan is used for catalogs of up to
+        EXACT_SCAN_MAX_PROFILES profiles. With ``explain`` each
+        recommendation carries an exact per-skill breakdown of its score.
+        ``sectors`` restricts scoring to the profiles of those sectors.
+        """
+        return self.get_sector_recommendations(
+            user_skills,
+            sectors,
+            top_n=top_n,
+            parsed_resume=parsed_resume,
+            exact=exact,
+            n_probe=n_probe,
+            features=features,
+            explain=explain,
+        )[0]
+
+    @stage("scoring")
+    def get_sector_recommendations(
+        self,
+        user_skills: Dict[str, List[str]],
+        sectors: List[str] = None,
+        top_n: int = 5,
+        parsed_resume: Dict = None,
+        exact: bool = None,
+        n_probe: int = None,
+        features: ResumeFeatures = None,
+        explain: bool = False,
+    ) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+        """Top recommendations overall and per sector from a single scoring pass
+
+        Only the profiles of the requested ``sectors`` (all by default) are
+        scored. Returns the overall top ``top_n`` and, for each requested
+        sector, that sector's own top ``top_n``.
+        """
+        if features is None:
+            features = ResumeFeatures.build(user_skills, parsed_resume)
+
+        index = get_profile_index()
+        partitions = (
+            [index.sector_rows.get(sector, index.no_rows) for sector in sectors]
+            if sectors
+            else [np.arange(len(index))]
+        )
 
-        for job_title, job_profile in JOB_PROFILES.items():
-            match_score = self.calculate_job_match_score(
-                user_skills, job_profile, parsed_resume
+        if exact is None:
+            exact = sum(map(len, partitions)) <= EXACT_SCAN_MAX_PROFILES
+        if not exact:
+            probed = get_career_clusters().probe(
+                index.skill_vector(features.expanded_skills),
+                n_probe or CLUSTER_PROBES,
             )
+            # A sector none of the probed clusters reaches is scanned in
+            # full so that it still gets its own top matches
+            probed_partitions = [
+                np.intersect1d(partition, probed) for partition in partitions
+            ]
+            partitions = [
+                probed_rows if len(probed_rows) or not sectors else partition
+                for probed_rows, partition in zip(probed_partitions, partitions)
+            ]
+        rows = np.sort(np.concatenate(partitions))
+
+        scores, components = score_profiles_with_components(features, rows)
+        match_scores = [round(float(score) * 100, 2) for score in scores]
+
+        def _top(positions):
+            # Sort by match score (highest first); ties keep catalog order
+            return sorted(positions, key=lambda i: -match_scores[i])[:top_n]
+
+        overall = _top(range(len(rows)))
+        by_sector = {}
+        if sectors:
+            row_sectors = [index.sectors[row] for row in rows]
+            for sector in sectors:
+                by_sector[sector] = _top(
+                    [i for i, name in enumerate(row_sectors) if name == sector]
+                )
+
+        # Build result dicts (and explanations) only for the returned rows
+        positions = sorted(set(overall).union(*by_sector.values()))
+        explanations = (
+            dict(zip(positions, explain_scores(features, components, positions)))
+            if explain
+            else {}
+        )
+        built = {}
+        for i in positions:
+            job_profile = JOB_PROFILES[index.profile_ids[rows[i]]]
             skill_gaps = self.detect_skill_gaps(
-                user_skills, job_profile["required_skills"]
+                user_skills, job_profile["required_skills"], features=features
             )
 
-            recommendations.append(
-                {
-                    "job_title": job_profile["title"],
-                    "match_score": round(match_score * 100, 2),
-                    "description": job_profile["description"],
-                    "missing_skills": skill_gaps,
-                    "required_skills": job_profile["required_skills"],
-                    "preferred_skills": job_profile.get("preferred_skills", []),
-                    "sector": job_profile.get("sector", "unknown"),
-                }
-            )
+            built[i] = {
+                "job_title": job_profile["title"],
+                "match_score": match_scores[i],
+                "description": job_profile["description"],
+                "missing_skills": skill_gaps,
+                "required_skills": job_profile["required_skills"],
+                "preferred_skills": job_profile.get("preferred_skills", []),
+                "sector": job_profile.get("sector", "unknown"),
+            }
+            if i in explanations:
+                built[i]["score_breakdown"] = explanations[i]
 
-        # Sort by match score (highest first)
-        recommendations.sort(key=lambda x: x["match_score"], reverse=True)
-        return recommendations[:top_n]
+        return (
+            [built[i] for i in overall],
+            {
+                sector: [built[i] for i in ranked]
+                for sector, ranked in by_sector.items()
+            },
+        )
 
+    @stage("learning_plan")
     def get_learning_plan(self, missing_skills: List[str]) -> Dict[str, Dict]:
         """Generate learning plan for missing skills"""
         learning_plan = {}
@@ -1766,11 +2209,16 @@ class CareerRecommender:
             / 6,  # Normalize by max categories
         }
 
+    @stage("advice")
     def get_personalized_advice(
-        self, user_skills: Dict[str, List[str]], recommendations: List[Dict]
+        self,
+        user_skills: Dict[str, List[str]],
+        recommendations: List[Dict],
+        skill_analysis: Dict = None,
     ) -> Dict:
         """Generate personalized career advice"""
-        skill_analysis = self.get_skill_analysis(user_skills)
+        if skill_analysis is None:
+            skill_analysis = self.get_skill_analysis(user_skills)
         top_recommendation = recommendations[0] if recommendations else None
 
         advice = {
@@ -1822,33 +2270,262 @@ class CareerRecommender:
         return advice
 
 
-def get_recommendations(parsed_resume: Dict) -> Dict:
-    """Main function to get career recommendations"""
+# Sections of the career analysis returned by get_recommendations
+CAREER_ANALYSIS_SECTIONS = (
+    "recommendations",
+    "learning_plan",
+    "skill_analysis",
+    "personalized_advice",
+)
+
+
+def get_recommendations(
+    parsed_resume: Dict,
+    explain: bool = False,
+    include=None,
+    sectors: List[str] = None,
+    top_n: int = 5,
+) -> Dict:
+    """Main function to get career recommendations
+
+    With ``explain`` every recommendation includes a ``score_breakdown``
+    attributing its match score to individual skills. ``include`` limits
+    the result to a subset of CAREER_ANALYSIS_SECTIONS; stages only needed
+    by sections that are left out are skipped. With ``sectors`` only those
+    sectors are scored and ``recommendations_by_sector`` holds the top
+    ``top_n`` of each.
+    """
+    result = {}
+    for _, part in iter_recommendations(parsed_resume, explain, include, sectors, top_n):
+        result.update(part)
+    return result
+
+
+def iter_recommendations(
+    parsed_resume: Dict,
+    explain: bool = False,
+    include=None,
+    sectors: List[str] = None,
+    top_n: int = 5,
+) -> Iterator[Tuple[str, Dict]]:
+    """get_recommendations one section at a time, as each stage finishes.
+
+    Yields ``(section, part)`` pairs in the order the stages run:
+    recommendations (with recommendations_by_sector when ``sectors`` are
+    given), learning_plan, skill_analysis, personalized_advice. Merging the
+    parts gives the get_recommendations result.
+    """
+    sections = set(CAREER_ANALYSIS_SECTIONS if include is None else include)
     recommender = CareerRecommender()
     user_skills = parsed_resume.get("skills", {})
 
-    # Get career recommendations with CV context awareness
-    recommendations = recommender.get_career_recommendations(
-        user_skills, parsed_resume=parsed_resume
-    )
-
-    # Get learning plan for top recommendation
-    top_recommendation = recommendations[0] if recommendations else None
-    learning_plan = {}
-    if top_recommendation:
-        learning_plan = recommender.get_learning_plan(
-            top_recommendation["missing_skills"]
+    recommendations = None
+    if sections & {"recommendations", "learning_plan", "personalized_advice"}:
+        recommendations, by_sector = _cached_recommendations(
+            recommender, user_skills, parsed_resume, explain, sectors, top_n
         )
 
+    if "recommendations" in sections:
+        part = {"recommendations": recommendations}
+        if sectors:
+            part["recommendations_by_sector"] = by_sector
+        yield "recommendations", part
+
+    if "learning_plan" in sections:
+        # Get learning plan for top recommendation
+        top_recommendation = recommendations[0] if recommendations else None
+        learning_plan = {}
+        if top_recommendation:
+            learning_plan = recommender.get_learning_plan(
+                top_recommendation["missing_skills"]
+            )
+        yield "learning_plan", {"learning_plan": learning_plan}
+
     # Get skill analysis and advice
-    skill_analysis = recommender.get_skill_analysis(user_skills)
-    personalized_advice = recommender.get_personalized_advice(
-        user_skills, recommendations
+    if sections & {"skill_analysis", "personalized_advice"}:
+        skill_analysis = recommender.get_skill_analysis(user_skills)
+        if "skill_analysis" in sections:
+            yield "skill_analysis", {"skill_analysis": skill_analysis}
+        if "personalized_advice" in sections:
+            advice = recommender.get_personalized_advice(
+                user_skills, recommendations, skill_analysis=skill_analysis
+            )
+            yield "personalized_advice", {"personalized_advice": advice}
+
+
+def _cached_recommendations(
+    recommender: CareerRecommender,
+    user_skills: Dict[str, List[str]],
+    parsed_resume: Dict,
+    explain: bool,
+    sectors: List[str] = None,
+    top_n: int = 5,
+) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+    """Ranked recommendations, memoized per normalized skills and CV titles"""
+    features = ResumeFeatures.build(user_skills, parsed_resume)
+
+    # Recommendations only depend on the normalized skills and CV titles,
+    # so identical skill sets share one cached result
+    cache_key = canonical_key(
+        "recommendations",
+        catalog_version(),
+        features.skills,
+        features.cv_titles,
+        features.has_context,
+        features.has_experience,
+        explain,
+        sectors,
+        top_n,
     )
+    cached = _recommendation_cache.get(cache_key)
+    if cached is None:
+        # Get career recommendations with CV context awareness
+        cached = recommender.get_sector_recommendations(
+            user_skills,
+            sectors,
+            top_n=top_n,
+            parsed_resume=parsed_resume,
+            features=features,
+            explain=explain,
+        )
+        _recommendation_cache.put(cache_key, cached)
 
-    return {
-        "recommendations": recommendations,
-        "learning_plan": learning_plan,
-        "skill_analysis": skill_analysis,
-        "personalized_advice": personalized_advice,
+    recommendations, by_sector = cached
+    return list(recommendations), dict(by_sector)
+
+
+def get_skill_gains(parsed_resume: Dict, top_k: int = 5, limit: int = 10) -> Dict:
+    """What-if analysis: the effect of learning each missing skill.
+
+    For every profile skill the user does not have yet, the scores of all
+    profiles are recomputed as if the user had that skill, in one
+    vectorized pass over the skill x profile matrices (one row per
+    candidate skill) instead of a full rescore per skill. Returns the
+    ``limit`` candidates that raise the best match the most, each with the
+    profiles it improves and how the top ``top_k`` would change.
+    """
+    user_skills = parsed_resume.get("skills", {})
+    features = ResumeFeatures.build(user_skills, parsed_resume)
+    index = get_profile_index()
+    scores, components = score_profiles_with_components(features)
+
+    candidates = [
+        skill_id
+        for skill_id, skill in enumerate(index.skills)
+        if skill not in features.expanded_skills
+    ]
+    current_top = np.argsort(-np.round(scores * 100, 2), kind="stable")[:top_k]
+    result = {
+        "current_top_k": [
+            {
+                "job_title": index.titles[row],
+                "match_score": round(float(scores[row]) * 100, 2),
+            }
+            for row in current_top
+        ],
+        "skill_gains": [],
     }
+    if not candidates:
+        return result
+
+    # Indicator rows of what each candidate adds to the expanded skill set:
+    # the skill itself and the category it maps to
+    added_expanded = np.zeros((len(candidates), len(index.skills)), np.float32)
+    added_raw = np.zeros_like(added_expanded)
+    for i, skill_id in enumerate(candidates):
+        skill = index.skills[skill_id]
+        added_expanded[i, skill_id] = 1.0
+        added_raw[i, skill_id] = 1.0
+        category_id = index.skill_ids.get(SKILL_CATEGORY_MAPPING.get(skill))
+        if category_id is not None and index.skills[category_id] not in (
+            features.expanded_skills
+        ):
+            added_expanded[i, category_id] = 1.0
+
+    def _shares(counts):
+        return np.divide(
+            1.0, counts, out=np.zeros(len(counts), np.float64), where=counts > 0
+        )
+
+    required_shares = _shares(index.required_counts)
+    preferred_shares = _shares(index.preferred_counts)
+
+    # Overlaps after adding each candidate: current overlap + what it adds
+    expanded_vector = components["expanded_vector"]
+    required_overlap = (index.required @ expanded_vector)[None, :] + (
+        added_expanded @ index.required.T
+    )
+    preferred_overlap = (index.preferred @ expanded_vector)[None, :] + (
+        added_expanded @ index.preferred.T
+    )
+    new_scores = (
+        required_overlap.astype(np.float64)
+        * required_shares
+        * SCORING_WEIGHTS["required"]
+        + preferred_overlap.astype(np.float64)
+        * preferred_shares
+        * SCORING_WEIGHTS["preferred"]
+    )
+
+    if features.has_context:
+        new_scores = (
+            new_scores * components["multipliers"] + components["title_bonuses"]
+        )
+        if features.has_experience:
+            listed_overlap = (index.required @ index.skill_vector(features.skills))[
+                None, :
+            ] + (added_raw @ index.required.T)
+            new_scores += (
+                listed_overlap.astype(np.float64)
+                * required_shares
+                * SCORING_WEIGHTS["experience"]
+            )
+        new_scores = np.minimum(1.0, new_scores)
+
+    gains = np.round((new_scores - scores[None, :]) * 100, 2)
+    new_match_scores = np.round(new_scores * 100, 2)
+    new_tops = np.argsort(-new_match_scores, axis=1, kind="stable")[:, :top_k]
+    current_best = round(float(scores.max()) * 100, 2)
+    top_score_gains = new_match_scores.max(axis=1) - current_best
+    profiles_improved = (gains > 0).sum(axis=1)
+
+    # Best first: biggest rise of the best match, then of any single
+    # profile, then the skill that helps the most profiles
+    order = sorted(
+        range(len(candidates)),
+        key=lambda i: (
+            -top_score_gains[i],
+            -gains[i].max(),
+            -profiles_improved[i],
+            index.skills[candidates[i]],
+        ),
+    )[:limit]
+
+    current_titles = [index.titles[row] for row in current_top]
+    for i in order:
+        improved = np.flatnonzero(gains[i] > 0)
+        improved = improved[np.argsort(-gains[i][improved], kind="stable")]
+        new_titles = [index.titles[row] for row in new_tops[i]]
+        result["skill_gains"].append(
+            {
+                "skill": index.skills[candidates[i]],
+                "top_score_gain": round(float(top_score_gains[i]), 2),
+                "max_profile_gain": float(gains[i].max()),
+                "profiles_improved": int(profiles_improved[i]),
+                "profile_gains": [
+                    {"job_title": index.titles[row], "gain": float(gains[i][row])}
+                    for row in improved[:top_k]
+                ],
+                "top_k": [
+                    {
+                        "job_title": index.titles[row],
+                        "match_score": float(new_match_scores[i][row]),
+                    }
+                    for row in new_tops[i]
+                ],
+                "entered_top_k": [t for t in new_titles if t not in current_titles],
+                "left_top_k": [t for t in current_titles if t not in new_titles],
+            }
+        )
+
+    return result
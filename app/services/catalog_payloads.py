@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.responses import json_dumps
+
+# Seconds clients and proxies may reuse a catalog response without revalidating
+CATALOG_MAX_AGE = int(os.environ.get("CAREERPATH_CATALOG_MAX_AGE", "60"))
+
+# Largest page_size= accepted for paginated catalog responses
+MAX_PAGE_SIZE = 500
+
+# Paginated / field-selected variants kept per catalog version
+_MAX_VARIANTS = 256
+
+
+class CatalogPayload:
+    """A catalog response serialized once, with its gzip body and ETags.
+
+    ETags are strong and differ per encoding, as RFC 9110 requires for
+    representations that are not byte-identical.
+    """
+
+    __slots__ = ("body", "gzip_body", "etag", "gzip_etag")
+
+    def __init__(self, content: Dict[str, Any]):
+        self.body = json_dumps(content)
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True if an If-None-Match header names either representation"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # If-None-Match uses weak comparison, so W/ prefixes added by proxies match
+        tags |= {tag[2:] for tag in tags if tag.startswith("W/")}
+        return self.etag in tags or self.gzip_etag in tags
+
+
+def select_page(
+    items: Dict[str, Any],
+    page: Optional[int],
+    page_size: Optional[int],
+    fields: Optional[Tuple[str, ...]],
+) -> Tuple[Dict[str, Any], Optional[Dict[str, int]]]:
+    """Slice a catalog dict to one page and project each entry onto ``fields``.
+
+    Returns the selected entries and, when paginated, the page metadata.
+    """
+    pagination = None
+    if page_size is not None:
+        total = len(items)
+        start = (page - 1) * page_size
+        keys = list(items)[start : start + page_size]
+        items = {key: items[key] for key in keys}
+        pagination = {
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size,
+        }
+    if fields is not None:
+        items = {
+            key: {field: value[field] for field in fields if field in value}
+            for key, value in items.items()
+        }
+    return items, pagination
+
+
+class CatalogPayloadCache:
+    """Serialized catalog responses, keyed by catalog version and query.
+
+    The full payload of a catalog is built once per version; page and field
+    variants are built on first request and kept in a small LRU. A new
+    catalog version drops everything built for the previous one.
+    """
+
+    def __init__(self, max_variants: int = _MAX_VARIANTS):
+        self.max_variants = max_variants
+        self._version = None
+        self._payloads: "OrderedDict[tuple, CatalogPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        version: str,
+        key: tuple,
+        build: Callable[[], Dict[str, Any]],
+    ) -> CatalogPayload:
+        with self._lock:
+            if version != self._version:
+                self._payloads.clear()
+                self._version = version
+            payload = self._payloads.get(key)
+            if payload is not None:
+                self._payloads.move_to_end(key)
+                return payload
+
+        payload = CatalogPayload(build())
+        with self._lock:
+            if version == self._version:
+                self._payloads[key] = payload
+                while len(self._payloads) > self.max_variants:
+                    self._payloads.popitem(last=False)
+        return payload
+
+
+_payload_cache = CatalogPayloadCache()
+
+
+def get_catalog_payload_cache() -> CatalogPayloadCache:
+    """Return the process-wide cache of serialized catalog responses"""
+    return _payload_cache
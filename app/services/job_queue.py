@@ -0,0 +1,394 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+JOBS_DIR = os.environ.get(
+    "CAREERPATH_JOBS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jobs"),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    payload_path TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_dedup ON jobs (dedup_key);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def content_hash(
+    kind: str, params: Dict[str, Any], file_path: Optional[str] = None
+) -> str:
+    """Deduplication key: the job kind, its parameters and the input file"""
+    digest = hashlib.sha256()
+    digest.update(kind.encode("utf-8"))
+    digest.update(b"\0")
+    if file_path:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    digest.update(b"\0")
+    digest.update(json.dumps(params, sort_keys=True, default=sorted).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class JobQueue:
+    """Durable job queue in a local SQLite database.
+
+    Jobs survive restarts: a job is claimed under a lease, which its worker
+    renews while the job runs, and a job whose worker died (lease expired)
+    is handed out again, up to ``max_attempts`` times. A claim is identified
+    by the job's attempt number, so a worker that lost its lease cannot
+    finish or requeue the job under the worker that took it over. Submitting
+    the same input and parameters while an earlier job is queued, running or
+    finished (and not expired) returns that job instead of a new one.
+    Finished jobs and their payloads are purged after ``result_ttl``
+    seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str = JOBS_DIR,
+        result_ttl: float = 3600.0,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+    ):
+        self.directory = directory
+        self.payload_dir = os.path.join(directory, "payloads")
+        self.db_path = os.path.join(directory, "jobs.sqlite3")
+        self.result_ttl = result_ttl
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(self.payload_dir, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        payload_path: Optional[str] = None,
+        dedup_params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, bool]:
+        """Queue a job; returns (job_id, created).
+
+        ``payload_path`` is moved into the queue's payload directory. When an
+        equivalent live job exists (same kind, ``dedup_params`` - by default
+        ``params`` - and payload content), the payload is discarded and that
+        job's id is returned with ``created`` False.
+        """
+        dedup_key = content_hash(
+            kind, params if dedup_params is None else dedup_params, payload_path
+        )
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            existing = db.execute(
+                "SELECT id FROM jobs WHERE dedup_key = ? AND status != ? "
+                "AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY created_at DESC LIMIT 1",
+                (dedup_key, FAILED, now),
+            ).fetchone()
+            if existing is not None:
+                db.execute("COMMIT")
+                if payload_path and os.path.exists(payload_path):
+                    os.unlink(payload_path)
+                return existing["id"], False
+
+            job_id = uuid.uuid4().hex
+            stored_path = None
+            if payload_path:
+                extension = os.path.splitext(payload_path)[1]
+                stored_path = os.path.join(self.payload_dir, job_id + extension)
+                shutil.move(payload_path, stored_path)
+            db.execute(
+                "INSERT INTO jobs (id, kind, dedup_key, status, params, payload_path, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, dedup_key, QUEUED, json.dumps(params), stored_path, now),
+            )
+            db.execute("COMMIT")
+            return job_id, True
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """Lease the oldest runnable job (queued, or running with a lapsed lease)"""
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT * FROM jobs WHERE status = ? "
+                "OR (status = ? AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            if row["attempts"] >= self.max_attempts:
+                self._finish(db, row, FAILED, error="Worker died while processing")
+                db.execute("COMMIT")
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, "
+                "lease_until = ? WHERE id = ?",
+                (RUNNING, now, now + self.lease_seconds, row["id"]),
+            )
+            db.execute("COMMIT")
+            return db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def _finish(self, db, row, status: str, result=None, error=None) -> bool:
+        now = time.time()
+        cursor = db.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+            "expires_at = ?, lease_until = NULL, payload_path = NULL "
+            "WHERE id = ? AND attempts = ?",
+            (
+                status,
+                None if result is None else json.dumps(result),
+                error,
+                now,
+                now + self.result_ttl,
+                row["id"],
+                row["attempts"],
+            ),
+        )
+        if cursor.rowcount == 0:
+            # Another worker claimed the job since; its payload is in use
+            logging.warning(f"Job {row['id']} was claimed again; dropping {status}")
+            return False
+        if row["payload_path"] and os.path.exists(row["payload_path"]):
+            os.unlink(row["payload_path"])
+        return True
+
+    def renew(self, row: sqlite3.Row) -> bool:
+        """Extend the lease of a claimed job; False if the claim was lost"""
+        with closing(self._connect()) as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_until = ? "
+                "WHERE id = ? AND attempts = ? AND status = ?",
+                (time.time() + self.lease_seconds, row["id"], row["attempts"], RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, row: sqlite3.Row, result: Any) -> bool:
+        """Store the result of a claimed job; False if the claim was lost"""
+        with closing(self._connect()) as db:
+            return self._finish(db, row, DONE, result=result)
+
+    def fail(self, row: sqlite3.Row, error: str, retry: bool = True) -> bool:
+        """Requeue the job, or mark it failed after ``max_attempts`` tries.
+
+        With ``retry`` False (bad input, which fails the same way every time)
+        the job is marked failed at once. Returns False if the claim was lost.
+        """
+        with closing(self._connect()) as db:
+            if retry and row["attempts"] < self.max_attempts:
+                cursor = db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_until = NULL "
+                    "WHERE id = ? AND attempts = ?",
+                    (QUEUED, error, row["id"], row["attempts"]),
+                )
+                return cursor.rowcount == 1
+            return self._finish(db, row, FAILED, error=error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Public view of a job, or None if unknown or expired"""
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or (row["expires_at"] and row["expires_at"] <= time.time()):
+            return None
+
+        job = {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "expires_at": row["expires_at"],
+        }
+        if row["status"] == DONE:
+            job["result"] = json.loads(row["result"])
+        elif row["status"] == FAILED:
+            job["error"] = row["error"]
+        return job
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs whose TTL has passed"""
+        with closing(self._connect()) as db:
+            cursor = db.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+
+class JobWorkerPool:
+    """Threads that claim jobs from a JobQueue and run them with ``handlers``.
+
+    ``handlers`` maps a job kind to ``fn(params, payload_path) -> result``.
+    A handler raising one of ``terminal_errors`` fails its job without a
+    retry; other exceptions requeue it, up to the queue's ``max_attempts``.
+    While a handler runs, its job's lease is renewed every third of the
+    lease, so long jobs are not handed to a second worker.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[Dict[str, Any], Optional[str]], Any]],
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        purge_interval: float = 60.0,
+        terminal_errors: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.terminal_errors = terminal_errors
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._last_purge = 0.0
+
+    def start(self) -> None:
+        self._stop.clear()
+        for number in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"careerpath-job-{number}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a submit"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if time.time() - self._last_purge >= self.purge_interval:
+                    self._last_purge = time.time()
+                    self.queue.purge_expired()
+                row = self.queue.claim()
+            except sqlite3.Error as e:
+                logging.error(f"Job queue error: {e}")
+                row = None
+
+            if row is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            finished = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat,
+                args=(row, finished),
+                name=f"careerpath-job-lease-{row['id'][:8]}",
+                daemon=True,
+            )
+            heartbeat.start()
+            try:
+                handler = self.handlers[row["kind"]]
+                result = handler(json.loads(row["params"]), row["payload_path"])
+            except self.terminal_errors as e:
+                logging.warning(f"Job {row['id']} ({row['kind']}) failed: {e}")
+                self.queue.fail(row, str(e), retry=False)
+            except Exception as e:
+                logging.exception(f"Job {row['id']} ({row['kind']}) failed")
+                self.queue.fail(row, str(e))
+            else:
+                self.queue.complete(row, result)
+            finally:
+                finished.set()
+                heartbeat.join()
+
+    def _heartbeat(self, row: sqlite3.Row, finished: threading.Event) -> None:
+        interval = self.queue.lease_seconds / 3
+        while not finished.wait(interval):
+            try:
+                if not self.queue.renew(row):
+                    logging.warning(f"Job {row['id']} lost its lease")
+                    return
+            except sqlite3.Error as e:
+                logging.error(f"Job queue error renewing {row['id']}: {e}")
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide queue, configured by CAREERPATH_JOB_* variables"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(
+                result_ttl=float(os.environ.get("CAREERPATH_JOB_RESULT_TTL", "3600")),
+                lease_seconds=float(
+                    os.environ.get("CAREERPATH_JOB_LEASE_SECONDS", "300")
+                ),
+                max_attempts=int(os.environ.get("CAREERPATH_JOB_MAX_ATTEMPTS", "3")),
+            )
+    return _queue
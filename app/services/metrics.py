@@ -0,0 +1,331 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from cache hits (~0.5 ms) to large PDFs
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Response size buckets in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Counter:
+    """Monotonic counter, safe to increment from several threads"""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self) -> None:
+        with self._lock:
+            self._value += 1
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Histogram:
+    """Fixed-bucket histogram, safe to observe from several threads.
+
+    One lock guards the bucket counts and the sum, so a snapshot never sees
+    an observation counted in a bucket but missing from the sum.
+    """
+
+    __slots__ = ("bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One extra bucket for observations above the largest bound (+Inf)
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[list, int, float]:
+        """Cumulative bucket counts, total count and sum"""
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+        cumulative = []
+        total = 0
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative, total, total_sum
+
+
+class MetricFamily:
+    """A named metric with one child (Counter or Histogram) per label set.
+
+    Children are created on first use and then reused, so steady-state
+    recording does a dict lookup and no allocation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Optional[Tuple[float, ...]] = None,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._children: Dict[tuple, object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = Histogram(self.buckets) if self.kind == "histogram" else Counter()
+            child = self._children.setdefault(values, child)
+        return child
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in sorted(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            if self.kind == "counter":
+                yield f"{self.name}_total{_braces(labels)} {child.value}"
+                continue
+            cumulative, total, total_sum = child.snapshot()
+            for bound, count in zip(child.bounds + (float("inf"),), cumulative):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = labels + [f'le="{le}"']
+                yield f"{self.name}_bucket{_braces(bucket_labels)} {count}"
+            yield f"{self.name}_sum{_braces(labels)} {total_sum!r}"
+            yield f"{self.name}_count{_braces(labels)} {total}"
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from ``collect()`` at scrape time.
+
+    ``collect`` returns a mapping of label value tuples to numbers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        labelnames: Tuple[str, ...],
+        collect: Callable[[], Dict[tuple, float]],
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        suffix = "_total" if self.kind == "counter" else ""
+        for values, value in sorted(self.collect().items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{suffix}{_braces(labels)} {value}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple) -> list:
+    return [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+
+def _braces(labels: list) -> str:
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Registry:
+    """Metrics of this process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> MetricFamily:
+        return self.register(MetricFamily(name, help_text, "counter", labelnames))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> MetricFamily:
+        return self.register(
+            MetricFamily(name, help_text, "histogram", labelnames, buckets)
+        )
+
+    def callback(
+        self,
+        name: str,
+        help_text: str,
+        collect: Callable[[], Dict[tuple, float]],
+        labelnames=(),
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        """(Re)register a metric read at scrape time"""
+        metric = CallbackMetric(name, help_text, kind, labelnames, collect)
+        self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "careerpath_stage_seconds",
+    "Time spent in each analysis pipeline stage",
+    ("stage",),
+)
+REQUESTS = REGISTRY.counter(
+    "careerpath_requests",
+    "HTTP requests by endpoint, method and status",
+    ("endpoint", "method", "status"),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "careerpath_request_seconds", "HTTP request latency by endpoint", ("endpoint",)
+)
+RESPONSE_BYTES = REGISTRY.histogram(
+    "careerpath_response_bytes",
+    "HTTP response body size on the wire by endpoint",
+    ("endpoint",),
+    SIZE_BUCKETS,
+)
+
+
+# Stage durations of the request (or job) being traced, None when not tracing.
+# Copied contexts (thread pool calls, tasks) share the list.
+_stage_timings: ContextVar[Optional[list]] = ContextVar(
+    "careerpath_stage_timings", default=None
+)
+
+
+def start_timings() -> Tuple[List[Tuple[str, float]], object]:
+    """Trace stages in the current context; returns the list and a reset token"""
+    timings = []
+    return timings, _stage_timings.set(timings)
+
+
+def stop_timings(token) -> None:
+    _stage_timings.reset(token)
+
+
+def current_timings() -> Optional[List[Tuple[str, float]]]:
+    """Timings list of the traced request (or job) in this context, if any"""
+    return _stage_timings.get()
+
+
+def summarize_timings(timings: List[Tuple[str, float]]) -> Dict[str, Dict]:
+    """Milliseconds and call count per stage, in order of first call"""
+    summary = {}
+    for name, seconds in timings:
+        entry = summary.setdefault(name, {"ms": 0.0, "calls": 0})
+        entry["ms"] += seconds * 1000
+        entry["calls"] += 1
+    for entry in summary.values():
+        entry["ms"] = round(entry["ms"], 3)
+    return summary
+
+
+def _record(name: str, histogram: Histogram, seconds: float) -> None:
+    histogram.observe(seconds)
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+class stage:
+    """Time a block (``with stage("scoring"):``) or, as a decorator, a function.
+
+    The duration goes to careerpath_stage_seconds{stage=...} and, while a
+    request is traced, to its timings. The histogram child is looked up
+    once, when the stage object is created.
+    """
+
+    __slots__ = ("name", "_histogram", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._histogram = STAGE_SECONDS.labels(name)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record(self.name, self._histogram, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+        histogram = self._histogram
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(name, histogram, time.perf_counter() - start)
+
+        return timed
+
+
+class MetricsMiddleware:
+    """Count requests and record latency and response size per endpoint.
+
+    Endpoints are labelled with their route template (``/jobs/{job_id}``),
+    so label cardinality stays bounded; unmatched paths are ``other``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def counting_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "other")
+            REQUESTS.labels(endpoint, scope["method"], str(status)).inc()
+            REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+            RESPONSE_BYTES.labels(endpoint).observe(size)
@@ -0,0 +1,163 @@
+import math
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class ProfileIndex:
+    """Skill x profile matrices built once from a job profile catalog.
+
+    Row ``i`` of ``required`` / ``preferred`` is a 0/1 vector over
+    ``skills`` for ``profile_ids[i]``, so the skill overlap of a user with
+    every profile is a single matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        job_profiles: Dict[str, Dict],
+        array_store: Optional[Callable] = None,
+    ):
+        self.profile_ids = list(job_profiles)
+        self.titles = [job_profiles[pid]["title"] for pid in self.profile_ids]
+        self.sectors = [
+            job_profiles[pid].get("sector", "unknown") for pid in self.profile_ids
+        ]
+
+        vocabulary = set()
+        for profile in job_profiles.values():
+            vocabulary.update(skill.lower() for skill in profile["required_skills"])
+            vocabulary.update(
+                skill.lower() for skill in profile.get("preferred_skills", [])
+            )
+        self.skills = sorted(vocabulary)
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+
+        # The matrices are the large part of the index. ``array_store`` is
+        # called with their builder and may return shared, read-only copies
+        # (see SharedArrayStore.get_or_create) instead of building them here.
+        if array_store is None:
+            arrays = self._build_arrays(job_profiles)
+        else:
+            arrays = array_store(lambda: self._build_arrays(job_profiles))
+        self.required = arrays["required"]
+        self.preferred = arrays["preferred"]
+        self.required_counts = arrays["required_counts"]
+        self.preferred_counts = arrays["preferred_counts"]
+
+        # Rows of each sector, so a sector-filtered request only scores
+        # the partitions it asks for
+        self.sector_rows: Dict[str, np.ndarray] = {}
+        for row, sector in enumerate(self.sectors):
+            self.sector_rows.setdefault(sector, []).append(row)
+        self.sector_rows = {
+            sector: np.array(rows, dtype=np.intp)
+            for sector, rows in self.sector_rows.items()
+        }
+        self.no_rows = np.zeros(0, dtype=np.intp)
+
+    def _build_arrays(self, job_profiles: Dict[str, Dict]) -> Dict[str, np.ndarray]:
+        required = np.zeros((len(self.profile_ids), len(self.skills)), np.float32)
+        preferred = np.zeros_like(required)
+        for row, pid in enumerate(self.profile_ids):
+            profile = job_profiles[pid]
+            for skill in profile["required_skills"]:
+                required[row, self.skill_ids[skill.lower()]] = 1.0
+            for skill in profile.get("preferred_skills", []):
+                preferred[row, self.skill_ids[skill.lower()]] = 1.0
+        return {
+            "required": required,
+            "preferred": preferred,
+            "required_counts": required.sum(axis=1),
+            "preferred_counts": preferred.sum(axis=1),
+        }
+
+    def __len__(self) -> int:
+        return len(self.profile_ids)
+
+    def skill_vector(self, skills: Iterable[str]) -> np.ndarray:
+        """0/1 vector over the index vocabulary; unknown skills are ignored"""
+        vector = np.zeros(len(self.skills), np.float32)
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is not None:
+                vector[skill_id] = 1.0
+        return vector
+
+    def base_scores(
+        self,
+        user_vector: np.ndarray,
+        rows: Optional[np.ndarray] = None,
+        required_weight: float = 0.7,
+        preferred_weight: float = 0.3,
+    ) -> np.ndarray:
+        """Weighted required/preferred overlap for ``rows`` (all profiles by default)"""
+        required = self.required if rows is None else self.required[rows]
+        preferred = self.preferred if rows is None else self.preferred[rows]
+        required_counts = (
+            self.required_counts if rows is None else self.required_counts[rows]
+        )
+        preferred_counts = (
+            self.preferred_counts if rows is None else self.preferred_counts[rows]
+        )
+
+        # Overlap counts are exact in float32; divide in float64 so scores
+        # match the scalar computation bit for bit.
+        required_match = np.divide(
+            (required @ user_vector).astype(np.float64),
+            required_counts,
+            out=np.zeros(len(required_counts), np.float64),
+            where=required_counts > 0,
+        )
+        preferred_match = np.divide(
+            (preferred @ user_vector).astype(np.float64),
+            preferred_counts,
+            out=np.zeros(len(preferred_counts), np.float64),
+            where=preferred_counts > 0,
+        )
+        return required_match * required_weight + preferred_match * preferred_weight
+
+
+class CareerClusters:
+    """Offline k-means grouping of job profiles into career families.
+
+    Profiles are clustered on their L2-normalised skill vectors (preferred
+    skills down-weighted like in scoring). At request time ``probe`` ranks
+    the centroids against the user's skill vector and returns only the rows
+    of the best ``n_probe`` clusters, which are then scored exactly.
+    """
+
+    def __init__(
+        self,
+        index: ProfileIndex,
+        n_clusters: Optional[int] = None,
+        random_state: int = 42,
+    ):
+        features = index.required * 0.7 + index.preferred * 0.3
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        features = np.divide(
+            features, norms, out=np.zeros_like(features), where=norms > 0
+        )
+
+        if n_clusters is None:
+            n_clusters = max(1, int(round(math.sqrt(len(index)))))
+        n_clusters = min(n_clusters, len(index))
+
+        # Only needed when fitting; compiled clusters load without sklearn
+        from sklearn.cluster import KMeans
+
+        kmeans = KMeans(n_clusters=n_clusters, n_init=10, random_state=random_state)
+        self.labels = kmeans.fit_predict(features)
+        self.centroids = kmeans.cluster_centers_.astype(np.float32)
+        self.members: List[np.ndarray] = [
+            np.flatnonzero(self.labels == cluster) for cluster in range(n_clusters)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def probe(self, user_vector: np.ndarray, n_probe: int) -> np.ndarray:
+        """Sorted profile rows belonging to the ``n_probe`` closest clusters"""
+        n_probe = max(1, min(n_probe, len(self.members)))
+        similarities = self.centroids @ user_vector
+        best = np.argsort(-similarities, kind="stable")[:n_probe]
+        return np.sort(np.concatenate([self.members[cluster] for cluster in best]))
@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Set to 0 to skip the startup warm-up (the process is ready immediately and
+# the first requests pay for lazy initialization)
+WARMUP_ENABLED = os.environ.get("CAREERPATH_WARMUP", "1").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+# The sentence model is large and not on the default scoring path
+WARMUP_SENTENCE_MODEL = os.environ.get(
+    "CAREERPATH_WARMUP_SENTENCE_MODEL", "0"
+).lower() in ("1", "true", "yes")
+
+PENDING, LOADING, READY, FAILED, SKIPPED = (
+    "pending",
+    "loading",
+    "ready",
+    "failed",
+    "skipped",
+)
+
+
+def warm_profile_index() -> None:
+    from services.career_recommender import (
+        EXACT_SCAN_MAX_PROFILES,
+        get_career_clusters,
+        get_profile_index,
+    )
+
+    if len(get_profile_index()) > EXACT_SCAN_MAX_PROFILES:
+        get_career_clusters()
+
+
+def warm_title_index() -> None:
+    from services.career_recommender import get_title_index
+
+    get_title_index()
+
+
+def warm_skill_normalizer() -> None:
+    from services.skill_normalizer import get_skill_normalizer
+
+    get_skill_normalizer()
+
+
+def warm_spacy() -> None:
+    from services.resume_parser import get_nlp
+
+    get_nlp()
+
+
+def warm_document_extractors() -> None:
+    # Import cost of pdfminer and python-docx, paid by the first upload otherwise
+    import docx  # noqa: F401
+    import pdfminer.high_level  # noqa: F401
+
+
+def warm_sentence_model() -> None:
+    from services.career_recommender import get_sentence_model
+
+    get_sentence_model()
+
+
+def default_components() -> List[Tuple[str, Optional[Callable[[], Any]]]]:
+    """Components loaded before the synthetic analysis; None marks a skipped one"""
+    return [
+        ("profile_index", warm_profile_index),
+        ("title_index", warm_title_index),
+        ("skill_normalizer", warm_skill_normalizer),
+        ("spacy", warm_spacy),
+        ("document_extractors", warm_document_extractors),
+        ("sentence_model", warm_sentence_model if WARMUP_SENTENCE_MODEL else None),
+    ]
+
+
+class Readiness:
+    """Startup warm-up and the per-component load state behind /health/ready.
+
+    Components are loaded in order, in a background thread, so the process
+    answers liveness probes while it warms up. The process is ready once
+    every component that was not skipped has loaded. A component that fails
+    leaves the process not ready and its error is reported.
+    """
+
+    def __init__(self, components: List[Tuple[str, Optional[Callable[[], Any]]]]):
+        self.components = components
+        self.state: Dict[str, Dict[str, Any]] = {
+            name: {"state": PENDING if fn else SKIPPED} for name, fn in components
+        }
+        self.started_at = None
+        self.warmup_seconds = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Run the warm-up in a daemon thread (once)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self.warm_up, name="careerpath-warmup", daemon=True
+            )
+            self._thread.start()
+
+    def skip(self) -> None:
+        """Mark every component skipped, i.e. ready without warming up"""
+        for entry in self.state.values():
+            entry["state"] = SKIPPED
+        self.warmup_seconds = 0.0
+
+    def warm_up(self) -> bool:
+        self.started_at = time.time()
+        start = time.perf_counter()
+        ok = True
+        for name, fn in self.components:
+            if fn is None:
+                continue
+            entry = self.state[name]
+            entry["state"] = LOADING
+            component_start = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                logging.exception(f"Warm-up of {name} failed")
+                entry.update(state=FAILED, error=str(e))
+                ok = False
+            else:
+                entry["state"] = READY
+            entry["seconds"] = round(time.perf_counter() - component_start, 4)
+        self.warmup_seconds = round(time.perf_counter() - start, 4)
+        logging.info(f"Warm-up finished in {self.warmup_seconds:.2f}s (ok={ok})")
+        return ok
+
+    @property
+    def ready(self) -> bool:
+        return all(entry["state"] in (READY, SKIPPED) for entry in self.state.values())
+
+    def status(self) -> Dict[str, Any]:
+        states = {entry["state"] for entry in self.state.values()}
+        if FAILED in states:
+            status = "failed"
+        elif self.ready:
+            status = "ready"
+        else:
+            status = "warming_up"
+        return {
+            "status": status,
+            "started_at": self.started_at,
+            "warmup_seconds": self.warmup_seconds,
+            "components": {name: dict(entry) for name, entry in self.state.items()},
+        }
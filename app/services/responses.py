@@ -0,0 +1,147 @@
+import json
+import os
+import zlib
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+from services.metrics import stage
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_BYTES = int(os.environ.get("CAREERPATH_GZIP_MIN_BYTES", "1024"))
+# zlib level: 6 compresses JSON nearly as well as 9 at a fraction of the CPU
+GZIP_LEVEL = int(os.environ.get("CAREERPATH_GZIP_LEVEL", "6"))
+
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+
+@stage("serialization")
+def json_dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson when installed.
+
+    Both encoders produce the same output for the payloads the API returns:
+    no whitespace, non-ASCII characters kept as is and non-string keys
+    converted to strings.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``json_dumps``"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header allows gzip (q > 0)"""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class GZipMiddleware:
+    """Gzip responses of at least ``minimum_size`` bytes for clients that accept it.
+
+    Unlike Starlette's GZipMiddleware this honours ``q=0``, leaves responses
+    that already carry a Content-Encoding (precompressed payloads) alone, and
+    flushes the compressor after every chunk of a streaming response so
+    NDJSON and event streams still arrive line by line.
+    """
+
+    def __init__(
+        self, app, minimum_size: int = GZIP_MIN_BYTES, compresslevel: int = GZIP_LEVEL
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        if not accepts_gzip(accept_encoding):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = MutableHeaders(raw=message["headers"])
+                passthrough = "content-encoding" in headers
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                # wbits=31: gzip container
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.flush()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    start_message = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+                start_message = None
+
+            if more_body:
+                chunk = compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            else:
+                chunk = compressor.compress(body) + compressor.flush()
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
@@ -1,28 +1,55 @@
 import re
 import os
 import logging
-from typing import Dict, List, Optional
-from pdfminer.high_level import extract_text
-from docx import Document
-import spacy
-
-# Replace direct model load with a safe loader that attempts download and falls back to blank model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logging.warning("spaCy model 'en_core_web_sm' not found. Attempting to download...")
-    try:
-        from spacy.cli import download as spacy_download
-
-        spacy_download("en_core_web_sm")
-        nlp = spacy.load("en_core_web_sm")
-        logging.info("Successfully downloaded and loaded 'en_core_web_sm'.")
-    except Exception as download_err:
-        logging.error(f"Failed to download/load 'en_core_web_sm': {download_err}")
-        logging.warning(
-            "Falling back to a blank English pipeline. Functionality will be limited."
-        )
-        nlp = spacy.blank("en")
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services.metrics import stage
+
+# spaCy, pdfminer and python-docx are slow to import and only needed when a
+# resume is actually parsed, so they are imported on first use.
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """Return the spaCy pipeline, loading it on first use.
+
+    Attempts to download en_core_web_sm when it is missing and falls back to
+    a blank English pipeline.
+    """
+    global _nlp
+    if _nlp is not None:
+        return _nlp
+
+    with _nlp_lock:
+        if _nlp is None:
+            import spacy
+
+            try:
+                nlp = spacy.load("en_core_web_sm")
+            except OSError:
+                logging.warning(
+                    "spaCy model 'en_core_web_sm' not found. Attempting to download..."
+                )
+                try:
+                    from spacy.cli import download as spacy_download
+
+                    spacy_download("en_core_web_sm")
+                    nlp = spacy.load("en_core_web_sm")
+                    logging.info("Successfully downloaded and loaded 'en_core_web_sm'.")
+                except Exception as download_err:
+                    logging.error(
+                        f"Failed to download/load 'en_core_web_sm': {download_err}"
+                    )
+                    logging.warning(
+                        "Falling back to a blank English pipeline. "
+                        "Functionality will be limited."
+                    )
+                    nlp = spacy.blank("en")
+            _nlp = nlp
+    return _nlp
+
 
 # Define skill keywords for different domains across all sectors
 SKILL_KEYWORDS = {
@@ -433,9 +460,12 @@ SKILL_KEYWORDS = {
 }
 
 
+@stage("extract_pdf")
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from PDF file"""
     try:
+        from pdfminer.high_level import extract_text
+
         text = extract_text(file_path)
         return text
     except Exception as e:
@@ -443,9 +473,33 @@ def extract_text_from_pdf(file_path: str) -> str:
         return ""
 
 
+@stage("extract_pdf_first_page")
+def extract_first_page_from_pdf(file_path: str) -> Optional[str]:
+    """Text of the first page of a multi-page PDF, where contact details live.
+
+    Returns None for single-page PDFs, where this would only repeat the work
+    of extract_text_from_pdf.
+    """
+    try:
+        from pdfminer.high_level import extract_text
+        from pdfminer.pdfpage import PDFPage
+
+        with open(file_path, "rb") as f:
+            pages = sum(1 for _ in zip(range(2), PDFPage.get_pages(f)))
+        if pages < 2:
+            return None
+        return extract_text(file_path, page_numbers=[0])
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return None
+
+
+@stage("extract_docx")
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from DOCX file"""
     try:
+        from docx import Document
+
         doc = Document(file_path)
         text = []
         for paragraph in doc.paragraphs:
@@ -456,6 +510,7 @@ def extract_text_from_docx(file_path: str) -> str:
         return ""
 
 
+@stage("skills")
 def extract_skills(text: str) -> Dict[str, List[str]]:
     """Extract skills from text using precise keyword matching"""
     text_lower = text.lower()
@@ -524,6 +579,7 @@ def extract_skills(text: str) -> Dict[str, List[str]]:
     return extracted_skills
 
 
+@stage("ner")
 def extract_name(text: str) -> Optional[str]:
     """Extract person name from text using improved pattern matching"""
     lines = text.split("\n")
@@ -553,7 +609,7 @@ def extract_name(text: str) -> Optional[str]:
                 return line
 
     # Fallback to spaCy NER but with better filtering
-    doc = nlp(text)
+    doc = get_nlp()(text)
     names = []
     for ent in doc.ents:
         if ent.label_ == "PERSON":
@@ -688,44 +744,87 @@ def extract_experience(text: str) -> List[str]:
     return experience_lines
 
 
-def parse_resume(file_path: str) -> Dict:
-    """Main function to parse resume and extract all information"""
-    # Determine file type and extract text
+# Fields returned by parse_resume / parse_resume_text
+RESUME_FIELDS = (
+    "name",
+    "email",
+    "phone",
+    "skills",
+    "education",
+    "experience",
+    "raw_text",
+)
+
+
+# Fields in the groups iter_parse_fields yields them in
+RESUME_FIELD_GROUPS = (
+    ("contact", ("name", "email", "phone")),
+    ("skills", ("skills",)),
+    ("details", ("education", "experience", "raw_text")),
+)
+
+
+def iter_parse_fields(text: str, fields=None) -> Iterator[Tuple[str, Dict]]:
+    """Extract the requested resume fields group by group (see RESUME_FIELD_GROUPS).
+
+    Groups without requested fields are skipped. Merging the yielded parts
+    gives the _parse_fields result.
+    """
+    fields = RESUME_FIELDS if fields is None else fields
+    extractors = {
+        "name": extract_name,
+        "email": extract_email,
+        "phone": extract_phone,
+        "skills": extract_skills,
+        "education": extract_education,
+        "experience": extract_experience,
+        # Limit raw text length
+        "raw_text": lambda t: t[:1000] + "..." if len(t) > 1000 else t,
+    }
+    for group, group_fields in RESUME_FIELD_GROUPS:
+        part = {
+            field: extractors[field](text) for field in group_fields if field in fields
+        }
+        if part:
+            yield group, part
+
+
+def _parse_fields(text: str, fields=None) -> Dict:
+    """Extract the requested resume fields (all by default) from text.
+
+    Extraction of fields that are not requested is skipped, e.g. the spaCy
+    NER fallback of extract_name when only skills are needed.
+    """
+    parsed = {}
+    for _, part in iter_parse_fields(text, fields):
+        parsed.update(part)
+    return parsed
+
+
+def extract_resume_text(file_path: str) -> str:
+    """Text of a PDF or DOCX resume"""
     file_extension = os.path.splitext(file_path)[1].lower()
 
     if file_extension == ".pdf":
-        text = extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path)
     elif file_extension == ".docx":
-        text = extract_text_from_docx(file_path)
+        return extract_text_from_docx(file_path)
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
 
-    # Extract information
-    parsed_data = {
-        "name": extract_name(text),
-        "email": extract_email(text),
-        "phone": extract_phone(text),
-        "skills": extract_skills(text),
-        "education": extract_education(text),
-        "experience": extract_experience(text),
-        "raw_text": text[:1000] + "..."
-        if len(text) > 1000
-        else text,  # Limit raw text length
-    }
 
-    return parsed_data
+def parse_resume(file_path: str, fields=None) -> Dict:
+    """Main function to parse resume and extract all information
 
+    Pass ``fields`` (a subset of RESUME_FIELDS) to extract only those.
+    """
+    # Determine file type and extract text
+    text = extract_resume_text(file_path)
+
+    # Extract information
+    return _parse_fields(text, fields)
 
-def parse_resume_text(text: str) -> Dict:
-    """Parse resume from text string"""
-    parsed_data = {
-        "name": extract_name(text),
-        "email": extract_email(text),
-        "phone": extract_phone(text),
-        "skills": extract_skills(text),
-        "education": extract_education(text),
-        "experience": extract_experience(text),
-        "raw_text": text[:1000] + "..." if len(text) > 1000 else text,
-    }
 
-    return parsed_data
+def parse_resume_text(text: str, fields=None) -> Dict:
+    """Parse resume from text string"""
+    return _parse_fields(text, fields)
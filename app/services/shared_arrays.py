@@ -0,0 +1,175 @@
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, the store is disabled
+    fcntl = None
+
+
+def _default_directory() -> str:
+    # /dev/shm keeps the segments in RAM; fall back to the temp directory
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "careerpath-shared")
+
+
+SHARED_ARRAYS_DIR = os.environ.get("CAREERPATH_SHARED_DIR", _default_directory())
+SHARED_ARRAYS_ENABLED = fcntl is not None and os.environ.get(
+    "CAREERPATH_SHARED_ARRAYS", "1"
+).lower() not in ("0", "false", "no")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedArrayStore:
+    """Named segments of read-only numpy arrays shared by all worker processes.
+
+    A segment is a directory of ``.npy`` files that every process maps with
+    ``np.load(mmap_mode="r")``, so the arrays exist once in the page cache
+    however many workers use them. The first process to ask for a segment
+    builds it and publishes it by renaming a staging directory into place;
+    the others attach to it. An flock per segment serialises builders.
+
+    Each attached process holds a lease file named after its pid. A segment
+    is deleted when its last lease is released; leases of processes that
+    died without releasing are reclaimed by ``cleanup``. Mappings stay valid
+    after their files are unlinked, so deletion never breaks a reader.
+    """
+
+    def __init__(self, directory: str = SHARED_ARRAYS_DIR):
+        self.directory = directory
+        self._leases: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _lease_path(self, name: str, pid: int) -> str:
+        return os.path.join(self._segment_path(name), "leases", str(pid))
+
+    @contextmanager
+    def _locked(self, name: str):
+        with open(os.path.join(self.directory, f".{name}.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_or_create(
+        self, name: str, build: Callable[[], Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        """Attach to segment ``name``, building it with ``build()`` if missing"""
+        path = self._segment_path(name)
+        with self._lock, self._locked(name):
+            if not os.path.isdir(path):
+                staging = os.path.join(self.directory, f".{name}.{os.getpid()}.tmp")
+                shutil.rmtree(staging, ignore_errors=True)
+                os.makedirs(os.path.join(staging, "leases"))
+                for key, array in build().items():
+                    np.save(os.path.join(staging, f"{key}.npy"), np.asarray(array))
+                os.rename(staging, path)
+
+            pid = os.getpid()
+            with open(self._lease_path(name, pid), "w"):
+                pass
+            self._leases[name] = pid
+
+            return {
+                filename[: -len(".npy")]: np.load(
+                    os.path.join(path, filename), mmap_mode="r"
+                )
+                for filename in sorted(os.listdir(path))
+                if filename.endswith(".npy")
+            }
+
+    def release(self, name: str) -> None:
+        """Drop this process's lease on ``name``; the last lease deletes it"""
+        with self._lock:
+            # Forked children inherit the parent's lease table but not its leases
+            if self._leases.get(name) != os.getpid():
+                self._leases.pop(name, None)
+                return
+            del self._leases[name]
+            with self._locked(name):
+                try:
+                    os.unlink(self._lease_path(name, os.getpid()))
+                except FileNotFoundError:
+                    pass
+                self._remove_if_unused(name)
+
+    def release_all(self) -> None:
+        for name in list(self._leases):
+            self.release(name)
+
+    def cleanup(self) -> int:
+        """Reclaim leases of dead processes and delete unused segments"""
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            with self._locked(entry.name):
+                if self._remove_if_unused(entry.name):
+                    removed += 1
+        return removed
+
+    def _remove_if_unused(self, name: str) -> bool:
+        """Delete segment ``name`` unless a live process holds a lease on it"""
+        leases = os.path.join(self._segment_path(name), "leases")
+        try:
+            holders = os.listdir(leases)
+        except FileNotFoundError:
+            return False
+
+        alive = False
+        for holder in holders:
+            if holder.isdigit() and _pid_alive(int(holder)):
+                alive = True
+            else:
+                try:
+                    os.unlink(os.path.join(leases, holder))
+                except FileNotFoundError:
+                    pass
+        if alive:
+            return False
+        shutil.rmtree(self._segment_path(name), ignore_errors=True)
+        return True
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store() -> Optional[SharedArrayStore]:
+    """Return the process-wide store, or None when shared arrays are disabled"""
+    global _store, SHARED_ARRAYS_ENABLED
+    if not SHARED_ARRAYS_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = SharedArrayStore()
+                _store.cleanup()
+            except OSError as e:
+                logging.warning(f"Shared arrays disabled ({SHARED_ARRAYS_DIR}: {e})")
+                SHARED_ARRAYS_ENABLED = False
+                return None
+            atexit.register(_store.release_all)
+    return _store
@@ -0,0 +1,75 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's content, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent identical computations into one.
+
+    The first caller for a key starts the computation as a task; callers
+    that arrive with the same key while it runs await that task instead of
+    starting their own. Every caller gets the same result, or the same
+    exception. A caller that is cancelled stops waiting without affecting
+    the others; the computation itself is cancelled only once no caller is
+    waiting for it. The key is forgotten when the computation finishes, so
+    later calls compute afresh (results are not cached).
+
+    Results are shared between callers and must not be mutated; copy them
+    before adding per-request fields. Only for use from one event loop.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of ``compute()``, shared with concurrent calls for ``key``"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(compute()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: cancelling one caller must not cancel the shared task
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left to use the result
+                self._finish(key, flight)
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
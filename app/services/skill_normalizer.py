@@ -0,0 +1,319 @@
+import heapq
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services.artifacts import load_artifact
+from services.career_recommender import (
+    JOB_PROFILES,
+    LEARNING_RESOURCES,
+    catalog_version,
+)
+from services.recommendation_cache import canonical_key
+from services.resume_parser import SKILL_KEYWORDS
+
+# Common spellings that are not close enough to the canonical name for
+# edit-distance matching ("k8s", "golang") or that are abbreviations.
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "cpp": "c++",
+    "c plus plus": "c++",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "dotnet": "asp.net",
+    ".net": "asp.net",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "expressjs": "express",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "ms sql": "sql",
+    "mssql": "sql",
+    "amazon aws": "aws",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "k8s": "kubernetes",
+    "cicd": "ci/cd",
+    "ci cd": "ci/cd",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "powerbi": "power bi",
+    "ms power bi": "power bi",
+    "crm": "customer relationship management",
+    "pmp": "project management",
+    "bls": "cpr",
+    "ehr": "electronic health records",
+    "emr": "electronic health records",
+    "m&a": "mergers acquisitions",
+    "search engine optimization": "seo",
+    "sem": "google ads",
+    "hr": "hr policies",
+    "a/b testing": "conversion optimization",
+    "autocad civil 3d": "autocad",
+    "cad": "autocad",
+}
+
+# Minimum confidence for an edit-distance candidate to replace the input.
+MIN_FUZZY_CONFIDENCE = 0.75
+
+# Inputs shorter than this are only resolved exactly or through an alias;
+# one edit on a two-letter skill ("go", "r") is a different skill.
+MIN_FUZZY_LENGTH = 4
+
+# Number of n-gram candidates verified with the edit distance.
+MAX_CANDIDATES = 8
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_COMPACT_RE = re.compile(r"[\s.\-_/]+")
+
+
+@dataclass(frozen=True)
+class SkillMatch:
+    """Resolution of one free-text skill onto the canonical vocabulary."""
+
+    input: str
+    canonical: Optional[str]
+    confidence: float
+    method: str
+
+    def to_dict(self) -> Dict:
+        return {
+            "input": self.input,
+            "canonical": self.canonical,
+            "confidence": round(self.confidence, 3),
+            "method": self.method,
+        }
+
+
+def _clean(skill: str) -> str:
+    """Lowercase and collapse whitespace the same way the parser stores skills"""
+    return _WHITESPACE_RE.sub(" ", str(skill).strip().lower()).strip(" ,;:")
+
+
+def _compact(skill: str) -> str:
+    """Drop separators so "power-bi", "powerbi" and "power bi" share a key"""
+    return _COMPACT_RE.sub("", skill)
+
+
+def _ngrams(text: str, n: int) -> List[str]:
+    padded = f" {text} "
+    return [padded[i : i + n] for i in range(len(padded) - n + 1)]
+
+
+def _bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up once it exceeds ``limit``.
+
+    Transpositions count as one edit so that "pyhton" is one edit away from
+    "python". Returns ``limit + 1`` when the distance is larger than ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+            if (
+                previous_previous is not None
+                and i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+
+    return previous[-1]
+
+
+def canonical_vocabulary() -> List[str]:
+    """Every skill name the recommender can score or build a learning plan for"""
+    vocabulary = set()
+    for skills in SKILL_KEYWORDS.values():
+        vocabulary.update(_clean(skill) for skill in skills)
+    for profile in JOB_PROFILES.values():
+        vocabulary.update(_clean(skill) for skill in profile["required_skills"])
+        vocabulary.update(
+            _clean(skill) for skill in profile.get("preferred_skills", [])
+        )
+    vocabulary.update(_clean(skill) for skill in LEARNING_RESOURCES)
+    return sorted(vocabulary)
+
+
+class SkillNormalizer:
+    """Character n-gram index over the canonical skill vocabulary.
+
+    Lookups are resolved in order of decreasing confidence: exact match,
+    alias, separator-insensitive match, then an edit-distance check on the
+    few vocabulary entries that share the most n-grams with the input. The
+    index is built once, so a lookup never compares against the whole
+    vocabulary.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        ngram_size: int = 2,
+    ):
+        self.ngram_size = ngram_size
+        self.terms = sorted({_clean(term) for term in vocabulary if _clean(term)})
+        self._canonical = set(self.terms)
+
+        self._aliases = {}
+        for alias, target in (aliases or {}).items():
+            target = _clean(target)
+            if target in self._canonical:
+                self._aliases[_clean(alias)] = target
+
+        self._compact = {}
+        for term in self.terms:
+            self._compact.setdefault(_compact(term), term)
+        for alias, target in self._aliases.items():
+            self._compact.setdefault(_compact(alias), target)
+
+        postings = defaultdict(list)
+        self._gram_counts = []
+        for term_id, term in enumerate(self.terms):
+            grams = set(_ngrams(term, ngram_size))
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(term_id)
+        self._postings = dict(postings)
+
+    def _candidates(self, text: str) -> List[Tuple[float, int]]:
+        """Vocabulary entries ranked by n-gram Dice similarity to ``text``"""
+        grams = set(_ngrams(text, self.ngram_size))
+        overlaps = defaultdict(int)
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                overlaps[term_id] += 1
+
+        return heapq.nlargest(
+            MAX_CANDIDATES,
+            (
+                (2.0 * shared / (len(grams) + self._gram_counts[term_id]), term_id)
+                for term_id, shared in overlaps.items()
+            ),
+        )
+
+    def normalize(self, skill: str) -> SkillMatch:
+        """Map one free-text skill to its canonical name"""
+        text = _clean(skill)
+        if not text:
+            return SkillMatch(skill, None, 0.0, "empty")
+        if text in self._canonical:
+            return SkillMatch(skill, text, 1.0, "exact")
+        if text in self._aliases:
+            return SkillMatch(skill, self._aliases[text], 1.0, "alias")
+
+        compact = _compact(text)
+        if compact in self._compact:
+            return SkillMatch(skill, self._compact[compact], 0.95, "alias")
+
+        if len(text) < MIN_FUZZY_LENGTH:
+            return SkillMatch(skill, None, 0.0, "unmatched")
+
+        best = None
+        for _, term_id in self._candidates(text):
+            term = self.terms[term_id]
+            longest = max(len(text), len(term))
+            floor = best.confidence if best is not None else MIN_FUZZY_CONFIDENCE
+            limit = int(longest * (1.0 - floor))
+            distance = _bounded_edit_distance(text, term, limit)
+            if distance > limit:
+                continue
+            confidence = 1.0 - distance / longest
+            if best is None or confidence > best.confidence:
+                best = SkillMatch(skill, term, confidence, "fuzzy")
+
+        if best is not None and best.confidence >= MIN_FUZZY_CONFIDENCE:
+            return best
+        return SkillMatch(skill, None, 0.0, "unmatched")
+
+
+# Layout version of the compiled SkillNormalizer (its n-gram tables and
+# fields). Bump it whenever the class changes, so that artifacts built by
+# older code are not loaded even when the catalog is unchanged.
+NORMALIZER_SCHEMA_VERSION = 1
+
+_normalizer = None
+_normalizer_version = None
+
+
+def normalizer_version(version: str = None) -> str:
+    """Fingerprint of the normalizer inputs for catalog ``version``"""
+    version = version or catalog_version()
+    return canonical_key(
+        version, NORMALIZER_SCHEMA_VERSION, SKILL_ALIASES, SKILL_KEYWORDS
+    )[:16]
+
+
+def get_skill_normalizer() -> SkillNormalizer:
+    """Return the process-wide normalizer, rebuilding it when the catalog changes"""
+    global _normalizer, _normalizer_version
+    version = catalog_version()
+    if _normalizer is None or _normalizer_version != version:
+        _normalizer = load_artifact("skill_normalizer", normalizer_version(version))
+        if _normalizer is None:
+            _normalizer = SkillNormalizer(canonical_vocabulary(), SKILL_ALIASES)
+        _normalizer_version = version
+    return _normalizer
+
+
+def normalize_skills(
+    skills: Dict[str, List[str]],
+) -> Tuple[Dict[str, List[str]], List[Dict]]:
+    """Normalize a category -> skills mapping before scoring.
+
+    Skills that resolve are replaced by their canonical name; skills that do
+    not are kept (cleaned) so they still show up in the skill analysis.
+    Returns the normalized mapping and a report of every skill that was
+    rewritten or could not be resolved.
+    """
+    normalizer = get_skill_normalizer()
+    normalized = {}
+    report = []
+
+    for category, category_skills in skills.items():
+        seen = set()
+        resolved = []
+        for skill in category_skills or []:
+            match = normalizer.normalize(skill)
+            value = match.canonical if match.canonical else _clean(skill)
+            if match.method not in ("exact", "empty"):
+                report.append(match.to_dict())
+            if value and value not in seen:
+                seen.add(value)
+                resolved.append(value)
+        normalized[category] = resolved
+
+    return normalized, report
@@ -0,0 +1,208 @@
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+# Bonus when a CV title and a profile title contain one another
+TITLE_MATCH_BONUS = 0.3
+
+# Bonus when both titles share a role keyword, e.g. "... Engineer"
+TITLE_KEYWORD_BONUS = 0.2
+TITLE_KEYWORDS = (
+    "engineer",
+    "developer",
+    "manager",
+    "analyst",
+    "specialist",
+    "coordinator",
+    "scientist",
+)
+
+# Roles that earn a higher bonus when both titles contain the exact phrase.
+# Checked in order; the first phrase found in both titles wins.
+EXACT_ROLE_BONUSES = {
+    "software engineer": 0.4,
+    "data scientist": 0.4,
+    "marketing manager": 0.4,
+    "civil engineer": 0.4,
+}
+
+
+def title_match_bonus(cv_titles: Iterable[str], job_title: str) -> float:
+    """Title bonus of a single profile; reference for TitleIndex.bonuses.
+
+    The first CV title that contains (or is contained in) the profile title
+    or shares an exact role phrase with it decides the bonus. Otherwise a
+    shared role keyword in any CV title gives the keyword bonus.
+    """
+    job_title_lower = job_title.lower()
+    bonus = 0.0
+
+    for cv_title in cv_titles:
+        if job_title_lower in cv_title or cv_title in job_title_lower:
+            return TITLE_MATCH_BONUS
+        for keyword in TITLE_KEYWORDS:
+            if keyword in job_title_lower and keyword in cv_title:
+                bonus = TITLE_KEYWORD_BONUS
+                break
+        for phrase, phrase_bonus in EXACT_ROLE_BONUSES.items():
+            if phrase in cv_title and phrase in job_title_lower:
+                return phrase_bonus
+
+    return bonus
+
+
+class _PhraseAutomaton:
+    """Aho-Corasick automaton reporting every pattern that occurs in a text"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find(self, text: str) -> set:
+        """Ids of all patterns occurring in ``text``"""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found.update(self._output[state])
+        return found
+
+
+class TitleIndex:
+    """Precompiled matcher computing the title bonus of every profile at once.
+
+    One automaton over the profile titles, role keywords and exact role
+    phrases finds everything contained in a CV title in a single scan. The
+    reverse direction (a CV title inside a profile title) is one substring
+    search over the newline-joined titles, since CV titles can be fragments
+    of a word. Keyword and phrase hits are turned into profile masks that
+    were computed when the index was built.
+    """
+
+    def __init__(self, titles: Sequence[str]):
+        self.titles = [title.lower() for title in titles]
+        n_profiles = len(self.titles)
+
+        self._keyword_masks = [
+            np.array([keyword in title for title in self.titles], dtype=bool)
+            for keyword in TITLE_KEYWORDS
+        ]
+        phrases = list(EXACT_ROLE_BONUSES)
+        self._phrase_masks = [
+            np.array([phrase in title for title in self.titles], dtype=bool)
+            for phrase in phrases
+        ]
+        self._phrase_bonuses = [EXACT_ROLE_BONUSES[phrase] for phrase in phrases]
+
+        # Pattern ids: profile titles, then keywords, then phrases
+        self._title_rows: Dict[int, List[int]] = {}
+        patterns = []
+        for title in dict.fromkeys(self.titles):
+            patterns.append(title)
+        for pattern_id, title in enumerate(patterns):
+            self._title_rows[pattern_id] = [
+                row for row, other in enumerate(self.titles) if other == title
+            ]
+        self._keyword_offset = len(patterns)
+        patterns.extend(TITLE_KEYWORDS)
+        self._phrase_offset = len(patterns)
+        patterns.extend(phrases)
+        self._automaton = _PhraseAutomaton(patterns)
+
+        self._corpus = "\n".join(self.titles)
+        self._row_starts = []
+        offset = 0
+        for title in self.titles:
+            self._row_starts.append(offset)
+            offset += len(title) + 1
+        self._n_profiles = n_profiles
+
+    def _rows_containing(self, cv_title: str) -> np.ndarray:
+        """Mask of profiles whose title contains ``cv_title``"""
+        mask = np.zeros(self._n_profiles, dtype=bool)
+        if not cv_title:
+            mask[:] = True
+            return mask
+        if "\n" in cv_title:
+            return mask
+
+        position = self._corpus.find(cv_title)
+        while position != -1:
+            row = bisect_right(self._row_starts, position) - 1
+            mask[row] = True
+            if row + 1 >= self._n_profiles:
+                break
+            position = self._corpus.find(cv_title, self._row_starts[row + 1])
+        return mask
+
+    def bonuses(self, cv_titles: Sequence[str]) -> np.ndarray:
+        """Title bonus of every profile, identical to ``title_match_bonus``"""
+        bonuses = np.zeros(self._n_profiles, dtype=np.float64)
+        decided = np.zeros(self._n_profiles, dtype=bool)
+        keyword_hit = np.zeros(self._n_profiles, dtype=bool)
+
+        for cv_title in cv_titles:
+            found = self._automaton.find(cv_title)
+
+            contained = self._rows_containing(cv_title)
+            keywords = np.zeros(self._n_profiles, dtype=bool)
+            phrase_bonus = np.zeros(self._n_profiles, dtype=np.float64)
+            for pattern_id in found:
+                if pattern_id < self._keyword_offset:
+                    contained[self._title_rows[pattern_id]] = True
+                elif pattern_id < self._phrase_offset:
+                    keywords |= self._keyword_masks[pattern_id - self._keyword_offset]
+            # Earlier phrases take precedence, so apply them last
+            for phrase in reversed(range(len(self._phrase_masks))):
+                if self._phrase_offset + phrase in found:
+                    phrase_bonus[self._phrase_masks[phrase]] = self._phrase_bonuses[
+                        phrase
+                    ]
+
+            open_rows = ~decided
+            keyword_hit |= open_rows & keywords
+
+            matched = open_rows & contained
+            bonuses[matched] = TITLE_MATCH_BONUS
+            phrased = open_rows & ~contained & (phrase_bonus > 0)
+            bonuses[phrased] = phrase_bonus[phrased]
+            decided |= matched | phrased
+
+            if decided.all():
+                break
+
+        bonuses[~decided & keyword_hit] = TITLE_KEYWORD_BONUS
+        return bonuses
@@ -0,0 +1,123 @@
+import json
+import os
+import time
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import MutableHeaders
+
+from services.metrics import start_timings, stop_timings, summarize_timings
+from services.responses import json_dumps
+
+# Send Server-Timing on every response, not only on debug=1 requests
+SERVER_TIMING_ALWAYS = os.environ.get("CAREERPATH_SERVER_TIMING", "0").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+def is_debug_request(query_string: bytes) -> bool:
+    """True if the query string has debug=1 (or true/yes)"""
+    for name, value in parse_qsl(query_string.decode("latin-1")):
+        if name == "debug":
+            return value.lower() in ("1", "true", "yes")
+    return False
+
+
+def server_timing_header(summary: dict, total_seconds: float) -> str:
+    """Server-Timing value: one metric per stage plus the request total"""
+    metrics = [
+        f'{name};dur={entry["ms"]};desc="{entry["calls"]} call(s)"'
+        for name, entry in summary.items()
+    ]
+    metrics.append(f"total;dur={round(total_seconds * 1000, 3)}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """Opt-in per-request stage timings.
+
+    For requests with ``debug=1`` (or every request when
+    CAREERPATH_SERVER_TIMING is set) the durations of the pipeline stages
+    run for that request are collected and sent as a Server-Timing header.
+    With ``debug=1``, JSON responses of the paths in ``body_paths`` (every
+    path if None) also get a ``_timings`` block:
+    ``{"total_ms": ..., "stages": {stage: {"ms": ..., "calls": ...}}}``.
+
+    Must sit inside GZipMiddleware so that it sees uncompressed bodies.
+    """
+
+    def __init__(
+        self,
+        app,
+        always: bool = SERVER_TIMING_ALWAYS,
+        body_paths: Optional[Iterable[str]] = None,
+    ):
+        self.app = app
+        self.always = always
+        self.body_paths = None if body_paths is None else frozenset(body_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        debug = is_debug_request(scope.get("query_string", b""))
+        if not (debug or self.always):
+            await self.app(scope, receive, send)
+            return
+
+        add_to_body = debug and (
+            self.body_paths is None or scope["path"] in self.body_paths
+        )
+        start = time.perf_counter()
+        timings, token = start_timings()
+        start_message = None
+        body_parts = []
+
+        async def timed_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if add_to_body and headers.get("content-type", "").startswith(
+                    "application/json"
+                ) and "content-encoding" not in headers:
+                    # Hold the response until the body can carry _timings
+                    start_message = message
+                    return
+                headers["Server-Timing"] = server_timing_header(
+                    summarize_timings(timings), time.perf_counter() - start
+                )
+                await send(message)
+                return
+
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            summary = summarize_timings(timings)
+            total = time.perf_counter() - start
+            try:
+                content = json.loads(body)
+            except ValueError:
+                content = None
+            if isinstance(content, dict):
+                content["_timings"] = {
+                    "total_ms": round(total * 1000, 3),
+                    "stages": summary,
+                }
+                body = json_dumps(content)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Server-Timing"] = server_timing_header(summary, total)
+            headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            stop_timings(token)
@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import zipfile
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+# Largest resume file accepted, in bytes
+MAX_UPLOAD_BYTES = int(
+    os.environ.get("CAREERPATH_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024))
+)
+
+# Largest request body accepted by the batch upload endpoint, in bytes
+MAX_BATCH_BYTES = int(
+    os.environ.get("CAREERPATH_MAX_BATCH_BYTES", str(100 * 1024 * 1024))
+)
+
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# A PDF header may be preceded by junk, but must start within the first 1 KB
+_PDF_MAGIC = b"%PDF-"
+_PDF_HEADER_WINDOW = 1024
+_ZIP_MAGIC = b"PK\x03\x04"
+_DOCX_MAIN_PART = "word/document.xml"
+
+
+class UploadTooLarge(HTTPException):
+    """413 raised while the request body is still being received"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=413,
+            detail=f"File too large. Maximum upload size is {max_bytes} bytes.",
+        )
+
+
+def sniff_resume_format(head: bytes) -> Optional[str]:
+    """File extension implied by the first bytes of an upload, if supported.
+
+    ZIP content is reported as ".docx" here; whether it really is a Word
+    document is checked by ``is_docx`` once the whole file is on disk.
+    """
+    if _PDF_MAGIC in head[:_PDF_HEADER_WINDOW]:
+        return ".pdf"
+    if head.startswith(_ZIP_MAGIC):
+        return ".docx"
+    return None
+
+
+def is_docx(file_path: str) -> bool:
+    """True if ``file_path`` is a ZIP archive containing a Word main document"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return _DOCX_MAIN_PART in archive.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+async def save_upload(
+    upload, expected_extension: str, max_bytes: int = MAX_UPLOAD_BYTES
+) -> Tuple[str, int]:
+    """Copy an UploadFile to a temporary file in bounded chunks.
+
+    The content type is sniffed from the first chunk, so non-PDF/DOCX data
+    is rejected (415) before the rest is read, and the copy stops with 413
+    as soon as ``max_bytes`` is exceeded. Returns the path and the size; the
+    caller owns (and must delete) the file.
+    """
+    head = await upload.read(UPLOAD_CHUNK_BYTES)
+    if sniff_resume_format(head) != expected_extension:
+        file_type = expected_extension[1:].upper()
+        raise HTTPException(
+            status_code=415,
+            detail=f"File content is not a valid {file_type} document.",
+        )
+
+    size = 0
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=expected_extension)
+    try:
+        with temp_file:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                temp_file.write(chunk)
+                chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+
+        if expected_extension == ".docx" and not is_docx(temp_file.name):
+            raise HTTPException(
+                status_code=415,
+                detail="File content is not a valid DOCX document.",
+            )
+    except BaseException:
+        os.unlink(temp_file.name)
+        raise
+    return temp_file.name, size
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies on upload paths before parsing them.
+
+    A declared Content-Length above the limit is answered with 413 without
+    reading the body. Otherwise received bytes are counted and the request
+    fails with 413 (UploadTooLarge) the moment the limit is crossed, which
+    also covers chunked transfer encoding.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        body_limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > body_limit:
+                    await self._reject(send, max_bytes)
+                    return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > body_limit:
+                    raise UploadTooLarge(max_bytes)
+            return message
+
+        response_started = False
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            if response_started:
+                raise
+            await self._reject(send, max_bytes)
+
+    @staticmethod
+    async def _reject(send, max_bytes: int):
+        payload = json.dumps({"detail": UploadTooLarge(max_bytes).detail}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode("latin-1")),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
@@ -0,0 +1,144 @@
+"""
+benchmarks/cluster_retrieval.py
+
+Latency vs. recall@5 of two-stage (cluster probe + exact scoring) retrieval
+compared with a full scan, on synthetic catalogs of increasing size.
+
+Synthetic catalogs are grown from JOB_PROFILES by copying a profile and
+swapping some of its required skills for other skills from the same sector,
+so career families keep roughly the structure of the real catalog.
+
+Usage (from the repository root):
+    python benchmarks/cluster_retrieval.py
+    python benchmarks/cluster_retrieval.py --sizes 65 1000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.career_recommender import JOB_PROFILES  # noqa: E402
+from services.profile_index import CareerClusters, ProfileIndex  # noqa: E402
+
+TOP_K = 5
+
+
+def synthetic_catalog(size: int, rng: random.Random) -> dict:
+    """Return ``size`` profiles: the real catalog plus perturbed copies"""
+    sector_skills = {}
+    for profile in JOB_PROFILES.values():
+        sector_skills.setdefault(profile["sector"], set()).update(
+            profile["required_skills"]
+        )
+    sector_skills = {sector: sorted(skills) for sector, skills in sector_skills.items()}
+
+    catalog = dict(list(JOB_PROFILES.items())[:size])
+    base_profiles = list(JOB_PROFILES.values())
+    while len(catalog) < size:
+        base = rng.choice(base_profiles)
+        skills = list(base["required_skills"])
+        pool = sector_skills[base["sector"]]
+        for _ in range(rng.randint(1, 3)):
+            skills[rng.randrange(len(skills))] = rng.choice(pool)
+        catalog[f"synthetic_{len(catalog)}"] = {
+            "title": f"{base['title']} {len(catalog)}",
+            "description": base["description"],
+            "required_skills": sorted(set(skills)),
+            "sector": base["sector"],
+        }
+    return catalog
+
+
+def sample_queries(index: ProfileIndex, count: int, rng: random.Random) -> list:
+    """User skill vectors drawn around random profiles, with some noise skills"""
+    queries = []
+    for _ in range(count):
+        row = rng.randrange(len(index))
+        skills = [index.skills[i] for i in np.flatnonzero(index.required[row])]
+        kept = rng.sample(skills, max(1, len(skills) - rng.randint(0, 2)))
+        kept += rng.sample(index.skills, rng.randint(0, 3))
+        queries.append(index.skill_vector(kept))
+    return queries
+
+
+def top_k(scores: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    order = np.argsort(-scores, kind="stable")[:TOP_K]
+    return rows[order]
+
+
+def recall_at_k(index: ProfileIndex, user_vector, exact_scores, approx_rows) -> float:
+    """Tie-aware recall@k: a returned profile counts if it scores at least the
+    k-th best exact score, so equally good alternatives are not penalised"""
+    threshold = np.sort(exact_scores)[-TOP_K]
+    if threshold <= 0:
+        return 1.0
+    approx_scores = index.base_scores(user_vector, approx_rows)
+    return float(np.sum(approx_scores >= threshold - 1e-6)) / TOP_K
+
+
+def run(sizes, n_queries, probes, seed):
+    rng = random.Random(seed)
+    print(
+        f"{'profiles':>8} {'clusters':>8} {'mode':>10} "
+        f"{'scored':>8} {'p50 us':>8} {'p95 us':>8} {'recall@5':>9}"
+    )
+    for size in sizes:
+        index = ProfileIndex(synthetic_catalog(size, rng))
+        clusters = CareerClusters(index)
+        queries = sample_queries(index, n_queries, rng)
+        all_rows = np.arange(len(index))
+
+        exact_scores = []
+        timings = []
+        for user_vector in queries:
+            start = time.perf_counter()
+            scores = index.base_scores(user_vector)
+            top_k(scores, all_rows)
+            timings.append(time.perf_counter() - start)
+            exact_scores.append(scores)
+        report(size, len(clusters), "exact", len(index), timings, 1.0)
+
+        for n_probe in probes:
+            if n_probe > len(clusters):
+                continue
+            timings, recalls, scored = [], [], []
+            for user_vector, scores in zip(queries, exact_scores):
+                start = time.perf_counter()
+                rows = clusters.probe(user_vector, n_probe)
+                approx = top_k(index.base_scores(user_vector, rows), rows)
+                timings.append(time.perf_counter() - start)
+                scored.append(len(rows))
+                recalls.append(recall_at_k(index, user_vector, scores, approx))
+            report(
+                size,
+                len(clusters),
+                f"probe={n_probe}",
+                int(np.mean(scored)),
+                timings,
+                float(np.mean(recalls)),
+            )
+
+
+def report(size, n_clusters, mode, scored, timings, recall):
+    timings_us = np.array(timings) * 1e6
+    print(
+        f"{size:>8} {n_clusters:>8} {mode:>10} {scored:>8} "
+        f"{np.percentile(timings_us, 50):>8.1f} {np.percentile(timings_us, 95):>8.1f} "
+        f"{recall:>9.3f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[65, 500, 2000, 10000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 3, 5, 8])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.probes, args.seed)
@@ -0,0 +1,138 @@
+"""
+benchmarks/import_budget.py
+
+Startup budget of a scoring-only API worker: `python -X importtime` of
+`import main`, the RSS after importing and after serving one /analyze_skills
+request, and the heavy modules that must not have been imported by then.
+
+Heavy dependencies (spaCy, pdfminer, python-docx, sklearn, pandas, torch)
+are only imported on the code paths that need them; this script fails when
+one of them creeps back into the import or scoring path, or when the budget
+below is exceeded.
+
+Usage (from the repository root):
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --top 25
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+# Recorded budget. Measured: ~0.37 s cumulative import time for `main` and
+# ~66 MB RSS after one request, down from ~2.8 s and ~225 MB with eager
+# spaCy/sklearn/pandas/pdfminer imports (without torch installed; the eager
+# sentence_transformers import added several seconds more when present).
+IMPORT_BUDGET_MS = 800
+RSS_BUDGET_MB = 120
+
+FORBIDDEN_MODULES = (
+    "spacy",
+    "pdfminer",
+    "docx",
+    "sklearn",
+    "pandas",
+    "scipy",
+    "torch",
+    "sentence_transformers",
+)
+
+_PROBE = """
+import json, sys
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+import main
+after_import = rss_mb()
+
+from fastapi.testclient import TestClient
+response = TestClient(main.app).post(
+    "/analyze_skills", json={"skills": {"programming": ["python", "sql"]}}
+)
+print(json.dumps({
+    "status": response.status_code,
+    "rss_after_import_mb": after_import,
+    "rss_after_request_mb": rss_mb(),
+    "modules": sorted({name.split(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+def import_times(top: int):
+    """Cumulative import time of `main` and the slowest top-level imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        try:
+            rows.append((int(cumulative_us), name.rstrip(), int(self_us)))
+        except ValueError:
+            continue  # header line
+    total = next(us for us, name, _ in rows if name.strip() == "main")
+    slowest = sorted(rows, reverse=True)[:top]
+    return total / 1000, slowest
+
+
+def main(top: int) -> int:
+    total_ms, slowest = import_times(top)
+    print(f"import main: {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative_us, name, self_us in slowest:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+
+    probe = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    stats = json.loads(probe.stdout.strip().splitlines()[-1])
+    print(
+        f"RSS: {stats['rss_after_import_mb']:.0f} MB after import, "
+        f"{stats['rss_after_request_mb']:.0f} MB after /analyze_skills "
+        f"(budget {RSS_BUDGET_MB} MB)"
+    )
+
+    failures = []
+    if stats["status"] != 200:
+        failures.append(f"/analyze_skills returned {stats['status']}")
+    if total_ms > IMPORT_BUDGET_MS:
+        failures.append(f"import time {total_ms:.0f} ms > {IMPORT_BUDGET_MS} ms")
+    if stats["rss_after_request_mb"] > RSS_BUDGET_MB:
+        failures.append(
+            f"RSS {stats['rss_after_request_mb']:.0f} MB > {RSS_BUDGET_MB} MB"
+        )
+    loaded = sorted(set(FORBIDDEN_MODULES) & set(stats["modules"]))
+    if loaded:
+        failures.append(f"heavy modules loaded on the scoring path: {loaded}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.top))
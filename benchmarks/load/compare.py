@@ -0,0 +1,95 @@
+"""
+benchmarks/load/compare.py
+
+Compare load test results (JSON written by run.py), e.g. a baseline commit
+against a candidate: throughput, error rate and latency percentiles per
+endpoint, with the change relative to the first file, and the peak server
+RSS. Runs are only comparable when they used the same load settings; a
+warning is printed when they did not.
+
+Usage (from the repository root):
+    python benchmarks/load/compare.py results/base.json results/candidate.json
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = (
+    ("throughput_rps", "rps"),
+    ("error_rate", "err"),
+    ("p50_ms", "p50 ms"),
+    ("p95_ms", "p95 ms"),
+    ("p99_ms", "p99 ms"),
+)
+# Settings that have to match for a fair comparison
+LOAD_SETTINGS = ("mode", "rps", "concurrency", "mix", "duration", "variants", "seed", "workers")
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def label(result: dict) -> str:
+    git = result["git"]
+    return (git["commit"] or "unknown")[:10] + ("*" if git["dirty"] else "")
+
+
+def change(base, value) -> str:
+    if base in (None, 0) or value is None:
+        return ""
+    return f"({(value - base) / base * 100:+.0f}%)"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("results", nargs="+", help="result files, baseline first")
+    args = parser.parse_args(argv)
+    results = [load(path) for path in args.results]
+    base = results[0]
+
+    for result, path in zip(results[1:], args.results[1:]):
+        differing = [
+            key
+            for key in LOAD_SETTINGS
+            if result["config"].get(key) != base["config"].get(key)
+        ]
+        if differing:
+            print(f"warning: {path} used different settings: {', '.join(differing)}")
+
+    print("commits: " + ", ".join(label(result) for result in results))
+    if any(result["git"]["dirty"] for result in results):
+        print("(* run with uncommitted changes)")
+    kinds = [kind for kind in base["summary"] if all(kind in r["summary"] for r in results)]
+    for kind in kinds:
+        print(f"\n{kind}")
+        for key, name in METRICS:
+            base_value = base["summary"][kind][key]
+            cells = []
+            for result in results:
+                value = result["summary"][kind][key]
+                if value is None:
+                    cells.append(f"{'-':>20}")
+                    continue
+                text = f"{value * 100:.1f}%" if key == "error_rate" else f"{value:.1f}"
+                if result is not base:
+                    text = f"{text} {change(base_value, value)}".rstrip()
+                cells.append(f"{text:>20}")
+            print(f"  {name:<8}" + "".join(cells))
+
+    peaks = []
+    for result in results:
+        rss = result.get("rss") or []
+        peaks.append(max((s["total_rss_mb"] for s in rss), default=None))
+    if any(peak is not None for peak in peaks):
+        cells = [f"{'-':>20}" if peaks[0] is None else f"{peaks[0]:.0f} MB".rjust(20)]
+        for peak in peaks[1:]:
+            text = "-" if peak is None else f"{peak:.0f} MB {change(peaks[0], peak)}"
+            cells.append(text.rstrip().rjust(20))
+        print(f"\n  {'peak RSS':<8}" + "".join(cells))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+benchmarks/load/fixtures.py
+
+Synthetic request payloads for the load generator: resume text, PDF and
+DOCX files and /analyze_skills bodies.
+
+Each variant draws a different skill set and name from a seeded RNG, so a
+run sees a realistic share of distinct inputs (and not one payload that is
+served from the recommendation cache after the first request), and two runs
+with the same seed send the same requests.
+"""
+
+import io
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ["Jane", "Ravi", "Amara", "Lucas", "Mei", "Omar", "Sofia", "Kwame"]
+LAST_NAMES = ["Doe", "Perera", "Okafor", "Silva", "Chen", "Haddad", "Rossi", "Mensah"]
+
+SKILL_POOL = {
+    "programming": [
+        "python", "java", "javascript", "sql", "c++", "react", "node.js", "git",
+        "docker", "kubernetes", "aws", "typescript",
+    ],
+    "data_science": [
+        "machine learning", "statistics", "pandas", "data analysis", "tensorflow",
+        "data visualization", "deep learning",
+    ],
+    "business": [
+        "project management", "marketing", "financial analysis", "sales",
+        "budgeting", "strategic planning",
+    ],
+    "healthcare": ["patient care", "nursing", "clinical research", "pharmacology"],
+    "design": ["figma", "ui design", "ux research", "adobe photoshop"],
+    "soft_skills": [
+        "communication", "leadership", "teamwork", "problem solving",
+        "time management",
+    ],
+}
+
+TITLES = [
+    "Software Engineer", "Data Analyst", "Project Manager", "Registered Nurse",
+    "UX Designer", "Marketing Specialist", "Data Scientist", "DevOps Engineer",
+]
+
+
+def skill_sets(count: int, seed: int) -> List[Dict[str, List[str]]]:
+    """``count`` skill dicts: two to four categories with a few skills each"""
+    rng = random.Random(seed)
+    sets = []
+    for _ in range(count):
+        categories = rng.sample(sorted(SKILL_POOL), rng.randint(2, 4))
+        sets.append(
+            {
+                category: rng.sample(
+                    SKILL_POOL[category], rng.randint(2, min(5, len(SKILL_POOL[category])))
+                )
+                for category in categories
+            }
+        )
+    return sets
+
+
+def resume_lines(skills: Dict[str, List[str]], rng: random.Random) -> List[str]:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    title = rng.choice(TITLES)
+    years = rng.randint(1, 12)
+    all_skills = [skill for values in skills.values() for skill in values]
+    lines = [
+        name,
+        f"{handle}@example.com | +1 555 {rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{title} with {years} years of experience delivering projects using "
+        f"{', '.join(all_skills[:3])}.",
+        "",
+        "Experience",
+        f"{title}, Example Corp ({2024 - years} - present)",
+        f"Worked with {', '.join(all_skills)} across several teams.",
+        "",
+        "Education",
+        "BSc Computer Science, Example University",
+        "",
+        "Skills",
+        ", ".join(all_skills),
+    ]
+    # Longer resumes: pad with project history, as real CVs run to pages
+    for index in range(rng.randint(5, 30)):
+        lines.append(
+            f"Project {index + 1}: applied {rng.choice(all_skills)} to improve "
+            f"{rng.choice(['reporting', 'onboarding', 'delivery', 'quality'])}."
+        )
+    return lines
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(lines: List[str], lines_per_page: int = 45) -> bytes:
+    """A minimal text PDF (Helvetica, one line per text row) without extra dependencies"""
+    pages = [
+        lines[start : start + lines_per_page]
+        for start in range(0, max(len(lines), 1), lines_per_page)
+    ]
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    page_ids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * index, 5 + 2 * index
+        page_ids.append(page_id)
+        rows = ["BT /F1 11 Tf 14 TL 50 800 Td"]
+        rows += [f"({_pdf_escape(line)}) Tj T*" for line in page_lines]
+        rows.append("ET")
+        stream = "\n".join(rows).encode("latin-1", "replace")
+        objects[content_id] = (
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = out.tell()
+        out.write(b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n")
+    xref = out.tell()
+    count = max(objects) + 1
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+    for object_id in range(1, count):
+        out.write(b"%010d 00000 n \n" % offsets[object_id])
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref)
+    )
+    return out.getvalue()
+
+
+def docx_bytes(lines: List[str]) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def build_payloads(variants: int, seed: int, kinds) -> Dict[str, list]:
+    """``variants`` distinct payloads for each request kind in ``kinds``"""
+    rng = random.Random(seed)
+    skills = skill_sets(variants, seed)
+    texts = [resume_lines(skill_set, rng) for skill_set in skills]
+    payloads = {}
+    if "analyze_skills" in kinds:
+        payloads["analyze_skills"] = [{"skills": skill_set} for skill_set in skills]
+    if "parse_text" in kinds:
+        payloads["parse_text"] = ["\n".join(lines) for lines in texts]
+    if "upload_pdf" in kinds:
+        payloads["upload_pdf"] = [pdf_bytes(lines) for lines in texts]
+    if "upload_docx" in kinds:
+        payloads["upload_docx"] = [docx_bytes(lines) for lines in texts]
+    return payloads
@@ -0,0 +1,478 @@
+"""
+benchmarks/load/run.py
+
+Load test of the API: start it locally with serve.py, replay a weighted mix
+of /upload_resume (PDF and DOCX), /parse_text and /analyze_skills requests
+at a target rate or concurrency, and report throughput, latency percentiles,
+error rates and the RSS of the server processes over time.
+
+Results are written as JSON tagged with the git commit (and whether the tree
+was dirty), so runs of different commits can be compared with
+benchmarks/load/compare.py. Payloads are synthetic and seeded: the same
+arguments send the same requests.
+
+Two modes:
+    --concurrency N  closed loop: N clients, each sends its next request as
+                     soon as the previous one is answered (capacity)
+    --rps R          open loop: requests start on a fixed schedule whether or
+                     not earlier ones have finished; latency is measured from
+                     the scheduled start, so queueing in the client counts
+
+Usage (from the repository root):
+    python benchmarks/load/run.py --duration 60 --concurrency 8
+    python benchmarks/load/run.py --rps 20 --workers 4 \\
+        --mix analyze_skills=6,parse_text=2,upload_pdf=1,upload_docx=1
+    python benchmarks/load/run.py --url http://localhost:8000 --rps 5
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import build_payloads  # noqa: E402
+
+LOAD_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.abspath(os.path.join(LOAD_DIR, "..", ".."))
+APP_DIR = os.path.join(REPO_DIR, "app")
+RESULTS_DIR = os.path.join(LOAD_DIR, "results")
+
+DEFAULT_MIX = "analyze_skills=5,parse_text=3,upload_pdf=1,upload_docx=1"
+KINDS = ("analyze_skills", "parse_text", "upload_pdf", "upload_docx")
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(spec: str) -> dict:
+    """``kind=weight,...`` to {kind: weight}"""
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.strip().partition("=")
+        if kind not in KINDS:
+            raise SystemExit(f"Unknown request kind {kind!r}; expected one of {KINDS}")
+        mix[kind] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise SystemExit("The mix needs at least one positive weight")
+    return mix
+
+
+_session = threading.local()
+
+
+def send(base_url: str, kind: str, payload, timeout: float) -> requests.Response:
+    session = getattr(_session, "value", None)
+    if session is None:
+        session = _session.value = requests.Session()
+    if kind == "analyze_skills":
+        return session.post(f"{base_url}/analyze_skills", json=payload, timeout=timeout)
+    if kind == "parse_text":
+        return session.post(
+            f"{base_url}/parse_text", data={"resume_text": payload}, timeout=timeout
+        )
+    extension = ".pdf" if kind == "upload_pdf" else ".docx"
+    return session.post(
+        f"{base_url}/upload_resume",
+        files={"file": (f"resume{extension}", payload, "application/octet-stream")},
+        timeout=timeout,
+    )
+
+
+# --- server -------------------------------------------------------------------
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, log_path: str, timeout: float):
+    """Start serve.py on 127.0.0.1:port and wait until /health/ready answers 200"""
+    log = open(log_path, "w")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "serve.py",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=APP_DIR,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with {process.returncode}; see {log_path}")
+        try:
+            if requests.get(f"{base_url}/health/ready", timeout=2).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise SystemExit(f"Server not ready after {timeout:.0f} s; see {log_path}")
+
+
+def stop_server(process) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def process_tree(root_pid: int) -> list:
+    """root_pid and its live descendants (serve.py forks its workers)"""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; ppid follows the ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+    tree, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(parents.get(pid, ()))
+    return sorted(tree)
+
+
+def rss_mb(pid: int):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RSSSampler(threading.Thread):
+    """Sample the RSS of a process tree every ``interval`` seconds"""
+
+    def __init__(self, root_pid: int, interval: float, origin: float):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.root_pid = root_pid
+        self.interval = interval
+        self.origin = origin
+        self.samples = []
+        self._stopping = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            rss = {}
+            for pid in process_tree(self.root_pid):
+                value = rss_mb(pid)
+                if value is not None:
+                    rss[str(pid)] = round(value, 1)
+            self.samples.append(
+                {
+                    "t": round(time.perf_counter() - self.origin, 2),
+                    "rss_mb": rss,
+                    "total_rss_mb": round(sum(rss.values()), 1),
+                }
+            )
+            self._stopping.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.join()
+
+
+# --- load ---------------------------------------------------------------------
+
+
+class Recorder:
+    """Outcome of every request: (kind, start offset, latency, status, error)"""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.records = []
+
+    def call(self, base_url, kind, payload, timeout, scheduled=None):
+        scheduled = time.perf_counter() if scheduled is None else scheduled
+        status, error = 0, None
+        try:
+            status = send(base_url, kind, payload, timeout).status_code
+        except requests.RequestException as e:
+            error = type(e).__name__
+        # list.append is atomic, so worker threads need no lock
+        self.records.append(
+            (kind, scheduled - self.start, time.perf_counter() - scheduled, status, error)
+        )
+
+
+def run_closed_loop(recorder, base_url, choose, concurrency, deadline, timeout):
+    def client():
+        while time.perf_counter() < deadline:
+            kind, payload = choose()
+            recorder.call(base_url, kind, payload, timeout)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open_loop(recorder, base_url, choose, rps, deadline, timeout, max_in_flight):
+    interval = 1.0 / rps
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        scheduled = time.perf_counter()
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            kind, payload = choose()
+            pool.submit(recorder.call, base_url, kind, payload, timeout, scheduled)
+            scheduled += interval
+
+
+# --- report -------------------------------------------------------------------
+
+
+def percentile(sorted_values: list, q: float):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(records: list, seconds: float) -> dict:
+    ok = sorted(latency for _, _, latency, status, _ in records if 200 <= status < 300)
+    errors = {}
+    for _, _, _, status, error in records:
+        if not 200 <= status < 300:
+            key = error or str(status)
+            errors[key] = errors.get(key, 0) + 1
+    summary = {
+        "requests": len(records),
+        "ok": len(ok),
+        "errors": errors,
+        "error_rate": round(1 - len(ok) / len(records), 4) if records else 0.0,
+        "throughput_rps": round(len(ok) / seconds, 2) if seconds > 0 else 0.0,
+        "mean_ms": round(sum(ok) / len(ok) * 1000, 2) if ok else None,
+        "max_ms": round(ok[-1] * 1000, 2) if ok else None,
+    }
+    for q in PERCENTILES:
+        value = percentile(ok, q)
+        summary[f"p{q}_ms"] = round(value * 1000, 2) if value is not None else None
+    return summary
+
+
+def timeline(records: list, warmup: float, duration: float, interval: float) -> list:
+    """Per-interval throughput, errors and p95, by request start time"""
+    buckets = []
+    start = warmup
+    while start < warmup + duration:
+        end = min(start + interval, warmup + duration)
+        window = [record for record in records if start <= record[1] < end]
+        stats = summarize(window, end - start)
+        buckets.append(
+            {
+                "t": round(start - warmup, 2),
+                "requests": stats["requests"],
+                "throughput_rps": stats["throughput_rps"],
+                "errors": stats["requests"] - stats["ok"],
+                "p95_ms": stats["p95_ms"],
+            }
+        )
+        start = end
+    return buckets
+
+
+def git_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+    }
+
+
+def print_report(result: dict) -> None:
+    git = result["git"]
+    commit = (git["commit"] or "unknown")[:10] + (" (dirty)" if git["dirty"] else "")
+    config = result["config"]
+    load = f"{config['rps']} rps" if config["rps"] else f"concurrency {config['concurrency']}"
+    print(f"commit {commit}, {load}, {config['duration']:.0f} s measured")
+    print(
+        f"{'endpoint':<16} {'requests':>8} {'rps':>7} {'err %':>6} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+
+    def fmt(value):
+        return f"{value:>8.1f}" if value is not None else f"{'-':>8}"
+
+    for kind, stats in result["summary"].items():
+        print(
+            f"{kind:<16} {stats['requests']:>8} {stats['throughput_rps']:>7.1f} "
+            f"{stats['error_rate'] * 100:>6.1f} {fmt(stats['p50_ms'])} "
+            f"{fmt(stats['p95_ms'])} {fmt(stats['p99_ms'])} {fmt(stats['max_ms'])}"
+        )
+        if stats["errors"]:
+            print(f"{'':<16} errors: {stats['errors']}")
+    rss = result["rss"]
+    if rss:
+        peak = max(sample["total_rss_mb"] for sample in rss)
+        print(
+            f"server RSS: {rss[0]['total_rss_mb']:.0f} MB at start, "
+            f"{rss[-1]['total_rss_mb']:.0f} MB at end, {peak:.0f} MB peak"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, help="closed loop with N clients")
+    load.add_argument("--rps", type=float, help="open loop at R requests per second")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="kind=weight,... (%(default)s)")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="seconds of load before measuring"
+    )
+    parser.add_argument(
+        "--variants", type=int, default=50, help="distinct payloads per request kind"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60, help="per-request seconds")
+    parser.add_argument(
+        "--max-in-flight", type=int, default=256, help="open loop: client threads"
+    )
+    parser.add_argument("--interval", type=float, default=1.0, help="timeline step")
+    parser.add_argument("--url", help="use a running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="serve.py workers")
+    parser.add_argument("--ready-timeout", type=float, default=120)
+    parser.add_argument("--output", help="result JSON path (default: results/)")
+    args = parser.parse_args(argv)
+    if args.concurrency is None and args.rps is None:
+        args.concurrency = 4
+
+    mix = parse_mix(args.mix)
+    payloads = build_payloads(args.variants, args.seed, set(mix))
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    rng = random.Random(args.seed)
+    rng_lock = threading.Lock()
+
+    def choose():
+        with rng_lock:
+            kind = rng.choices(kinds, weights)[0]
+            return kind, rng.choice(payloads[kind])
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    process = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        process, base_url = start_server(
+            free_port(),
+            args.workers,
+            os.path.join(RESULTS_DIR, "server.log"),
+            args.ready_timeout,
+        )
+
+    try:
+        start = time.perf_counter()
+        sampler = None
+        if process is not None:
+            sampler = RSSSampler(process.pid, args.interval, start + args.warmup)
+            sampler.start()
+        recorder = Recorder(start)
+        deadline = start + args.warmup + args.duration
+        if args.rps:
+            run_open_loop(
+                recorder, base_url, choose, args.rps, deadline, args.timeout,
+                args.max_in_flight,
+            )
+        else:
+            run_closed_loop(
+                recorder, base_url, choose, args.concurrency, deadline, args.timeout
+            )
+        if sampler is not None:
+            sampler.stop()
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    measured = [record for record in recorder.records if record[1] >= args.warmup]
+    summary = {"all": summarize(measured, args.duration)}
+    for kind in kinds:
+        summary[kind] = summarize(
+            [record for record in measured if record[0] == kind], args.duration
+        )
+    result = {
+        "git": git_info(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "mode": "open" if args.rps else "closed",
+            "rps": args.rps,
+            "concurrency": args.concurrency if not args.rps else None,
+            "mix": mix,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "variants": args.variants,
+            "seed": args.seed,
+            "workers": args.workers if process is not None else None,
+            "url": args.url,
+        },
+        "summary": summary,
+        "timeline": timeline(measured, args.warmup, args.duration, args.interval),
+        "rss": [sample for sample in sampler.samples if sample["t"] >= 0]
+        if sampler is not None
+        else [],
+    }
+
+    output = args.output
+    if output is None:
+        commit = (result["git"]["commit"] or "unknown")[:10]
+        output = os.path.join(
+            RESULTS_DIR, f"{commit}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print_report(result)
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
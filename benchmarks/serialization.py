@@ -0,0 +1,167 @@
+"""
+benchmarks/serialization.py
+
+Serialization time and bytes on the wire per endpoint: the stdlib encoder
+(what JSONResponse uses) against orjson, and the body size before and after
+gzip at the level the API's GZipMiddleware uses.
+
+Payloads are the real response bodies, built in-process with the same
+helpers the endpoints call, so no server is needed.
+
+Usage (from the repository root):
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --resume data/resumes/sample.pdf --repeat 200
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import main  # noqa: E402
+from services.career_recommender import JOB_PROFILES, LEARNING_RESOURCES  # noqa: E402
+from services.responses import GZIP_LEVEL, GZIP_MIN_BYTES  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SKILLS = {
+    "skills": {
+        "programming": ["python", "java", "sql", "javascript"],
+        "data_science": ["machine learning", "statistics", "pandas"],
+        "soft_skills": ["communication", "leadership"],
+    }
+}
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555 0100
+
+Senior Software Engineer with 6 years of experience building web services in
+Python and Java. Led a team of four engineers; designed REST APIs, SQL and
+MongoDB data models, and CI/CD pipelines with Docker and Kubernetes on AWS.
+Applied machine learning (scikit-learn, pandas) to forecast demand.
+
+Education: BSc Computer Science
+Skills: Python, Java, SQL, JavaScript, React, Docker, Kubernetes, AWS, Git,
+machine learning, data analysis, communication, project management
+"""
+
+
+def payloads(resume_path=None) -> dict:
+    """Response bodies of the analysis and catalog endpoints"""
+    upload_sections = set(main.UPLOAD_SECTIONS) - {"file_info"}
+    bodies = {
+        "/analyze_skills": main.analyze_skills_data(
+            SKILLS, set(main.SKILLS_SECTIONS), False, None, 5
+        ),
+        "/analyze_skills?explain=true": main.analyze_skills_data(
+            SKILLS, set(main.SKILLS_SECTIONS), True, None, 5
+        ),
+        "/parse_text": main.analyze_resume_text(
+            RESUME_TEXT, set(main.RESUME_SECTIONS), False, None, 5
+        ),
+        "/parse_text?top_n=50": main.analyze_resume_text(
+            RESUME_TEXT, set(main.RESUME_SECTIONS), False, None, 50
+        ),
+        "/skill_gains": main.skill_gains_data(SKILLS, 5, 10),
+        "/job_profiles": {
+            "job_profiles": JOB_PROFILES,
+            "total_profiles": len(JOB_PROFILES),
+        },
+        "/learning_resources": {
+            "learning_resources": LEARNING_RESOURCES,
+            "total_skills": len(LEARNING_RESOURCES),
+        },
+    }
+    if resume_path:
+        bodies["/upload_resume"] = main.analyze_resume_file(
+            resume_path, upload_sections, False, None, 5
+        )
+    return bodies
+
+
+def stdlib_dumps(content) -> bytes:
+    # Same arguments as starlette's JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def orjson_dumps(content) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def median_us(fn, arg, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def measure(bodies: dict, repeat: int) -> list:
+    rows = []
+    for endpoint, content in bodies.items():
+        body = stdlib_dumps(content)
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        rows.append(
+            {
+                "endpoint": endpoint,
+                "stdlib_us": median_us(stdlib_dumps, content, repeat),
+                "orjson_us": median_us(orjson_dumps, content, repeat) if orjson else None,
+                "gzip_us": median_us(
+                    lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL),
+                    body,
+                    repeat,
+                ),
+                "bytes": len(body),
+                "wire_bytes": len(compressed) if len(body) >= GZIP_MIN_BYTES else len(body),
+            }
+        )
+    return rows
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--resume", help="PDF or DOCX resume to include /upload_resume")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    args = parser.parse_args(argv)
+
+    rows = measure(payloads(args.resume), args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    if orjson is None:
+        print("orjson is not installed; only the stdlib encoder is measured")
+    print(
+        f"gzip level {GZIP_LEVEL}, bodies under {GZIP_MIN_BYTES} bytes sent "
+        f"uncompressed; median of {args.repeat} runs"
+    )
+    print(
+        f"{'endpoint':<30} {'stdlib us':>10} {'orjson us':>10} {'speedup':>8} "
+        f"{'gzip us':>8} {'bytes':>8} {'wire':>8} {'ratio':>6}"
+    )
+    for row in rows:
+        orjson_us = row["orjson_us"]
+        print(
+            f"{row['endpoint']:<30} {row['stdlib_us']:>10.1f} "
+            f"{orjson_us if orjson_us is not None else float('nan'):>10.1f} "
+            f"{row['stdlib_us'] / orjson_us if orjson_us else float('nan'):>7.1f}x "
+            f"{row['gzip_us']:>8.1f} {row['bytes']:>8} {row['wire_bytes']:>8} "
+            f"{row['wire_bytes'] / row['bytes']:>6.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
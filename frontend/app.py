@@ -19,7 +19,6 @@ import base64
 import subprocess
 import sys
 import os
-import shutil
 import time
 
 # Page configuration
@@ -137,33 +136,82 @@ def check_api_health():
         return False
 
 
-def upload_resume_api(file):
-    """Upload resume file to backend endpoint /upload_resume.
+# How long to wait for a queued analysis job, and how often to ask
+JOB_WAIT_TIMEOUT = float(os.environ.get("CAREERPATH_JOB_WAIT_TIMEOUT", "600"))
+JOB_POLL_INTERVAL = 1.0
+
+
+def wait_for_job(job_id, timeout=JOB_WAIT_TIMEOUT):
+    """Poll backend /jobs/{job_id} until the job finishes.
+    Args:
+        job_id (str): id returned by one of the /jobs submit endpoints.
+        timeout (float): seconds to keep polling before giving up.
+    Returns:
+        dict|None: the job result, or None if the job failed, expired or timed out.
+    Side effects:
+        Uses st.error to report failures.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        resp = requests.get(f"{API_BASE_URL}/jobs/{job_id}", timeout=10)
+        if resp.status_code != 200:
+            try:
+                detail = resp.json()
+            except Exception:
+                detail = resp.text
+            st.error(f"Backend error {resp.status_code}: {detail}")
+            return None
+        job = resp.json()
+        if job["status"] == "done":
+            return job["result"]
+        if job["status"] == "failed":
+            st.error(f"Analysis failed: {job.get('error')}")
+            return None
+        time.sleep(JOB_POLL_INTERVAL)
+    st.error(f"Analysis did not finish within {timeout:.0f} seconds.")
+    return None
+
+
+def _upload_files(file):
+    """Build the requests ``files`` mapping for a resume upload."""
+    # Prepare file tuple for requests: (filename, bytes, content_type)
+    if hasattr(file, "getvalue"):
+        file_bytes = file.getvalue()
+        filename = getattr(file, "name", "resume")
+        content_type = getattr(file, "type", "application/octet-stream")
+        return {"file": (filename, file_bytes, content_type)}
+    if hasattr(file, "read"):
+        # generic file-like
+        filename = getattr(file, "name", "resume")
+        content = file.read()
+        return {"file": (filename, content, "application/octet-stream")}
+    return {"file": file}
+
+
+def upload_resume_api(file, sectors=None, debug=False):
+    """Submit resume file to backend endpoint /jobs/upload_resume and wait for the result.
     Args:
         file: Streamlit UploadedFile or file-like object.
+        sectors (list|None): restrict recommendations to these sectors (server-side).
+        debug (bool): ask the backend for per-stage timings (_timings in the result).
     Returns:
-        dict|None: parsed JSON response from backend or None on error.
+        dict|None: analysis result (same shape as /upload_resume) or None on error.
     Side effects:
         Uses st.error to render user-friendly failure messages with backend details.
+    Note:
+        The upload returns as soon as the job is queued, so large files are not
+        bound by a request timeout; wait_for_job polls until the analysis is done.
     """
     try:
-        # Prepare file tuple for requests: (filename, bytes, content_type)
-        if hasattr(file, "getvalue"):
-            file_bytes = file.getvalue()
-            filename = getattr(file, "name", "resume")
-            content_type = getattr(file, "type", "application/octet-stream")
-            files = {"file": (filename, file_bytes, content_type)}
-        elif hasattr(file, "read"):
-            # generic file-like
-            filename = getattr(file, "name", "resume")
-            content = file.read()
-            files = {"file": (filename, content, "application/octet-stream")}
-        else:
-            files = {"file": file}
-
-        resp = requests.post(f"{API_BASE_URL}/upload_resume", files=files, timeout=30)
-        if resp.status_code == 200:
-            return resp.json()
+        files = _upload_files(file)
+        params = {"sectors": ",".join(sectors)} if sectors else {}
+        if debug:
+            params["debug"] = 1
+        resp = requests.post(
+            f"{API_BASE_URL}/jobs/upload_resume", files=files, params=params, timeout=60
+        )
+        if resp.status_code == 202:
+            return wait_for_job(resp.json()["job_id"])
         else:
             # show backend error details if available
             try:
@@ -175,7 +223,7 @@ def upload_resume_api(file):
 
     except requests.exceptions.ConnectionError:
         st.error(
-            "Cannot connect to backend. Start it with: cd app && uvicorn main:app --reload"
+            "Cannot connect to backend. Start it with: cd app && python serve.py"
         )
         return None
     except Exception as e:
@@ -183,18 +231,74 @@ def upload_resume_api(file):
         return None
 
 
-def analyze_skills_api(skills_data):
+def stream_resume_api(file, sectors=None, debug=False):
+    """Upload a resume to /upload_resume/stream and yield its Server-Sent Events.
+    Args:
+        file: Streamlit UploadedFile or file-like object.
+        sectors (list|None): restrict recommendations to these sectors (server-side).
+        debug (bool): ask the backend for per-stage timings (_timings in the done event).
+    Yields:
+        (event, data) tuples: partial results (contact, skills, details,
+        recommendations, learning_plan, skill_analysis, personalized_advice)
+        as they are computed, then ("done", full result) or ("error", detail).
+    Note:
+        Keep-alive comments are skipped; the read timeout only has to cover
+        the gap between them.
+    """
+    params = {"sectors": ",".join(sectors)} if sectors else {}
+    if debug:
+        params["debug"] = 1
+    try:
+        with requests.post(
+            f"{API_BASE_URL}/upload_resume/stream",
+            files=_upload_files(file),
+            params=params,
+            stream=True,
+            timeout=(10, 60),
+        ) as resp:
+            if resp.status_code != 200:
+                try:
+                    detail = resp.json()
+                except Exception:
+                    detail = resp.text
+                yield "error", {"status_code": resp.status_code, "detail": detail}
+                return
+            event, data_lines = None, []
+            for line in resp.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data_lines.append(line[5:].strip())
+                elif not line and event and data_lines:
+                    # A blank line ends an event
+                    yield event, json.loads("\n".join(data_lines))
+                    event, data_lines = None, []
+    except requests.exceptions.ConnectionError:
+        yield "error", {
+            "detail": "Cannot connect to backend. Start it with: cd app && python serve.py"
+        }
+
+
+def analyze_skills_api(skills_data, sectors=None, debug=False):
     """Send skills data to backend /analyze_skills.
     Args:
         skills_data (dict): payload with skill categories.
+        sectors (list|None): restrict recommendations to these sectors (server-side).
+        debug (bool): ask the backend for per-stage timings (_timings in the response).
     Returns:
         dict|None: backend JSON response or None on error.
     Note:
         Timeout is set to 30 seconds; catches connection errors and surfaces messages.
     """
     try:
+        params = {"sectors": ",".join(sectors)} if sectors else {}
+        if debug:
+            params["debug"] = 1
         resp = requests.post(
-            f"{API_BASE_URL}/analyze_skills", json=skills_data, timeout=30
+            f"{API_BASE_URL}/analyze_skills",
+            json=skills_data,
+            params=params,
+            timeout=30,
         )
         if resp.status_code == 200:
             return resp.json()
@@ -207,7 +311,7 @@ def analyze_skills_api(skills_data):
             return None
     except requests.exceptions.ConnectionError:
         st.error(
-            "Cannot connect to backend. Start it with: cd app && uvicorn main:app --reload"
+            "Cannot connect to backend. Start it with: cd app && python serve.py"
         )
         return None
     except Exception as e:
@@ -215,16 +319,35 @@ def analyze_skills_api(skills_data):
         return None
 
 
+def _max_age(cache_control):
+    """max-age seconds from a Cache-Control header, 0 if absent."""
+    for directive in (cache_control or "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "max-age" and value.isdigit():
+            return int(value)
+    return 0
+
+
 def get_job_profiles_api():
     """Fetch job profiles from backend /job_profiles.
     Returns:
         dict|None: backend JSON containing job profiles or None on failure.
     Shows helpful message if backend unreachable.
+    Note:
+        The response is kept in st.session_state. It is reused without a request
+        while fresh (Cache-Control max-age), then revalidated with its ETag, so an
+        unchanged catalog costs a 304 instead of a full download on every rerun.
     """
+    cached = st.session_state.get("job_profiles_cache")
+    if cached and time.time() < cached["fresh_until"]:
+        return cached["data"]
     try:
-        resp = requests.get(f"{API_BASE_URL}/job_profiles", timeout=15)
-        if resp.status_code == 200:
-            return resp.json()
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+        resp = requests.get(f"{API_BASE_URL}/job_profiles", headers=headers, timeout=15)
+        if resp.status_code == 304 and cached:
+            data = cached["data"]
+        elif resp.status_code == 200:
+            data = resp.json()
         else:
             try:
                 detail = resp.json()
@@ -232,9 +355,15 @@ def get_job_profiles_api():
                 detail = resp.text
             st.error(f"Backend error {resp.status_code}: {detail}")
             return None
+        st.session_state["job_profiles_cache"] = {
+            "data": data,
+            "etag": resp.headers.get("ETag") or (cached or {}).get("etag"),
+            "fresh_until": time.time() + _max_age(resp.headers.get("Cache-Control")),
+        }
+        return data
     except requests.exceptions.ConnectionError:
         st.error(
-            "Cannot connect to backend. Start it with: cd app && uvicorn main:app --reload"
+            "Cannot connect to backend. Start it with: cd app && python serve.py"
         )
         return None
     except Exception as e:
@@ -422,13 +551,14 @@ def get_default_backend_dir():
     return candidate
 
 
-def start_backend_subprocess(backend_dir=None, timeout=15):
+def start_backend_subprocess(backend_dir=None, timeout=60):
     """Attempt to start the FastAPI backend using uvicorn in a detached subprocess.
 
     Behavior:
-    - Detects uvicorn in PATH, otherwise uses python -m uvicorn.
+    - Runs app/serve.py (preloaded workers, never the reloader).
     - Writes stdout/stderr to backend_start.log for debugging.
-    - Polls local health endpoint until timeout.
+    - Polls the readiness endpoint (/health/ready) until the backend has finished
+      its warm-up (spaCy, indexes, a synthetic analysis) or the timeout expires.
     Returns:
         (bool, str): success flag and message (helpful for support when startup fails).
     """
@@ -436,29 +566,18 @@ def start_backend_subprocess(backend_dir=None, timeout=15):
     if not os.path.isdir(backend_dir):
         return False, f"Backend directory not found: {backend_dir}"
 
-    # Prefer system uvicorn if available, otherwise use python -m uvicorn
-    if shutil.which("uvicorn"):
-        cmd = [
-            "uvicorn",
-            "main:app",
-            "--reload",
-            "--host",
-            "127.0.0.1",
-            "--port",
-            "8000",
-        ]
-    else:
-        cmd = [
-            sys.executable,
-            "-m",
-            "uvicorn",
-            "main:app",
-            "--reload",
-            "--host",
-            "127.0.0.1",
-            "--port",
-            "8000",
-        ]
+    # Production entrypoint (preloaded, no reloader); one worker is enough
+    # for a local single-user backend unless CAREERPATH_WORKERS says otherwise
+    cmd = [
+        sys.executable,
+        "serve.py",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        "8000",
+        "--workers",
+        os.environ.get("CAREERPATH_WORKERS", "1"),
+    ]
 
     # Prepare log file in project root so user can inspect startup errors
     project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
@@ -486,19 +605,27 @@ def start_backend_subprocess(backend_dir=None, timeout=15):
             pass
         return False, f"Failed to start backend process: {e} (log: {log_path})"
 
-    # Poll health endpoint until timeout
+    # Poll readiness until timeout; 503 means alive but still warming up
     start = time.time()
     while time.time() - start < timeout:
         try:
-            r = requests.get("http://127.0.0.1:8000/health", timeout=1)
+            r = requests.get("http://127.0.0.1:8000/health/ready", timeout=1)
             if r.status_code == 200:
                 try:
                     log_fd.close()
                 except:
                     pass
-                return True, "Backend started and healthy."
+                warmup = r.json().get("warmup_seconds") or 0
+                return True, f"Backend started and ready (warm-up {warmup:.1f}s)."
+            if r.json().get("status") == "failed":
+                log_fd.close()
+                return (
+                    False,
+                    f"Backend warm-up failed: {r.json().get('components')} (log: {log_path})",
+                )
         except Exception:
-            time.sleep(0.5)
+            pass
+        time.sleep(0.5)
 
     try:
         log_fd.close()
@@ -507,7 +634,7 @@ def start_backend_subprocess(backend_dir=None, timeout=15):
 
     return (
         False,
-        f"Backend did not respond within timeout. Check the log at: {log_path} and start manually with: cd app && uvicorn main:app --reload",
+        f"Backend did not respond within timeout. Check the log at: {log_path} and start manually with: cd app && python serve.py",
     )
 
 
@@ -526,7 +653,7 @@ def main():
     api_ok = check_api_health()
     if not api_ok:
         st.error("⚠️ Backend API is not running on http://localhost:8000.")
-        st.info("To start the backend manually: cd app && uvicorn main:app --reload")
+        st.info("To start the backend manually: cd app && python serve.py")
 
         col1, col2 = st.columns([1, 1])
         with col1:
@@ -534,7 +661,7 @@ def main():
                 with st.spinner("Attempting to start backend..."):
                     backend_dir = get_default_backend_dir()
                     ok, msg = start_backend_subprocess(
-                        backend_dir=backend_dir, timeout=15
+                        backend_dir=backend_dir, timeout=60
                     )
                     if ok:
                         st.success(msg)
@@ -544,7 +671,7 @@ def main():
                         st.error(msg)
         with col2:
             if st.button("Show manual start command"):
-                st.code("cd app && uvicorn main:app --reload", language="bash")
+                st.code("cd app && python serve.py", language="bash")
 
         return
 
@@ -554,6 +681,11 @@ def main():
         "Choose an option:",
         ["Upload Resume", "Manual Skills Input", "Sector Explorer", "About"],
     )
+    st.sidebar.checkbox(
+        "Show stage timings",
+        key="show_timings",
+        help="Ask the backend how long each analysis stage took",
+    )
 
     if page == "Upload Resume":
         upload_resume_page()
@@ -586,14 +718,27 @@ def upload_resume_page():
         help="Upload your resume to get personalized career recommendations",
     )
 
+    progressive = st.sidebar.checkbox(
+        "Show results progressively",
+        value=True,
+        help="Show each part of the analysis as soon as the backend has it",
+    )
+
     if uploaded_file is not None:
         st.success(f"✅ File uploaded: {uploaded_file.name}")
 
         if st.button("🚀 Analyze Resume", type="primary"):
+            if progressive:
+                stream_resume_results(uploaded_file, selected_sectors)
+                return
             with st.spinner("Analyzing your resume..."):
                 try:
                     # Use API wrapper (will use demo if DEMO_MODE)
-                    data = upload_resume_api(uploaded_file)
+                    data = upload_resume_api(
+                        uploaded_file,
+                        selected_sectors,
+                        debug=st.session_state.get("show_timings", False),
+                    )
                     if data:
                         display_results(data, selected_sectors)
                     else:
@@ -602,6 +747,77 @@ def upload_resume_page():
                     st.error(f"Error analyzing resume: {str(e)}")
 
 
+# Progress message shown while waiting for the event after the one received
+STREAM_STATUS = {
+    "accepted": "Reading your resume...",
+    "contact": "Extracting skills...",
+    "skills": "Reading education and experience...",
+    "details": "Matching careers...",
+    "recommendations": "Building your learning plan...",
+    "learning_plan": "Analyzing your skills...",
+    "skill_analysis": "Writing personalized advice...",
+    "personalized_advice": "Finishing up...",
+}
+
+
+def stream_resume_results(uploaded_file, selected_sectors):
+    """Analyze a resume over /upload_resume/stream, rendering partial results as they arrive.
+    Contact details, skills and the top recommendations are shown in a
+    placeholder as soon as each is ready; the full view (display_results)
+    replaces it when the done event arrives.
+    """
+    status = st.empty()
+    partial = st.empty()
+    seen = {}
+    status.info("Uploading your resume...")
+    try:
+        for event, data in stream_resume_api(
+            uploaded_file,
+            selected_sectors,
+            debug=st.session_state.get("show_timings", False),
+        ):
+            if event == "error":
+                status.empty()
+                st.error(f"Analysis failed: {data.get('detail')}")
+                return
+            if event == "done":
+                status.empty()
+                partial.empty()
+                display_results(data, selected_sectors)
+                return
+            seen.update(data)
+            status.info(STREAM_STATUS.get(event, "Analyzing your resume..."))
+            with partial.container():
+                display_partial_results(seen)
+        status.empty()
+        st.error("Analysis ended before the results were complete.")
+    except Exception as e:
+        status.empty()
+        st.error(f"Error analyzing resume: {str(e)}")
+
+
+def display_partial_results(seen: Dict):
+    """Render the parts of a streamed analysis received so far."""
+    if seen.get("name") or seen.get("email"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Name", seen.get("name") or "Not found")
+        with col2:
+            st.metric("Email", seen.get("email") or "Not found")
+        with col3:
+            st.metric("Phone", seen.get("phone") or "Not found")
+    for category, skills in (seen.get("skills") or {}).items():
+        if skills:
+            st.markdown(f"**{category.replace('_', ' ').title()}:** {', '.join(skills)}")
+    if seen.get("recommendations"):
+        st.markdown("**🎯 Top matches so far:**")
+        for rec in seen["recommendations"][:5]:
+            st.markdown(
+                f"• {rec.get('job_title', 'Unknown')} "
+                f"({float(rec.get('match_score', 0)):.1f}%)"
+            )
+
+
 def manual_skills_page():
     """Page to manually pick or type skills when user doesn't have a resume to upload."""
     st.markdown(
@@ -767,11 +983,24 @@ def manual_skills_page():
                                 for s in selected_skills
                                 if s in skill_categories.get("Business", [])
                             ],
+                            # Typed skills are normalized by the backend
+                            # ("Pyhton" -> "python") before scoring
+                            "other": [
+                                s
+                                for s in selected_skills
+                                if not any(
+                                    s in options for options in skill_categories.values()
+                                )
+                            ],
                         }
                     }
 
                     # Use API wrapper (will use demo if DEMO_MODE)
-                    response = analyze_skills_api(skills_data)
+                    response = analyze_skills_api(
+                        skills_data,
+                        selected_sectors,
+                        debug=st.session_state.get("show_timings", False),
+                    )
 
                     if response:
                         restructured_data = {
@@ -779,11 +1008,13 @@ def manual_skills_page():
                                 "name": "Manual Skills User",
                                 "email": "",
                                 "phone": "",
-                                "skills": response.get("input_skills", {}).get(
-                                    "skills", {}
+                                "skills": response.get(
+                                    "normalized_skills",
+                                    response.get("input_skills", {}).get("skills", {}),
                                 ),
                             },
                             "career_analysis": response.get("career_analysis", {}),
+                            "_timings": response.get("_timings"),
                         }
                         display_results(restructured_data, selected_sectors)
                     else:
@@ -891,6 +1122,7 @@ def display_results(data, selected_sectors):
         personal_info = parsed_data
         skills_data = parsed_data.get("skills", {})
         recommendations = career_analysis.get("recommendations", [])
+        recommendations_by_sector = career_analysis.get("recommendations_by_sector", {})
         skill_analysis = career_analysis.get("skill_analysis", {})
         learning_plan = career_analysis.get("learning_plan", {})
         personalized_advice = career_analysis.get("personalized_advice", {})
@@ -899,20 +1131,12 @@ def display_results(data, selected_sectors):
         personal_info = data
         skills_data = data.get("skills", {})
         recommendations = data.get("recommendations", [])
+        recommendations_by_sector = data.get("recommendations_by_sector", {})
         skill_analysis = data.get("skill_analysis", {})
         learning_plan = data.get("learning_plan", {})
         personalized_advice = data.get("personalized_advice", {})
 
-    # Filter recommendations by selected sectors
-    if selected_sectors:
-        recommendations = [
-            rec
-            for rec in recommendations
-            if any(
-                sector in rec.get("sector", "").lower() for sector in selected_sectors
-            )
-        ]
-
+    # Recommendations are already limited to selected_sectors by the backend
     # Personal Information
     if personal_info.get("name"):
         st.markdown(
@@ -981,6 +1205,17 @@ def display_results(data, selected_sectors):
                     unsafe_allow_html=True,
                 )
 
+        # Best matches within each selected sector
+        if len(recommendations_by_sector) > 1:
+            for sector, sector_recs in recommendations_by_sector.items():
+                with st.expander(f"Top matches in {SECTORS.get(sector, sector)}"):
+                    if not sector_recs:
+                        st.write("No matching roles in this sector.")
+                    for rec in sector_recs:
+                        st.markdown(
+                            f"**{rec['job_title']}** - {rec['match_score']}% match"
+                        )
+
     # Skill Analysis
     if skill_analysis:
         st.markdown(
@@ -1099,6 +1334,41 @@ def display_results(data, selected_sectors):
             for insight in personalized_advice["market_insights"]:
                 st.markdown(f"• {insight}")
 
+    display_timings(data.get("_timings"))
+
+
+def display_timings(timings):
+    """Show the per-stage timings the backend returned for a debug=1 request.
+    Args:
+        timings (dict|None): the response's _timings block
+            ({"total_ms": float, "stages": {stage: {"ms": float, "calls": int}}}).
+    """
+    if not timings:
+        return
+    stages = timings.get("stages", {})
+    with st.expander(f"⏱️ Stage timings ({timings.get('total_ms', 0):.1f} ms total)"):
+        if not stages:
+            st.write("No pipeline stages ran (the result came from a cache).")
+            return
+        st.table(
+            pd.DataFrame(
+                [
+                    {"stage": name, "ms": entry["ms"], "calls": entry["calls"]}
+                    for name, entry in stages.items()
+                ]
+            )
+        )
+        fig = _plot_bar(
+            list(stages),
+            [entry["ms"] for entry in stages.values()],
+            "Time per stage",
+            x_label="Stage",
+            y_label="Milliseconds",
+            height=300,
+        )
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+
 
 def about_page():
     """Simple 'About' page describing the project and supported sectors."""